@@ -0,0 +1,12 @@
+# SPDX-FileCopyrightText: 2023-present Tom Williams <tomjrw@gmail.com>
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import sys
+
+sys.path.append("./__local__")
+sys.path.append("./src")
+
+if "xtuples" in os.environ:
+    sys.path.append(os.environ["xtuples"])
@@ -0,0 +1,366 @@
+
+import json
+import timeit
+import pathlib
+import argparse
+import datetime
+import platform
+
+import numpy
+
+import xtenors
+import xtuples as xt
+
+from xtenors.__about__ import __version__
+
+from xtenors import conventions
+from xtenors import calendars
+from xtenors import iterators
+from xtenors import indices
+
+# ---------------------------------------------------------------
+
+# NOTE: each case is a function returning a zero argument callable
+# (so any setup is excluded from the timings)
+
+# results are the (best) seconds per call, saved as json with
+# python -m benchmarks --save <name>
+# to baselines/<name>.json, and compared against (as ratios) with
+# python -m benchmarks --baseline <name>
+
+# baselines/v<version>.json is committed per release, as recorded
+# (see its meta) with the full dependency set installed
+
+# ---------------------------------------------------------------
+
+BASELINES = pathlib.Path(__file__).parent / "baselines"
+
+CASES: dict = {}
+
+def case(f):
+    CASES[f.__name__] = f
+    return f
+
+class Skip(Exception):
+    pass
+
+# ---------------------------------------------------------------
+
+D = datetime.date(2010, 1, 1)
+D_OVERFLOW = datetime.date(2010, 1, 31)
+D_WEEKEND = datetime.date(2010, 1, 30)
+
+def weekdays():
+    return calendars.Weekday(True)
+
+def weekday_iterator():
+    return weekdays().iterator(D, xtenors.days(1))
+
+# ---------------------------------------------------------------
+
+@case
+def parse_cached():
+    return lambda: xtenors.Tenor.parse("3M")
+
+@case
+def parse_compound():
+    return lambda: xtenors.xtenors.parse_units("1Y6M")
+
+@case
+def add_py():
+    return lambda: xtenors.arithmetic.add_py(D, years=1, months=3)
+
+@case
+def add_py_overflow():
+    overflow = conventions.Overflow.PREV
+    return lambda: xtenors.arithmetic.add_py(
+        D_OVERFLOW, months=1, overflow=overflow
+    )
+
+@case
+def add_py_business_days():
+    itr = weekday_iterator()
+    return lambda: xtenors.arithmetic.add_py(D, days=252, iterator=itr)
+
+@case
+def add_array_1m():
+    ds = numpy.datetime64(D) + (
+        numpy.arange(10 ** 6) % (365 * 30)
+    ).astype("timedelta64[D]")
+    overflow = conventions.Overflow.PREV
+    return lambda: xtenors.arithmetic.add_array(
+        ds, months=3, overflow=overflow
+    )
+
+def adjust_case(roll, modified, indexable = True):
+    itr = (
+        weekday_iterator()
+        if indexable
+        else weekdays().iterator(
+            D, xtenors.days(1), accept=lambda d: True
+        )
+    )
+    return lambda: xtenors.adjust(
+        D_WEEKEND, itr, roll=roll, modified=modified
+    )
+
+@case
+def adjust_following():
+    return adjust_case(conventions.Roll.FOLLOWING, None)
+
+@case
+def adjust_preceding():
+    return adjust_case(conventions.Roll.PRECEDING, None)
+
+@case
+def adjust_modified_following():
+    return adjust_case(
+        conventions.Roll.FOLLOWING, conventions.Modified.MODIFIED
+    )
+
+@case
+def adjust_modified_preceding():
+    return adjust_case(
+        conventions.Roll.PRECEDING, conventions.Modified.MODIFIED
+    )
+
+@case
+def adjust_following_generator():
+    return adjust_case(
+        conventions.Roll.FOLLOWING, None, indexable=False
+    )
+
+@case
+def tenor_namedtuple():
+    return lambda: xtenors.Tenor(Y=0, M=3, W=0, D=0)
+
+@case
+def tenor_compact():
+    return lambda: xtenors.xtenors.span(3, 0)
+
+@case
+def tenor_namedtuple_add():
+    tenor = xtenors.Tenor("3M").init()
+    return lambda: xtenors.add(D, tenor)
+
+@case
+def tenor_compact_add():
+    span = xtenors.Tenor("3M").compact()
+    return lambda: xtenors.xtenors.add_span(D, span)
+
+@case
+def tenor_compact_add_adjusted():
+    span = xtenors.Tenor("3M").compact()
+    spec = xtenors.Spec(weekday_iterator(), roll=conventions.Roll.FOLLOWING)
+    return lambda: xtenors.xtenors.add_span(D, span, spec, adjust=True)
+
+@case
+def iterator_gen_365():
+    itr = weekday_iterator()
+    def f():
+        _, gen = itr.gen()
+        return xt.iTuple.n_from(gen, 365)
+    return f
+
+@case
+def union_generator_100():
+    def f():
+        itrs = xt.iTuple([
+            calendars.Weekday(i).iterator(D, xtenors.days(1))
+            for i in range(3)
+        ])
+        return xt.iTuple.n_from(iterators.union(itrs), 100)
+    return f
+
+@case
+def intersection_generator_100():
+    def f():
+        itrs = xt.iTuple([
+            calendars.Weekday([i, i + 1]).iterator(D, xtenors.days(1))
+            for i in range(3)
+        ])
+        return xt.iTuple.n_from(iterators.intersection(itrs), 100)
+    return f
+
+@case
+def union_calendar_30y():
+    calendar = calendars.union_calendars(*(
+        calendars.Weekday(i) for i in range(3)
+    ))
+    def f():
+        indices.clear(calendar)
+        return indices.count(
+            calendar, D, datetime.date(2040, 1, 1)
+        )
+    return f
+
+@case
+def intersection_calendar_30y():
+    calendar = calendars.intersection_calendars(*(
+        calendars.Weekday([i, i + 1]) for i in range(3)
+    ))
+    def f():
+        indices.clear(calendar)
+        return indices.count(
+            calendar, D, datetime.date(2040, 1, 1)
+        )
+    return f
+
+def stateful():
+    try:
+        calendars.import_holidays()
+    except ImportError as e:
+        raise Skip("holidays") from e
+    return calendars.Stateful.holidays_country(
+        "US", xtenors.days(365)
+    )
+
+@case
+def stateful_cold_10y():
+    calendar = stateful()
+    def f():
+        calendars.clear()
+        return indices.count(
+            calendar, D, datetime.date(2020, 1, 1)
+        )
+    return f
+
+@case
+def stateful_warm_10y():
+    calendar = stateful()
+    indices.count(calendar, D, datetime.date(2020, 1, 1))
+    return lambda: indices.count(
+        calendar, D, datetime.date(2020, 1, 1)
+    )
+
+# ---------------------------------------------------------------
+
+def time_case(f, repeat: int = 5) -> float:
+    timer = timeit.Timer(f)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def run(names = None, repeat: int = 5) -> dict:
+    res = {}
+    for name, f_case in CASES.items():
+        if names and not any(n in name for n in names):
+            continue
+        try:
+            f = f_case()
+        except Skip as e:
+            print("{}: skipped ({})".format(name, e))
+            continue
+        res[name] = time_case(f, repeat=repeat)
+    return res
+
+def meta() -> dict:
+    return dict(
+        version=__version__,
+        python=platform.python_version(),
+        machine=platform.machine(),
+        date=datetime.date.today().isoformat(),
+    )
+
+def save(name: str, results: dict) -> pathlib.Path:
+    BASELINES.mkdir(parents=True, exist_ok=True)
+    path = BASELINES / "{}.json".format(name)
+    path.write_text(json.dumps(dict(
+        meta=meta(), results=results
+    ), indent=2, sort_keys=True))
+    return path
+
+def load(name: str) -> dict:
+    path = BASELINES / "{}.json".format(name)
+    return json.loads(path.read_text())["results"]
+
+def report(results: dict, baseline = None, threshold: float = 1.2) -> int:
+    n_regressions = 0
+    width = max(map(len, results), default=0)
+    for name, t in results.items():
+        line = "{}  {:>12.3f}us".format(name.ljust(width), t * 1e6)
+        if baseline is not None and name in baseline:
+            ratio = t / baseline[name]
+            line += "  {:>6.2f}x".format(ratio)
+            if ratio > threshold:
+                line += "  REGRESSION"
+                n_regressions += 1
+        print(line)
+    return n_regressions
+
+# ---------------------------------------------------------------
+
+def memory(n: int) -> dict:
+    """
+    peak bytes per tenor, for n tenors held as
+    NamedTuple Tenors, (interned) Spans, and packed int64 codes
+    """
+    import tracemalloc
+
+    rng = numpy.random.default_rng(0)
+    months = rng.integers(-120, 120, n).tolist()
+    ds = rng.integers(-30, 30, n).tolist()
+
+    def f_tenors():
+        return [
+            xtenors.Tenor(None, 0, m, 0, d) for m, d in zip(months, ds)
+        ]
+
+    def f_spans():
+        return [
+            xtenors.xtenors.span(m, d) for m, d in zip(months, ds)
+        ]
+
+    def f_codes():
+        return xtenors.xtenors.pack_span(
+            numpy.array(months, dtype=numpy.int64),
+            numpy.array(ds, dtype=numpy.int64),
+        )
+
+    res = {}
+    for name, f in [
+        ("tenors", f_tenors),
+        ("spans", f_spans),
+        ("codes", f_codes),
+    ]:
+        tracemalloc.start()
+        v = f()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del v
+        res[name] = peak / n
+    return res
+
+# ---------------------------------------------------------------
+
+def main(argv) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("names", nargs="*", help="filter cases by substring")
+    parser.add_argument("--save", help="save results as baselines/<name>.json")
+    parser.add_argument("--baseline", help="compare to baselines/<name>.json")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--memory",
+        type=int,
+        help="report bytes per tenor over n tenors (eg. 10000000)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.memory:
+        for name, v in memory(args.memory).items():
+            print("{}  {:>8.1f}B".format(name.ljust(6), v))
+        return 0
+
+    results = run(args.names, repeat=args.repeat)
+
+    n_regressions = report(
+        results,
+        baseline=None if args.baseline is None else load(args.baseline),
+        threshold=args.threshold,
+    )
+    if args.save:
+        print("saved:", save(args.save, results))
+
+    return 1 if n_regressions else 0
+
+# ---------------------------------------------------------------
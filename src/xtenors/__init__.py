@@ -7,7 +7,8 @@ import pathlib
 sys.path.append("./__local__")
 sys.path.append("./src")
 
-sys.path.append(os.environ["xtuples"])
+if "xtuples" in os.environ:
+    sys.path.append(os.environ["xtuples"])
 
 # import all modules, so can load individually
 from . import dates
@@ -15,12 +16,27 @@ from . import units
 from . import conventions
 from . import iterators
 from . import calendars
+from . import indices
 from . import arithmetic
 from . import adjustments
+from . import schedules
+from . import pillars
+from . import daycounts
+from . import batch
+from . import stats
+from . import memo
 
 # also convenience import other specific commonly used items
 from .dates import *
 from .units import *
 from .iterators import Iterator
-from .adjustments import adjust, Adjustment
-from .xtenors import Tenor, add
\ No newline at end of file
+from .adjustments import adjust, adjust_array, Adjustment, Spec
+from .arithmetic import business_days_between, business_days_between_array
+from .daycounts import year_fraction, year_fraction_array
+from .xtenors import Tenor, Span, add, add_array
+
+# optional pandas accessors (series.xtenors / index.xtenors)
+# only registered here if pandas is already imported, so as not to
+# import it otherwise (see accessors)
+if "pandas" in sys.modules:
+    from . import accessors
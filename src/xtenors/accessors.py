@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import typing
+
+import numpy
+import pandas # type: ignore
+
+from .dates import *
+from .units import *
+
+from . import conventions
+from . import iterators
+from . import adjustments
+from . import arithmetic
+
+from .xtenors import Tenor, add_array
+
+# ---------------------------------------------------------------
+
+# NOTE: pandas accessors, as series.xtenors / index.xtenors
+# for datetime Series and DatetimeIndex, backed by the array kernels
+
+# results keep the index (and name) of the input, and NaT
+# in any row gives NaT (or NA) in the same row of the result
+
+# the time of day is carried through (as in the scalar add)
+# and tz aware values are worked on in their local (wall) time
+
+# results landing on a DST transition are localized per
+# ambiguous / nonexistent (as pandas tz_localize), by default
+# raising on an ambiguous (repeated) time, as pandas does, unless
+# the caller opts in to NaT (or passes the dst flags), and shifted
+# forward (to the end of the gap) for a nonexistent (skipped) time
+
+# pandas is optional: the accessors are registered on import of
+# this module, which xtenors does itself only if pandas was already
+# imported, otherwise: import xtenors.accessors
+
+# ---------------------------------------------------------------
+
+PandasDT = typing.Union[pandas.Series, pandas.DatetimeIndex]
+
+AMBIGUOUS: str = "raise"
+NONEXISTENT: str = "shift_forward"
+
+def wall(obj: PandasDT) -> tuple[PandasDT, typing.Any]:
+    """
+    obj as (naive) local times, and its tz (if any)
+    """
+    obj = pandas.to_datetime(obj)
+    dt = obj.dt if isinstance(obj, pandas.Series) else obj
+    if dt.tz is None:
+        return obj, None
+    return dt.tz_localize(None), dt.tz
+
+def split(values: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    >>> ds, ts = split(numpy.array(["2020-01-01T12:00", "NaT"], dtype="datetime64[ns]"))
+    >>> ds.astype(str).tolist(), ts.astype("timedelta64[h]").astype(str).tolist()
+    (['2020-01-01', 'NaT'], ['12 hours', 'NaT'])
+    """
+    values = numpy.asarray(values, dtype="datetime64[ns]")
+    ds = values.astype("datetime64[D]")
+    return ds, values - ds.astype("datetime64[ns]")
+
+def combine(ds: numpy.ndarray, ts: numpy.ndarray) -> numpy.ndarray:
+    return ds.astype("datetime64[ns]") + ts
+
+def to_days(v, index = None) -> typing.Union[
+    numpy.ndarray, numpy.datetime64
+]:
+    """
+    datetime64[D] array of a Series / Index (aligned to index,
+    if given) or array, or datetime64[D] of a scalar
+    """
+    if isinstance(v, pandas.Series) and index is not None:
+        v = v.reindex(index)
+    if isinstance(v, (pandas.Series, pandas.Index, numpy.ndarray, list)):
+        v, _ = wall(pandas.Series(v) if isinstance(v, list) else v)
+        return split(numpy.asarray(v, dtype="datetime64[ns]"))[0]
+    v = pandas.Timestamp(v)
+    if v is not pandas.NaT and v.tz is not None:
+        v = v.tz_localize(None)
+    return numpy.datetime64(v.to_datetime64(), "D")
+
+# ---------------------------------------------------------------
+
+class Accessor:
+
+    def __init__(self, obj: PandasDT):
+        self.obj = obj
+
+    def wrap(
+        self,
+        values: numpy.ndarray,
+        tz = None,
+        ambiguous = AMBIGUOUS,
+        nonexistent = NONEXISTENT,
+    ) -> PandasDT:
+        obj = self.obj
+        kws = dict(ambiguous=ambiguous, nonexistent=nonexistent)
+        if isinstance(obj, pandas.Series):
+            res = pandas.Series(values, index=obj.index, name=obj.name)
+            return res if tz is None else res.dt.tz_localize(tz, **kws)
+        res = pandas.DatetimeIndex(values, name=obj.name)
+        return res if tz is None else res.tz_localize(tz, **kws)
+
+    def apply(
+        self,
+        f: typing.Callable[[numpy.ndarray], numpy.ndarray],
+        ambiguous = AMBIGUOUS,
+        nonexistent = NONEXISTENT,
+    ) -> PandasDT:
+        obj, tz = wall(self.obj)
+        ds, ts = split(numpy.asarray(obj, dtype="datetime64[ns]"))
+        return self.wrap(
+            combine(f(ds), ts),
+            tz=tz,
+            ambiguous=ambiguous,
+            nonexistent=nonexistent,
+        )
+
+    def add(
+        self,
+        tenor: typing.Union[str, Tenor],
+        iterator: typing.Optional[iterators. Iterator] = None,
+        adjust: bool = False,
+        adjustment: typing.Optional[adjustments.Adjustment] = None,
+        ambiguous = AMBIGUOUS,
+        nonexistent = NONEXISTENT,
+    ) -> PandasDT:
+        """
+        as xtenors.add_array
+        (ambiguous / nonexistent: see tz_localize, for tz aware values)
+
+        >>> s = pandas.Series(pandas.to_datetime(["2020-01-31", None]), index=["a", "b"])
+        >>> adj = adjustments.Adjustment(None, overflow=conventions.Overflow.PREV)
+        >>> s.xtenors.add("1M", adjustment=adj)
+        a   2020-02-29
+        b          NaT
+        dtype: datetime64[ns]
+        >>> ix = pandas.DatetimeIndex(["2020-03-07 02:30", "2020-10-31 01:30"]).tz_localize("America/New_York")
+        >>> ix.xtenors.add("1D", ambiguous="NaT")
+        DatetimeIndex(['2020-03-08 03:00:00-04:00', 'NaT'], dtype='datetime64[ns, America/New_York]', freq=None)
+        """
+        if isinstance(tenor, str):
+            tenor = Tenor(tenor)
+        return self.apply(lambda ds: add_array(
+            ds,
+            tenor,
+            iterator=iterator,
+            adjust=adjust,
+            adjustment=adjustment,
+        ), ambiguous=ambiguous, nonexistent=nonexistent)
+
+    def adjust(
+        self,
+        iterator: iterators. Iterator,
+        roll: typing.Optional[conventions.Roll] = None,
+        modified: typing.Optional[conventions.Modified] = None,
+        ambiguous = AMBIGUOUS,
+        nonexistent = NONEXISTENT,
+    ) -> PandasDT:
+        """
+        as adjustments.adjust_array
+        (ambiguous / nonexistent: see tz_localize, for tz aware values)
+
+        >>> from .calendars import Weekday
+        >>> itr = Weekday(True).iterator(year(2020), days(1))
+        >>> ix = pandas.DatetimeIndex(["2020-02-01 09:00", None], name="t")
+        >>> ix.xtenors.adjust(itr, roll=conventions.Roll.FOLLOWING)
+        DatetimeIndex(['2020-02-03 09:00:00', 'NaT'], dtype='datetime64[ns]', name='t', freq=None)
+        """
+        return self.apply(lambda ds: adjustments.adjust_array(
+            ds, iterator, roll=roll, modified=modified,
+        ), ambiguous=ambiguous, nonexistent=nonexistent)
+
+    def business_days_between(self, other, calendar) -> typing.Union[
+        pandas.Series, pandas.Index
+    ]:
+        """
+        as arithmetic.business_days_between_array
+        (other: a Series, aligned on the index, or an array / scalar)
+
+        >>> from .calendars import Weekday
+        >>> s = pandas.Series(pandas.to_datetime(["2020-01-03", None, "2020-01-06"]))
+        >>> s.xtenors.business_days_between("2020-01-10", Weekday(True))
+        0       5
+        1    <NA>
+        2       4
+        dtype: Int64
+        """
+        obj = self.obj
+        starts = numpy.asarray(to_days(obj))
+        ends = numpy.broadcast_to(
+            to_days(
+                other,
+                index=obj.index if isinstance(obj, pandas.Series) else None,
+            ),
+            starts.shape,
+        )
+        valid = ~(numpy.isnat(starts) | numpy.isnat(ends))
+
+        res = pandas.array(
+            numpy.zeros(starts.shape, dtype=numpy.int64),
+            dtype="Int64",
+        )
+        if valid.any():
+            res[valid] = arithmetic.business_days_between_array(
+                starts[valid], ends[valid], calendar
+            )
+        res[~valid] = pandas.NA
+
+        if isinstance(obj, pandas.Series):
+            return pandas.Series(res, index=obj.index, name=obj.name)
+        return pandas.Index(res, name=obj.name)
+
+# ---------------------------------------------------------------
+
+global REGISTERED
+
+REGISTERED: bool = False
+
+def register():
+    global REGISTERED
+    if REGISTERED:
+        return
+    pandas.api.extensions.register_series_accessor("xtenors")(Accessor)
+    pandas.api.extensions.register_index_accessor("xtenors")(Accessor)
+    REGISTERED = True
+
+register()
+
+# ---------------------------------------------------------------
@@ -12,62 +12,67 @@ import functools
 import datetime
 import calendar
 
+import numpy
+
 import xtuples as xt
 
 from .dates import *
 from .units import *
 
+from . import stats
 from . import conventions
 from . import iterators
 from . import calendars
+from . import indices
 
 # ---------------------------------------------------------------
 
 # TODO: check signs
 
-# TODO: check unmodified and m != m(valid) is error?
-
 # ---------------------------------------------------------------
 
+def valid_from(d, iterator, step):
+    """
+    first valid date on or after (step > 0) / before (step < 0) d
+
+    >>> from .calendars import Weekday
+    >>> itr = Weekday(True).iterator(year(2020), days(1))
+    >>> valid_from(year(2020, d=4), itr, days(1))
+    datetime.date(2020, 1, 6)
+    >>> valid_from(year(2020, d=4), itr, days(-1))
+    datetime.date(2020, 1, 3)
+    """
+    if iterator.indexable():
+        return indices.add(
+            iterator.calendar,
+            d - step,
+            1 if step > datetime.timedelta(0) else -1,
+        )
+    _, gen = iterator.update(start=d, step=step, skip=True)
+    return next(v for accept, v in gen if accept)
+
+def same_month(d0, d1):
+    return d0.month == d1.month and d0.year == d1.year
+
 def adjust_date_forward(d, first_valid, iterator, modified = None):
 
-    if d.month == first_valid.month:
+    if (
+        same_month(d, first_valid)
+        or modified is not conventions.Modified.MODIFIED
+    ):
         return first_valid
     
-    elif (
-        first_valid.month > d.month 
-        and modified is conventions.Modified.MODIFIED
-    ):
-        _, gen = iterator.update(start=d, step = days(-1))
-        _, prev_valid = next(gen)
-        return prev_valid
-
-    else:
-        assert False, dict(
-            d=d,
-            first_valid=first_valid,
-            modified=modified,
-        )
+    return valid_from(d, iterator, days(-1))
 
 def adjust_date_backward(d, first_valid, iterator, modified = None):
 
-    if d.month == first_valid.month:
+    if (
+        same_month(d, first_valid)
+        or modified is not conventions.Modified.MODIFIED
+    ):
         return first_valid
     
-    elif (
-        first_valid.month < d.month 
-        and modified is conventions.Modified.MODIFIED
-    ):
-        _, gen = iterator.update(start=d, step = days(1))
-        _, next_valid = next(gen)
-        return next_valid
-
-    else:
-        assert False, dict(
-            d=d,
-            first_valid=first_valid,
-            modified=modified,
-        )
+    return valid_from(d, iterator, days(1))
 
 # ---------------------------------------------------------------
 
@@ -77,37 +82,50 @@ def adjust(
     roll=None,
     modified = None,
 ):
+    """
+    >>> from .calendars import Weekday
+    >>> itr = Weekday(True).iterator(year(2020), days(1))
+    >>> adjust(year(2020, 2, 1), itr, roll=conventions.Roll.PRECEDING)
+    datetime.date(2020, 1, 31)
+    >>> adjust(year(2020, 2, 1), itr, roll=conventions.Roll.PRECEDING, modified=conventions.Modified.MODIFIED)
+    datetime.date(2020, 2, 3)
+    >>> adjust(year(2020, 5, 30), itr, roll=conventions.Roll.FOLLOWING)
+    datetime.date(2020, 6, 1)
+    >>> adjust(year(2020, 5, 30), itr, roll=conventions.Roll.FOLLOWING, modified=conventions.Modified.MODIFIED)
+    datetime.date(2020, 5, 29)
+    """
+
+    if stats.ENABLED:
+        stats.count("adjust.calls")
 
     d = (
         ddt if not isinstance(ddt, datetime.datetime)
         else ddt.date()
     )
 
-    _, gen = iterator.update(start=d, step = days(
-        1 if roll is conventions.Roll.FOLLOWING
-        else -1 if roll is conventions.Roll.PRECEDING
-        else 0
-    ))
-
-    accept, first_valid = next(gen)
-
     if roll is None or roll is conventions.Roll.ERROR:
-        assert accept and first_valid == d, dict(
-            accept=accept,
-            first_valid=first_valid,
+        valid = valid_from(d, iterator, days(1))
+        assert valid == d, dict(
+            valid=valid,
             d=d,
         )
         res = d
 
     elif roll is conventions.Roll.PRECEDING:
         res = adjust_date_backward(
-            d, first_valid, iterator, modified=modified
+            d,
+            valid_from(d, iterator, days(-1)),
+            iterator,
+            modified=modified
             #
         )
 
     elif roll is conventions.Roll.FOLLOWING:
         res = adjust_date_forward(
-            d, first_valid, iterator, modified=modified
+            d,
+            valid_from(d, iterator, days(1)),
+            iterator,
+            modified=modified
             #
         )
 
@@ -121,6 +139,78 @@ def adjust(
 
 # ---------------------------------------------------------------
 
+def adjust_array(
+    ds: numpy.ndarray,
+    iterator,
+    roll=None,
+    modified = None,
+) -> numpy.ndarray:
+    """
+    as adjust, over a datetime64[D] array, for an indexable iterator
+    (see Iterator.indexable)
+
+    >>> from .calendars import Weekday
+    >>> itr = Weekday(True).iterator(year(2020), days(1))
+    >>> ds = numpy.array(["2020-02-01", "2020-05-30", "NaT"], dtype="datetime64[D]")
+    >>> adjust_array(ds, itr, roll=conventions.Roll.FOLLOWING).tolist()
+    [datetime.date(2020, 2, 3), datetime.date(2020, 6, 1), None]
+    >>> adjust_array(ds, itr, roll=conventions.Roll.FOLLOWING, modified=conventions.Modified.MODIFIED).tolist()
+    [datetime.date(2020, 2, 3), datetime.date(2020, 5, 29), None]
+    >>> adjust_array(ds, itr, roll=conventions.Roll.PRECEDING, modified=conventions.Modified.MODIFIED).tolist()
+    [datetime.date(2020, 2, 3), datetime.date(2020, 5, 29), None]
+    """
+    assert iterator.indexable(), iterator
+
+    ds = numpy.asarray(ds, dtype="datetime64[D]")
+    filled, nat = indices.fill_nat(ds)
+
+    if stats.ENABLED:
+        stats.count("adjust.array")
+        stats.count("adjust.array.rows", ds.size)
+
+    if nat.all():
+        return ds
+
+    calendar = iterator.calendar
+    ords = indices.to_ordinals(filled)
+
+    following = lambda: indices.add_ordinals(calendar, ords - 1, 1)
+    preceding = lambda: indices.add_ordinals(calendar, ords + 1, -1)
+
+    if roll is None or roll is conventions.Roll.ERROR:
+        res = following()
+        assert ((res == ords) | nat).all(), dict(
+            invalid=ds[(res != ords) & ~nat],
+        )
+        return ds
+
+    elif roll is conventions.Roll.PRECEDING:
+        res = preceding()
+        f_other = following
+
+    elif roll is conventions.Roll.FOLLOWING:
+        res = following()
+        f_other = preceding
+
+    else:
+        assert False, roll
+
+    res = indices.from_ordinals(res)
+
+    if modified is conventions.Modified.MODIFIED:
+        crossed = (
+            res.astype("datetime64[M]") 
+            != filled.astype("datetime64[M]")
+        )
+        if crossed.any():
+            res = numpy.where(
+                crossed, indices.from_ordinals(f_other()), res
+            )
+
+    return numpy.where(nat, ds, res)
+
+# ---------------------------------------------------------------
+
 @xt.nTuple.decorate()
 class Adjustment(typing.NamedTuple):
 
@@ -129,4 +219,51 @@ class Adjustment(typing.NamedTuple):
     roll: typing.Optional[conventions.Roll] = None
     modified: typing.Optional[conventions.Modified] = None
 
+    def compact(self: Adjustment) -> Spec:
+        return Spec(
+            self.iterator, self.overflow, self.roll, self.modified
+        )
+
+# ---------------------------------------------------------------
+
+# NOTE: Spec is a lightweight (slotted) equivalent of Adjustment
+# for hot loops, see xtenors.Span
+
+class Spec:
+
+    __slots__ = ("iterator", "overflow", "roll", "modified")
+
+    def __init__(
+        self,
+        iterator: typing.Optional[iterators.Iterator] = None,
+        overflow: typing.Optional[conventions.Overflow] = None,
+        roll: typing.Optional[conventions.Roll] = None,
+        modified: typing.Optional[conventions.Modified] = None,
+    ):
+        self.iterator = iterator
+        self.overflow = overflow
+        self.roll = roll
+        self.modified = modified
+
+    def key(self) -> tuple:
+        return (self.iterator, self.overflow, self.roll, self.modified)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Spec) and self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def __repr__(self) -> str:
+        return "Spec(overflow={}, roll={}, modified={})".format(
+            self.overflow, self.roll, self.modified
+        )
+
+    def adjustment(self) -> Adjustment:
+        """
+        >>> Spec(roll=conventions.Roll.FOLLOWING).adjustment().compact()
+        Spec(overflow=None, roll=Roll.FOLLOWING, modified=None)
+        """
+        return Adjustment(*self.key())
+
 # ---------------------------------------------------------------
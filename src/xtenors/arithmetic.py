@@ -7,53 +7,24 @@ import typing
 
 import operator
 import itertools
+import bisect
 import functools
 import datetime
-import calendar
 
 # import cython
 
+import numpy
+
 import xtuples as xt
 
 from .dates import *
 from .units import *
 
+from . import stats
 from . import conventions
 from . import iterators
 from . import calendars
-
-# ---------------------------------------------------------------
-
-# ymd = dict(
-#     y=cython.int, 
-#     m=cython.int, 
-#     d=cython.int,
-# )
-# ym = dict(y=cython.int, m=cython.int)
-
-# # ---------------------------------------------------------------
-
-# @cython.cfunc
-# @cython.returns(tuple[cython.int, cython.int])
-# @cython.locals(
-#     **ym, years=cython.int, months=cython.int, _y=cython.int
-# )
-# def add_y_m_C(y, m, years, months):
-#     _y, m = divmod(m + months - 1, 12)
-#     return y + years + _y, m + 1
-
-# ---------------------------------------------------------------
-
-def overflow_prev_py(y, m, d):
-    d_max = calendar.monthrange(y, m)[1]
-    return datetime.date(y, m, d_max)
-
-def overflow_next_py(y, m, d):
-    m += 1
-    ys, m = divmod(m - 1, 12)
-    m += 1
-    y += ys
-    return datetime.date(y, m, 1)
+from . import indices
 
 # ---------------------------------------------------------------
 
@@ -91,16 +62,36 @@ def add_days(
         ddt = ddt + datetime.timedelta(days=days)
         return unpack_date(ddt)
 
+    elif days != 0 and iterator.indexable():
+        if stats.ENABLED:
+            stats.count("arithmetic.add_days.indexed")
+        return unpack_date(indices.add(
+            iterator.calendar,
+            (
+                ddt
+                if not isinstance(ddt, datetime.datetime)
+                else ddt.date()
+            ),
+            days,
+        ))
+
     elif days != 0:
+        if stats.ENABLED:
+            stats.count("arithmetic.add_days.stepped")
         iterator, gen = iterator.update(
             start=(
                 ddt
                 if not isinstance(ddt, datetime.datetime)
                 else ddt.date()
             ),
-            step=days(1 if days > 0 else -1)
+            step=datetime.timedelta(days=1 if days > 0 else -1),
+            skip=True,
         )
-        end = xt.iTuple.n_from(gen, days)[-1]
+        # skip the start date itself
+        next(gen)
+        end = xt.iTuple.from_where(
+            gen, lambda y, v: y, n=abs(days), star=True
+        )[-1][1]
         return unpack_date(end)
 
     else:
@@ -108,6 +99,104 @@ def add_days(
 
 # ---------------------------------------------------------------
 
+# NOTE: the scalar add works on day ordinals (see date.toordinal)
+# with a table of the ordinal of the first of every month
+# (from 0001-01, to the sentinel 10000-01)
+
+# so month i (= (y - 1) * 12 + (m - 1)) starts at MONTH_ORDINALS[i]
+# and has length MONTH_ORDINALS[i + 1] - MONTH_ORDINALS[i]
+
+# month overflow is then a comparison, rather than a caught
+# exception, and the only object constructed is the result
+
+# the array add uses the same table, as days since the epoch
+# (so datetime64[D] values), in place of datetime64 casts
+
+MONTH_DAYS: numpy.ndarray = numpy.arange(
+    (1 - 1970) * 12, (10000 - 1970) * 12 + 1
+).astype("datetime64[M]").astype("datetime64[D]").astype(numpy.int64)
+
+MONTH_ORDINALS: list[int] = (MONTH_DAYS + indices.EPOCH).tolist()
+
+N_MONTHS = len(MONTH_ORDINALS) - 1
+
+def month_index(o: int) -> tuple[int, int]:
+    """
+    month index and (one based) day of the given ordinal
+
+    >>> i, d = month_index(datetime.date(2020, 2, 29).toordinal())
+    >>> divmod(i, 12), d
+    ((2019, 1), 29)
+    """
+    i = bisect.bisect_right(MONTH_ORDINALS, o) - 1
+    return i, o - MONTH_ORDINALS[i] + 1
+
+def month_index_array(xs: numpy.ndarray) -> numpy.ndarray:
+    """
+    month index of each of the given days since the epoch
+
+    (an estimate per the mean month length, of 146097 / 4800
+    days, is off by at most one, so is corrected from the table)
+
+    >>> xs = numpy.array(["2020-02-29", "2020-03-01"], dtype="datetime64[D]")
+    >>> numpy.divmod(month_index_array(xs.view(numpy.int64)), 12)
+    (array([2019, 2019]), array([1, 2]))
+    """
+    i = (xs - MONTH_DAYS[0]) * 4800 // 146097
+    i += MONTH_DAYS.take(i + 1) <= xs
+    i -= MONTH_DAYS.take(i) > xs
+    return i
+
+def add_months_ordinal(i: int, d: int, months: int, overflow = None) -> int:
+    """
+    ordinal of day d of month i + months
+
+    >>> i = 2019 * 12
+    >>> o = add_months_ordinal(i, 31, 1, conventions.Overflow.PREV)
+    >>> datetime.date.fromordinal(o)
+    datetime.date(2020, 2, 29)
+    >>> o = add_months_ordinal(i, 31, 1, conventions.Overflow.NEXT)
+    >>> datetime.date.fromordinal(o)
+    datetime.date(2020, 3, 1)
+    """
+    i += months
+    if not 0 <= i < N_MONTHS:
+        raise ValueError("year {} is out of range".format(i // 12 + 1))
+    o = MONTH_ORDINALS[i]
+    o_next = MONTH_ORDINALS[i + 1]
+    if o + d <= o_next:
+        return o + d - 1
+    elif overflow is conventions.Overflow.NEXT:
+        return o_next
+    elif overflow is conventions.Overflow.PREV:
+        return o_next - 1
+    raise ValueError("day is out of range for month")
+
+# ---------------------------------------------------------------
+
+# NOTE: the pre ordinal table helpers, kept (as public api)
+# on top of add_months_ordinal
+
+def overflow_prev_py(y, m, d):
+    """
+    >>> overflow_prev_py(2020, 2, 31)
+    datetime.date(2020, 2, 29)
+    """
+    i = y * 12 + m - 13
+    return datetime.date.fromordinal(add_months_ordinal(
+        i, 32, 0, overflow=conventions.Overflow.PREV
+    ))
+
+def overflow_next_py(y, m, d):
+    """
+    >>> overflow_next_py(2020, 12, 32)
+    datetime.date(2021, 1, 1)
+    """
+    i = y * 12 + m - 13
+    return datetime.date.fromordinal(add_months_ordinal(
+        i, 32, 0, overflow=conventions.Overflow.NEXT
+    ))
+
 def is_error_day_range(e: Exception):
     return "day is out of range for month" in str(e)
 
@@ -137,7 +226,18 @@ def add_py(
     datetime.date(2020, 2, 29)
     >>> add_py(ddt, months=1, overflow=conventions.Overflow.NEXT)
     datetime.date(2020, 3, 1)
+    >>> itr = calendars.Weekday(True).iterator(ddt, days(1))
+    >>> add_py(datetime.date(2020, 1, 3), days=1, iterator=itr)
+    datetime.date(2020, 1, 6)
+    >>> add_py(datetime.date(2020, 1, 3), days=-5, iterator=itr)
+    datetime.date(2019, 12, 27)
+    >>> add_py(datetime.datetime(2020, 1, 15, 12), months=1)
+    datetime.datetime(2020, 2, 15, 12, 0)
+    >>> add_py(datetime.datetime(2020, 1, 31, 12), months=1, hours=1, overflow=conventions.Overflow.PREV)
+    datetime.datetime(2020, 2, 29, 13, 0)
     """
+    if stats.ENABLED:
+        stats.count("arithmetic.add")
     ddt = add_time(
         ddt,
         hours=hours,
@@ -148,100 +248,187 @@ def add_py(
     )
 
     days += weeks * 7
+    months += years * 12
 
-    y, m, d = add_days(ddt, days, iterator=iterator)
-    
-    y += years
-    m += months
+    if days == 0:
+        i = ddt.year * 12 + ddt.month - 13
+        d = ddt.day
+    elif iterator is None:
+        i, d = month_index(ddt.toordinal() + days)
+    else:
+        y, m, d = add_days(ddt, days, iterator=iterator)
+        i = y * 12 + m - 13
 
-    years, m = divmod(m - 1, 12)
+    o = add_months_ordinal(i, d, months, overflow=overflow)
 
-    m += 1
-    y += years
+    if is_date_strict(ddt):
+        return datetime.date.fromordinal(o)
 
-    try:
-        return datetime.date(y, m, d)
-    except Exception as e:
-        if not is_error_day_range(e):
-            raise e
-        elif overflow is conventions.Overflow.NEXT:
-            dt = overflow_next_py(y, m, d)
-        elif overflow is conventions.Overflow.PREV:
-            dt = overflow_prev_py(y, m, d)
-        else:
-            raise e
+    # NOTE: keeps the time (and tzinfo) of the datetime, so a
+    # datetime gives a datetime (where the pre ordinal add returned
+    # a date, unless the month overflowed)
+    return ddt + datetime.timedelta(days=o - ddt.toordinal())
 
-    if is_date_strict(ddt):
-        return dt
+# ---------------------------------------------------------------
 
-    return datetime.datetime(
-        *unpack_date(dt),
-        *unpack_time(ddt),
+def add_array(
+    ds,
+    years=0,
+    months=0,
+    weeks=0,
+    days=0,
+    iterator: typing.Optional[iterators. Iterator] = None,
+    overflow=None,
+):
+    """
+    ds: datetime64[D] array (or anything numpy can cast to one)
+
+    years / months / weeks / days: int, or int arrays
+    broadcastable against ds.
+
+    if given, iterator must be indexable (see Iterator.indexable)
+    and days are then counted in valid days of its calendar.
+
+    >>> ds = numpy.array(["2020-01-31", "2020-03-31"], dtype="datetime64[D]")
+    >>> add_array(ds, months=1)
+    Traceback (most recent call last):
+     ...
+    ValueError: day is out of range for month
+    >>> add_array(ds, months=1, overflow=conventions.Overflow.PREV)
+    array(['2020-02-29', '2020-04-30'], dtype='datetime64[D]')
+    >>> add_array(ds, months=1, overflow=conventions.Overflow.NEXT)
+    array(['2020-03-01', '2020-05-01'], dtype='datetime64[D]')
+    >>> add_array(ds, years=numpy.array([1, -1]), days=1)
+    array(['2021-02-01', '2019-04-01'], dtype='datetime64[D]')
+    >>> itr = calendars.Weekday(True).iterator(year(2020), days(1))
+    >>> add_array(numpy.array(["2020-01-03"], dtype="datetime64[D]"), days=1, iterator=itr)
+    array(['2020-01-06'], dtype='datetime64[D]')
+    >>> ds = numpy.array(["NaT", "2020-01-31"], dtype="datetime64[D]")
+    >>> add_array(ds, months=1, overflow=conventions.Overflow.PREV).tolist()
+    [None, datetime.date(2020, 2, 29)]
+    """
+    ds = numpy.asarray(ds, dtype="datetime64[D]")
+
+    if stats.ENABLED:
+        stats.count("arithmetic.add_array")
+        stats.count("arithmetic.add_array.rows", ds.size)
+
+    days = numpy.asarray(weeks) * 7 + days
+
+    if iterator is None:
+        if days.ndim or days != 0:
+            ds = ds + days.astype("timedelta64[D]")
+    elif (days != 0).any():
+        assert iterator.indexable(), iterator
+        ds, days = numpy.broadcast_arrays(ds, days)
+        filled, nat = indices.fill_nat(ds)
+        if not nat.all():
+            ds = numpy.where(nat, ds, indices.add_array(
+                iterator.calendar, filled, days
+            ))
+
+    months = numpy.asarray(years) * 12 + months
+
+    # NOTE: month index i and (zero based) day d, per MONTH_DAYS
+    # (as table lookups, rather than datetime64 casts)
+
+    # NaT rows are worked on as the epoch, and masked back at the end
+
+    nat = numpy.isnat(ds)
+    any_nat = nat.any()
+
+    xs = ds.view(numpy.int64)
+    if any_nat:
+        xs = numpy.where(nat, 0, xs)
+    if xs.size and (
+        xs.min() < MONTH_DAYS[0] or xs.max() >= MONTH_DAYS[-1]
+    ):
+        raise ValueError("year is out of range")
+
+    i = month_index_array(xs)
+    d = xs - MONTH_DAYS.take(i)
+
+    i = i + months
+    if i.size and (i.min() < 0 or i.max() >= N_MONTHS):
+        if not any_nat or (
+            ((i < 0) | (i >= N_MONTHS)) & ~nat
+        ).any():
+            raise ValueError("year is out of range")
+        i = numpy.where(nat, 0, i)
+
+    start = MONTH_DAYS.take(i)
+    m_len = MONTH_DAYS.take(i + 1) - start
+
+    if overflow is conventions.Overflow.NEXT:
+        d = numpy.minimum(d, m_len)
+    elif overflow is conventions.Overflow.PREV:
+        d = numpy.minimum(d, m_len - 1)
+    elif ((d >= m_len) & ~nat).any():
+        raise ValueError("day is out of range for month")
+
+    res = (start + d).view("datetime64[D]")
+    if any_nat:
+        res[numpy.broadcast_to(nat, res.shape)] = numpy.datetime64("NaT")
+    return res
+
+# ---------------------------------------------------------------
+
+def business_days_between(
+    start: DDT,
+    end: DDT,
+    calendar: calendars.Calendar,
+) -> int:
+    """
+    number of valid days of calendar in [start, end)
+    or, if end < start, minus the number in (end, start]
+    (as per numpy.busday_count)
+
+    looked up from the calendar index, without stepping
+
+    >>> cal = calendars.Weekday(True)
+    >>> business_days_between(year(2020, 1, 1), year(2020, 2, 1), cal)
+    23
+    >>> business_days_between(year(2020, 2, 1), year(2020, 1, 1), cal)
+    -22
+    """
+    return indices.count(
+        calendar,
+        (
+            start
+            if not isinstance(start, datetime.datetime)
+            else start.date()
+        ),
+        (
+            end
+            if not isinstance(end, datetime.datetime)
+            else end.date()
+        ),
     )
 
-# def add_C(
-#     ddt: DDT,
-#     years=0,
-#     months=0,
-#     weeks=0,
-#     days=0,
-#     hours=0,
-#     minutes=0,
-#     seconds=0,
-#     milliseconds=0,
-#     microseconds=0,
-#     iterator: typing.Optional[iterators. Iterator] = None,
-#     overflow=None,
-# ):
-#     """
-#     >>> ddt = datetime.date(2020, 1, 31)
-#     >>> add_C(ddt, months=1)
-#     Traceback (most recent call last):
-#      ...
-#     ValueError: day is out of range for month
-#     >>> add_C(ddt, months=1, overflow=conventions.Overflow.PREV)
-#     datetime.date(2020, 2, 29)
-#     >>> add_C(ddt, months=1, overflow=conventions.Overflow.NEXT)
-#     datetime.date(2020, 3, 1)
-#     """
-#     ddt = add_time(
-#         ddt,
-#         hours=hours,
-#         minutes=minutes,
-#         seconds=seconds,
-#         milliseconds=milliseconds,
-#         microseconds=microseconds,
-#     )
-
-#     days += weeks * 7
-
-#     y, m, d = add_days(ddt, days, iterator=iterator)
-
-#     y, m = add_y_m_C(y, m, years, months)
-
-#     try:
-#         return datetime.date(y, m, d)
-#     except Exception as e:
-#         if not is_error_day_range(e):
-#             raise e
-#         elif overflow is conventions.Overflow.NEXT:
-#             dt = overflow_next_py(y, m, d)
-#         elif overflow is conventions.Overflow.PREV:
-#             dt = overflow_prev_py(y, m, d)
-#         else:
-#             raise e
-
-#     if is_date_strict(ddt):
-#         return dt
-
-#     return datetime.datetime(
-#         *unpack_date(dt),
-#         *unpack_time(ddt),
-#     )
+def business_days_between_array(
+    starts,
+    ends,
+    calendar: calendars.Calendar,
+) -> numpy.ndarray:
+    """
+    starts / ends: (broadcastable) datetime64[D] arrays (without NaT)
+
+    >>> cal = calendars.Weekday(True)
+    >>> starts = numpy.array(["2020-01-01", "2020-01-04"], dtype="datetime64[D]")
+    >>> business_days_between_array(starts, numpy.datetime64("2020-02-01"), cal)
+    array([23, 20])
+    """
+    starts, ends = numpy.broadcast_arrays(
+        numpy.asarray(starts, dtype="datetime64[D]"),
+        numpy.asarray(ends, dtype="datetime64[D]"),
+    )
+    assert not (numpy.isnat(starts) | numpy.isnat(ends)).any(), dict(
+        starts=starts, ends=ends,
+    )
+    return indices.count_array(calendar, starts, ends)
 
 # ---------------------------------------------------------------
 
-# add = add_C
 add = add_py
 
 # ---------------------------------------------------------------
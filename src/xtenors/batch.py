@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+import os
+import typing
+import atexit
+
+import datetime
+import multiprocessing
+import concurrent.futures
+
+from multiprocessing import shared_memory
+
+import numpy
+
+from .dates import *
+from .units import *
+
+from . import conventions
+from . import calendars
+from . import indices
+from . import arithmetic
+from . import adjustments
+
+from .xtenors import Tenor, tenor_units
+
+# ---------------------------------------------------------------
+
+# NOTE: batch evaluation of (date, tenor, calendar) triples
+# split into contiguous chunks across a process pool
+
+# each calendar is compiled (in the parent) over the range
+# the batch can reach, and the bitmaps are published in a single
+# shared memory block, so workers never query the providers
+
+# each worker evaluates its chunk with the array kernels
+# (arithmetic.add_array / adjustments.adjust_array)
+# and results are concatenated back in input order
+
+# the pool is started with spawn (rather than the posix default
+# of fork), as forking a process that has already started threads
+# (eg. having imported numba, via financepy) can deadlock
+
+# ---------------------------------------------------------------
+
+def reach(
+    ds: numpy.ndarray,
+    units: numpy.ndarray,
+    gap: int = 2,
+) -> tuple[datetime.date, datetime.date]:
+    """
+    (year aligned) range of dates the batch could touch
+    allowing gap calendar days per business day, plus a margin
+
+    >>> ds = numpy.array(["2020-06-01"], dtype="datetime64[D]")
+    >>> reach(ds, numpy.array([[0, 0, 0, 100]]))
+    (datetime.date(2019, 1, 1), datetime.date(2022, 1, 1))
+    >>> reach(ds, numpy.array([[0, 0, 0, 100]]), gap=7)
+    (datetime.date(2018, 1, 1), datetime.date(2023, 1, 1))
+    """
+    span = int((
+        numpy.abs(units[:, :2]).dot([366, 31])
+        + (numpy.abs(units[:, 2:]).dot([7, 1]) + 1) * gap
+    ).max()) + 31
+    start = (ds.min() - span).item()
+    end = (ds.max() + span).item()
+    return year(start.year), year(end.year + 1)
+
+def max_gap(compiled: list, start: datetime.date, end: datetime.date) -> int:
+    """
+    largest number of calendar days from one valid day
+    to the next (or to either end of the range), over the calendars
+
+    >>> cal = calendars.union_calendars(calendars.Weekday(0), calendars.Weekday(3))
+    >>> max_gap([cal], year(2020), year(2021))
+    4
+    """
+    o0 = start.toordinal()
+    o1 = end.toordinal()
+    res = 1
+    for c in compiled:
+        valid = numpy.flatnonzero(indices.mask(c, o0, o1))
+        assert len(valid), dict(
+            calendar=c, message="no valid days", start=start, end=end,
+        )
+        res = max(
+            res,
+            int(valid[0]) + 1,
+            (o1 - o0) - int(valid[-1]),
+            int(numpy.diff(valid).max(initial=1)),
+        )
+    return res
+
+# ---------------------------------------------------------------
+
+def prepare(calendar, start: datetime.date, end: datetime.date):
+    # NOTE: weekmask calendars are already closed form
+    # (see indices.weekmask) so are passed as is
+    if indices.weekmask(calendar) is not None:
+        return calendar
+    return calendars.compile_calendar(calendar, start, end)
+
+def publish(
+    compiled: list,
+) -> tuple[shared_memory.SharedMemory, list[tuple]]:
+    bitmaps = [
+        c for c in compiled if isinstance(c, calendars.Compiled)
+    ]
+    size = sum(len(c.bits) for c in bitmaps)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    buf = shm.buf
+    assert buf is not None
+    specs: list[tuple] = []
+    offset = 0
+    for c in compiled:
+        if not isinstance(c, calendars.Compiled):
+            specs.append((c, None, None, None, None))
+            continue
+        buf[offset:offset + len(c.bits)] = c.bits
+        specs.append((c.calendar, c.start, c.end, offset, len(c.bits)))
+        offset += len(c.bits)
+    return shm, specs
+
+# NOTE: a worker attaches to the segment of a batch once, and
+# keeps it open for the rest of its lifetime, with each bitmap
+# a (read only) view of the segment, rather than a copy
+
+# only the segment of the latest batch is kept, so a long lived
+# executor doesn't accumulate the segments of past batches
+
+# the views are released on detach (and so at exit, see detach_all)
+# as the segment can't be closed while any view of it is alive
+
+ATTACHED: dict[str, tuple[shared_memory.SharedMemory, list]] = {}
+
+def attach(name: str, specs: list[tuple]) -> list:
+    try:
+        return ATTACHED[name][1]
+    except KeyError:
+        pass
+    detach_all()
+    shm = shared_memory.SharedMemory(name=name)
+    buf = shm.buf
+    assert buf is not None
+    compiled = [
+        calendar if offset is None else calendars.Compiled(
+            calendar,
+            start,
+            end,
+            buf[offset:offset + size].toreadonly(),
+        )
+        for calendar, start, end, offset, size in specs
+    ]
+    ATTACHED[name] = (shm, compiled)
+    return compiled
+
+def detach(name: str):
+    shm, compiled = ATTACHED.pop(name)
+    for c in compiled:
+        if not isinstance(c, calendars.Compiled):
+            continue
+        # drop the cached index, keyed on (a view of) the segment
+        indices.clear(c)
+        if isinstance(c.bits, memoryview):
+            try:
+                c.bits.release()
+            except BufferError:
+                # still viewed elsewhere
+                pass
+    del compiled
+    try:
+        shm.close()
+    except BufferError:
+        # still viewed elsewhere, so unmapped with the last view
+        pass
+
+def detach_all():
+    for name in list(ATTACHED.keys()):
+        detach(name)
+
+atexit.register(detach_all)
+
+# ---------------------------------------------------------------
+
+def evaluate(
+    compiled: list,
+    ds: numpy.ndarray,
+    units: numpy.ndarray,
+    keys: numpy.ndarray,
+    adjust: bool,
+    roll,
+    modified,
+    overflow,
+) -> numpy.ndarray:
+    if not len(compiled):
+        return arithmetic.add_array(
+            ds,
+            years=units[:, 0],
+            months=units[:, 1],
+            weeks=units[:, 2],
+            days=units[:, 3],
+            overflow=overflow,
+        )
+    res = numpy.empty(ds.shape, dtype="datetime64[D]")
+    for key in numpy.unique(keys):
+        rows = keys == key
+        itr = compiled[key].iterator(year(2000), days(1))
+        vs = arithmetic.add_array(
+            ds[rows],
+            years=units[rows, 0],
+            months=units[rows, 1],
+            weeks=units[rows, 2],
+            days=units[rows, 3],
+            iterator=itr,
+            overflow=overflow,
+        )
+        res[rows] = vs if not adjust else adjustments.adjust_array(
+            vs, itr, roll=roll, modified=modified,
+        )
+        c = compiled[key]
+        if isinstance(c, calendars.Compiled):
+            o = indices.to_ordinals(res[rows])
+            assert ((o >= c.start) & (o < c.end)).all(), dict(
+                message="result outside of the compiled range",
+                calendar=c.calendar,
+            )
+    return res
+
+def worker(
+    name: str,
+    specs: list[tuple],
+    ds: numpy.ndarray,
+    units: numpy.ndarray,
+    keys: numpy.ndarray,
+    adjust: bool,
+    roll,
+    modified,
+    overflow,
+) -> numpy.ndarray:
+    return evaluate(
+        attach(name, specs) if specs else [],
+        ds,
+        units,
+        keys,
+        adjust,
+        roll,
+        modified,
+        overflow,
+    )
+
+# ---------------------------------------------------------------
+
+def add_batch(
+    ds,
+    tenors: typing.Union[str, Tenor, typing.Sequence],
+    calendar = None,
+    keys: typing.Optional[numpy.ndarray] = None,
+    adjust: bool = False,
+    roll: typing.Optional[conventions.Roll] = None,
+    modified: typing.Optional[conventions.Modified] = None,
+    overflow: typing.Optional[conventions.Overflow] = None,
+    max_workers: typing.Optional[int] = None,
+    n_chunks: typing.Optional[int] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+    mp_context: typing.Optional[typing.Any] = None,
+) -> numpy.ndarray:
+    """
+    ds: datetime64[D] array
+    tenors: a tenor (or string) for every row, or one per row
+
+    calendar: None, a calendar, or a sequence of calendars
+    in which case keys gives the index of the calendar per row.
+    if given, day units are business days of the calendar
+    and (if adjust) results are adjusted per roll / modified.
+
+    max_workers = 0 evaluates in process
+    (else in executor, if given, or a new process pool
+    started per mp_context, by default spawn).
+
+    >>> ds = numpy.array(["2020-01-31", "2020-01-03"], dtype="datetime64[D]")
+    >>> cal = calendars.Weekday(True)
+    >>> add_batch(ds, ["1M", "1D"], cal, overflow=conventions.Overflow.PREV, max_workers=0)
+    array(['2020-02-29', '2020-01-06'], dtype='datetime64[D]')
+    >>> add_batch(ds, "1M", cal, adjust=True, roll=conventions.Roll.PRECEDING, overflow=conventions.Overflow.PREV, max_workers=0)
+    array(['2020-02-28', '2020-02-03'], dtype='datetime64[D]')
+    """
+    ds = numpy.asarray(ds, dtype="datetime64[D]")
+    assert ds.ndim == 1, ds.shape
+    assert not numpy.isnat(ds).any(), ds
+
+    n = len(ds)
+    units = tenor_units(tenors, n)
+
+    if calendar is None:
+        cals = []
+    elif isinstance(calendar, (list, tuple)) and not hasattr(
+        calendar, "valid"
+    ):
+        cals = list(calendar)
+    else:
+        cals = [calendar]
+
+    assert cals or not adjust, "adjust requires a calendar"
+
+    keys = (
+        numpy.zeros(n, dtype=numpy.int64)
+        if keys is None
+        else numpy.asarray(keys, dtype=numpy.int64)
+    )
+    assert keys.shape == ds.shape, dict(keys=keys.shape, ds=ds.shape)
+    assert not cals or (
+        keys.min(initial=0) >= 0 and keys.max(initial=0) < len(cals)
+    ), keys
+
+    if n == 0:
+        return ds.copy()
+
+    # the compiled range is sized per the sparsest calendar
+    # (see max_gap), and the workers check that it was enough
+
+    start, end = reach(ds, units)
+    compiled = [prepare(cal, start, end) for cal in cals]
+
+    gap = max_gap(compiled, start, end)
+    if gap > 2:
+        start, end = reach(ds, units, gap=gap)
+        compiled = [prepare(cal, start, end) for cal in cals]
+
+    if max_workers == 0:
+        return evaluate(
+            compiled, ds, units, keys, adjust, roll, modified, overflow
+        )
+
+    shm, specs = publish(compiled)
+    try:
+        pool = (
+            executor
+            if executor is not None
+            else concurrent.futures.ProcessPoolExecutor(
+                max_workers,
+                mp_context=(
+                    mp_context
+                    if mp_context is not None
+                    else multiprocessing.get_context("spawn")
+                ),
+            )
+        )
+        try:
+            n_chunks = n_chunks or 4 * (
+                max_workers or os.cpu_count() or 1
+            )
+            bounds = numpy.linspace(
+                0, n, min(n_chunks, n) + 1
+            ).astype(numpy.int64)
+            futures = [
+                pool.submit(
+                    worker,
+                    shm.name,
+                    specs,
+                    ds[l:r],
+                    units[l:r],
+                    keys[l:r],
+                    adjust,
+                    roll,
+                    modified,
+                    overflow,
+                )
+                for l, r in zip(bounds[:-1], bounds[1:])
+            ]
+            return numpy.concatenate([f.result() for f in futures])
+        finally:
+            if executor is None:
+                pool.shutdown()
+    finally:
+        shm.close()
+        shm.unlink()
+
+# ---------------------------------------------------------------
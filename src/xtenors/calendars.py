@@ -1,20 +1,32 @@
 
 from __future__ import annotations
 
+import os
+import re
 import abc
 import typing
+import pathlib
+import tempfile
+import threading
+import concurrent.futures
+import importlib.metadata
 
 import operator
 import itertools
 import functools
 import datetime
 
+import numpy
+
 import xtuples as xt
 
 from .dates import *
 from .units import *
 
+from . import stats
 from . import iterators
+from . import indices
+from . import memo
 
 # ---------------------------------------------------------------
 
@@ -33,6 +45,29 @@ class Calendar(typing.Protocol):
     ) -> iterators. Iterator:
         ...
 
+# NOTE: calendars can optionally also define:
+
+# mask(start, end): validity over the ordinals [start, end)
+# (see indices.mask)
+
+# weekmask(): validity per weekday, if that's all the calendar is
+# (see indices.weekmask)
+
+# jump(): f(current, direction) -> first valid date on or after
+# (direction = 1) / on or before (direction = -1) current
+# so iterators can skip straight over invalid dates
+# (when asked to, see Iterator.gen)
+
+def stepped_jump(
+    f_valid: typing.Callable[[DDT], bool],
+) -> typing.Callable[[DDT, int], DDT]:
+    def f(current: DDT, direction: int) -> DDT:
+        step = days(direction)
+        while not f_valid(current):
+            current += step
+        return current
+    return f
+
 # ---------------------------------------------------------------
 
 @xt.nTuple.decorate()
@@ -59,9 +94,9 @@ class Weekday(typing.NamedTuple):
         val = self.val
         if isinstance(val, bool):
             f = (
-                lambda current: current.weekday() < 5
+                (lambda current: current.weekday() < 5)
                 if val
-                else lambda current: not current.weekday() < 5
+                else (lambda current: not current.weekday() < 5)
             )
         elif isinstance(val, int):
             f = lambda current: current.weekday() == val
@@ -72,6 +107,74 @@ class Weekday(typing.NamedTuple):
             assert False, val
         return f
 
+    def weekdays(self: Weekday) -> tuple[int, ...]:
+        """
+        >>> Weekday(True).weekdays()
+        (0, 1, 2, 3, 4)
+        >>> Weekday(False).weekdays()
+        (5, 6)
+        >>> Weekday([2, 0]).weekdays()
+        (0, 2)
+        """
+        val = self.val
+        if isinstance(val, bool):
+            return (0, 1, 2, 3, 4) if val else (5, 6)
+        elif isinstance(val, int):
+            return (val,)
+        elif isinstance(val, typing.Iterable):
+            return tuple(sorted(frozenset(val)))
+        else:
+            assert False, val
+
+    def weekmask(self: Weekday) -> tuple[bool, ...]:
+        """
+        validity per weekday, monday first
+        (so that indices can use closed form business day arithmetic)
+
+        >>> Weekday(True).weekmask()
+        (True, True, True, True, True, False, False)
+        """
+        weekdays = self.weekdays()
+        return tuple(i in weekdays for i in range(7))
+
+    def mask(self: Weekday, start: int, end: int) -> numpy.ndarray:
+        """
+        validity over the ordinals [start, end)
+
+        >>> Weekday(True).mask(year(2020, d=3).toordinal(), year(2020, d=7).toordinal())
+        array([ True, False, False,  True])
+        """
+        # NOTE: ordinal 1 (0001-01-01) is a monday
+        return numpy.isin(
+            (numpy.arange(start, end) - 1) % 7,
+            self.weekdays(),
+        )
+
+    def jump(self: Weekday) -> typing.Callable[[DDT, int], DDT]:
+        """
+        >>> f = Weekday(True).jump()
+        >>> f(year(2020, d=4), 1), f(year(2020, d=4), -1), f(year(2020, d=6), 1)
+        (datetime.date(2020, 1, 6), datetime.date(2020, 1, 3), datetime.date(2020, 1, 6))
+        """
+        weekdays = frozenset(self.weekdays())
+        assert len(weekdays), self
+        # days to the first valid weekday, per weekday and direction
+        offsets = {
+            direction: tuple(
+                next(
+                    i for i in range(7)
+                    if (wd + direction * i) % 7 in weekdays
+                )
+                for wd in range(7)
+            )
+            for direction in (1, -1)
+        }
+        def f(current: DDT, direction: int) -> DDT:
+            return current + days(
+                direction * offsets[direction][current.weekday()]
+            )
+        return f
+
     def iterator(
         self, 
         start: DDT,
@@ -89,7 +192,9 @@ class Weekday(typing.NamedTuple):
             start,
             step,
             **kwargs, 
-            accept=accept
+            accept=accept,
+            calendar=self if f is None else None,
+            jump=self.jump() if f is None else None,
         )
 
 # ---------------------------------------------------------------
@@ -111,7 +216,8 @@ class Manager(typing.Protocol):
         calendar: Stateful,
         state: typing.Any,
         current: DDT,
-    ) -> tuple:
+    ) -> typing.Any:
+        # the new state (eg. a Store)
         ...
 
     @abc.abstractmethod
@@ -121,15 +227,24 @@ class Manager(typing.Protocol):
     ) -> typing.Callable[[DDT], bool]:
         ...
 
+# NOTE: managers can optionally also define:
+
+# mask(calendar, start, end): validity over the ordinals [start, end)
+# else Stateful.mask steps valid() (see indices.mask_stepped)
+
+# prefetch(calendar, start, end): load [start, end] up front
+# else Stateful.prefetch only builds the index (if asked to)
+
 class Manager_With_K(Manager, typing.Protocol):
 
     @property
     def k(self) -> str: ...
 
-class Manager_With_Window(Manager, typing.Protocol):
+class Manager_With_Cache(Manager_With_K, typing.Protocol):
 
-    @property
-    def k(self) -> str: ...
+    def cache_key(self) -> tuple: ...
+
+class Manager_With_Window(Manager_With_Cache, typing.Protocol):
 
     @property
     def window(self) -> datetime.timedelta: ...
@@ -146,6 +261,59 @@ class Stateful(typing.NamedTuple):
     ) -> typing.Callable[[DDT], bool]:
         return self.manager.valid(self)
 
+    def mask(self: Stateful, start: int, end: int) -> numpy.ndarray:
+        f_mask = getattr(self.manager, "mask", None)
+        if f_mask is None:
+            return indices.mask_stepped(self, start, end)
+        return f_mask(self, start, end)
+
+    def prefetch(
+        self: Stateful,
+        start: DDT,
+        end: DDT,
+        index: bool = False,
+    ) -> Stateful:
+        """
+        load [start, end] up front (in as few provider calls as
+        possible), rather than window by window as first queried
+
+        index: also build the business day index over the range
+        """
+        f_prefetch = getattr(self.manager, "prefetch", None)
+        if f_prefetch is not None:
+            f_prefetch(self, start, end)
+        if index:
+            indices.index(
+                self, start.toordinal(), end.toordinal() + 1
+            )
+        return self
+
+    def coverage(
+        self: Stateful,
+    ) -> typing.Optional[tuple[datetime.date, datetime.date]]:
+        """
+        the (inclusive) range of dates loaded so far, if any
+        (None for managers not backed by the stores, without a k)
+        """
+        if not hasattr(self.manager, "k"):
+            return None
+        return coverage(typing.cast(Manager_With_K, self.manager))
+
+    def invalidate(self: Stateful) -> Stateful:
+        """
+        for when the underlying holiday data has changed:
+        drops the loaded dates, along with the (now stale) business
+        day indices and any memoized adds using this calendar
+
+        NOTE: the valid() closures of existing (non indexable)
+        iterators keep the previous data, so should be rebuilt
+        """
+        if hasattr(self.manager, "k"):
+            invalidate(typing.cast(Manager_With_K, self.manager))
+        indices.clear(self, nested=True)
+        memo.clear(self)
+        return self
+
     def iterator(
         self, 
         start: DDT,
@@ -163,7 +331,8 @@ class Stateful(typing.NamedTuple):
             start,
             step,
             **kwargs, 
-            accept=accept
+            accept=accept,
+            calendar=self if f is None else None,
         )
 
     @classmethod
@@ -192,47 +361,432 @@ class Stateful(typing.NamedTuple):
 
 # ---------------------------------------------------------------
 
-# NOTE: we have a global inclusion / exclusion list
+# NOTE: we have a global inclusion / exclusion store
 # per calendar (some make more sense for one vs other)
 
-# where that list is built up incrementally, once we hit a value
-# outside of scope (as decided by f_scope)
-# where it's then extended with f_extend
-# presumably with some margin so we're not constantly extending
-# and the scope updated to reflect the new check bounds
+# where that store is built up incrementally, once we hit a value
+# outside of its coverage (as decided by in_scope)
+# where it's then extended (see date_exclusion_update)
+# with some margin so we're not constantly extending
 
 # as we're only storing those included / excluded
 # we need to know the range of values we've checked
-# and that won't be given necessarily by the list in question
+# and that won't be given necessarily by the values in question
 # as we only keep the truthy / falsey values respectively
 
+# so each store is the covered (contiguous) range of ordinals
+# along with the sorted ordinals included / excluded within it
+# and a flag per covered day (for constant time membership)
+
+# extension only ever adds to either end of the range
+# written in place into over allocated buffers (see Growable)
+# so costs (amortised) only the days added, rather than
+# rebuilding everything so far
+
+# each store is then a view of its range of the buffers, which
+# later extensions only ever write outside of, so existing
+# stores are unchanged (and can be read without a lock)
+
+# ---------------------------------------------------------------
+
+class Growable:
+    """
+    an over allocated array, grown in place at either end
+    with the values in use as data[lo:hi]
+
+    >>> buf = Growable(numpy.array([1, 2], dtype=numpy.int32))
+    >>> buf.extend(numpy.array([0]), numpy.array([3])) is buf
+    True
+    >>> buf.values()
+    array([0, 1, 2, 3], dtype=int32)
+    """
+
+    def __init__(self, values: numpy.ndarray):
+        n = len(values)
+        self.data = numpy.zeros(max(2 * n, 64), dtype=values.dtype)
+        self.lo = (len(self.data) - n) // 2
+        self.hi = self.lo + n
+        self.data[self.lo:self.hi] = values
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def values(self) -> numpy.ndarray:
+        return self.data[self.lo:self.hi]
+
+    def extend(
+        self,
+        left: numpy.ndarray,
+        right: numpy.ndarray,
+    ) -> Growable:
+        """
+        left / right written either side of the values in place
+        if there's room, else into a new buffer (of double the size)
+        """
+        if len(left) > self.lo or len(right) > len(self.data) - self.hi:
+            return Growable(numpy.concatenate([
+                left, self.values(), right
+            ]).astype(self.data.dtype))
+        self.data[self.lo - len(left):self.lo] = left
+        self.data[self.hi:self.hi + len(right)] = right
+        self.lo -= len(left)
+        self.hi += len(right)
+        return self
+
+@xt.nTuple.decorate()
+class Store(typing.NamedTuple):
+
+    start: int
+    end: int # inclusive
+    ords: numpy.ndarray
+    flags: memoryview
+
+    # the (ords, flags) buffers viewed by ords / flags
+    buffers: typing.Optional[tuple[Growable, Growable]] = None
+
+    @classmethod
+    def view(
+        cls,
+        start: int,
+        end: int,
+        buf_ords: Growable,
+        buf_flags: Growable,
+    ) -> Store:
+        return cls(
+            start,
+            end,
+            buf_ords.values(),
+            buf_flags.values().data,
+            (buf_ords, buf_flags),
+        )
+
+    @classmethod
+    def new(
+        cls,
+        start: int,
+        end: int,
+        ords: typing.Iterable[int],
+    ) -> Store:
+        """
+        >>> store = Store.new(10, 19, [15, 12, 15])
+        >>> store.ords
+        array([12, 15], dtype=int32)
+        >>> store.contains(12), store.contains(13)
+        (True, False)
+        """
+        ords = numpy.unique(numpy.asarray(
+            list(ords), dtype=numpy.int32
+        ))
+        assert not len(ords) or (
+            ords[0] >= start and ords[-1] <= end
+        ), dict(start=start, end=end, ords=ords)
+        flags = numpy.zeros(end - start + 1, dtype=numpy.uint8)
+        flags[ords - start] = 1
+        return cls.view(start, end, Growable(ords), Growable(flags))
+
+    def covers(self: Store, start: int, end: typing.Optional[int] = None) -> bool:
+        end = start if end is None else end
+        return start >= self.start and end <= self.end
+
+    def contains(self: Store, o: int) -> bool:
+        # NOTE: assumes o is covered
+        return self.flags[o - self.start] == 1
+
+    def mask(self: Store, start: int, end: int) -> numpy.ndarray:
+        """
+        membership over [start, end), which must be covered
+
+        >>> Store.new(10, 19, [12, 15]).mask(11, 16)
+        array([False,  True, False, False,  True])
+        """
+        assert self.covers(start, end - 1), dict(
+            store=(self.start, self.end), start=start, end=end,
+        )
+        return numpy.frombuffer(
+            self.flags, dtype=numpy.uint8
+        )[start - self.start:end - self.start].astype(bool)
+
+    def extend(
+        self: Store,
+        start: int,
+        end: int,
+        ords: typing.Iterable[int],
+    ) -> Store:
+        """
+        extend to cover [start, end] (contiguous with, or overlapping
+        the current coverage), given the ordinals within it
+
+        >>> store = Store.new(10, 19, [12, 15]).extend(19, 25, [19, 25])
+        >>> store = store.extend(5, 9, [5])
+        >>> store.start, store.end, store.ords
+        (5, 25, array([ 5, 12, 15, 25], dtype=int32))
+        >>> store.mask(5, 13).astype(int)
+        array([1, 0, 0, 0, 0, 0, 0, 1])
+        """
+        assert start <= self.end + 1 and end >= self.start - 1, dict(
+            store=(self.start, self.end), start=start, end=end,
+        )
+        ords = numpy.unique(numpy.asarray(
+            list(ords), dtype=numpy.int32
+        ))
+        # values already covered are already known
+        left = ords[ords < self.start]
+        right = ords[ords > self.end]
+
+        new_start = min(start, self.start)
+        new_end = max(end, self.end)
+
+        flags_left = numpy.zeros(self.start - new_start, dtype=numpy.uint8)
+        flags_left[left - new_start] = 1
+        flags_right = numpy.zeros(new_end - self.end, dtype=numpy.uint8)
+        flags_right[right - self.end - 1] = 1
+
+        if new_start == self.start and new_end == self.end:
+            return self
+
+        buf_ords, buf_flags = (
+            self.buffers
+            if self.buffers is not None
+            else (None, None)
+        )
+        if buf_ords is None or buf_flags is None or not (
+            len(buf_ords) == len(self.ords)
+            and len(buf_flags) == len(self.flags)
+        ):
+            # not the latest extension of its buffers
+            # (so they've since been written past its range)
+            buf_ords = Growable(numpy.asarray(self.ords))
+            buf_flags = Growable(
+                numpy.frombuffer(self.flags, dtype=numpy.uint8)
+            )
+
+        return Store.view(
+            new_start,
+            new_end,
+            buf_ords.extend(left, right),
+            buf_flags.extend(flags_left, flags_right),
+        )
+
+    def coverage(self: Store) -> tuple[datetime.date, datetime.date]:
+        return (
+            datetime.date.fromordinal(self.start),
+            datetime.date.fromordinal(self.end),
+        )
+
+    def dates(self: Store) -> list[datetime.date]:
+        return [datetime.date.fromordinal(int(o)) for o in self.ords]
+
+# ---------------------------------------------------------------
+
+# the stores are kept globally (per manager type / key)
+# so that every valid() closure (in any thread) can share them
+
+# NOTE: on thread safety, the stores are immutable
+# and only ever replaced (under LOCK), so reads need no lock
+
+# and window extension is single flight per manager type / key
+# (see key_lock), re-checking the coverage once the lock is held
+# so threads waiting on another's extension don't repeat it
+
 # ---------------------------------------------------------------
 
 global INCLUDES
 global EXCLUDES
 
-INCLUDES: dict[typing.Type, dict[str, typing.FrozenSet]] = {}
-EXCLUDES: dict[typing.Type, dict[str, typing.FrozenSet]] = {}
+INCLUDES: dict[typing.Type, dict[str, Store]] = {}
+EXCLUDES: dict[typing.Type, dict[str, Store]] = {}
+
+LOCK = threading.RLock()
+LOCKS: dict[tuple, threading.Lock] = {}
+
+def key_lock(t, k: str) -> threading.Lock:
+    res = LOCKS.get((t, k))
+    if res is None:
+        with LOCK:
+            res = LOCKS.setdefault((t, k), threading.Lock())
+    return res
+
+def store_key(self: Manager_With_K) -> str:
+    subdiv = getattr(self, "subdiv", None)
+    return self.k if subdiv is None else "{}-{}".format(self.k, subdiv)
+
+def clear(t = None):
+    """
+    clear the stored includes / excludes
+    for the given manager type, or all if None, along with
+    any (now stale) business day indices
+    """
+    with LOCK:
+        for store in [INCLUDES, EXCLUDES]:
+            if t is None:
+                store.clear()
+            else:
+                store.pop(t, None)
+    indices.clear()
+    memo.clear()
+
+def invalidate(self: Manager_With_K):
+    """
+    drop the stored includes / excludes (and any disk cache entry)
+    of the given manager, so they're re-fetched from the provider
+    """
+    t = type(self)
+    k = store_key(self)
+    with key_lock(t, k):
+        with LOCK:
+            for store in [INCLUDES, EXCLUDES]:
+                if k in store.get(t, {}):
+                    store[t] = {
+                        _k: v for _k, v in store[t].items() if _k != k
+                    }
+        if CACHE_DIR is not None and hasattr(self, "cache_key"):
+            cache_path(
+                typing.cast(Manager_With_Cache, self)
+            ).unlink(missing_ok=True)
+
+def coverage(
+    self: Manager_With_K,
+    store = EXCLUDES,
+) -> typing.Optional[tuple[datetime.date, datetime.date]]:
+    """
+    the (inclusive) range of dates checked so far, if any
+    """
+    res = store.get(type(self), {}).get(store_key(self))
+    return None if res is None else res.coverage()
 
 # ---------------------------------------------------------------
 
-def extend_includes(t, k: str, vals: typing.Iterable):
-    if t not in INCLUDES:
-        INCLUDES[t] = {k: frozenset(vals)}
-    elif k not in INCLUDES[t]:
-        INCLUDES[t][k] = frozenset(vals)
-    else:
-        INCLUDES[t][k] = INCLUDES[t][k].union(vals)
-    return INCLUDES[t][k]
-
-def extend_excludes(t, k: str, vals: typing.Iterable):
-    if t not in EXCLUDES:
-        EXCLUDES[t] = {k: frozenset(vals)}
-    elif k not in EXCLUDES[t]:
-        EXCLUDES[t][k] = frozenset(vals)
+def extend_store(
+    store,
+    t,
+    k: str,
+    start: datetime.date,
+    end: datetime.date,
+    vals: typing.Iterable[datetime.date],
+) -> Store:
+    o0 = start.toordinal()
+    o1 = end.toordinal()
+    ords = [d.toordinal() for d in vals]
+    with LOCK:
+        res = store.get(t, {}).get(k)
+        res = (
+            Store.new(o0, o1, ords)
+            if res is None
+            else res.extend(o0, o1, ords)
+        )
+        store[t] = {**store.get(t, {}), k: res}
+    return res
+
+def extend_includes(t, k: str, start, end, vals: typing.Iterable):
+    return extend_store(INCLUDES, t, k, start, end, vals)
+
+def extend_excludes(t, k: str, start, end, vals: typing.Iterable):
+    return extend_store(EXCLUDES, t, k, start, end, vals)
+
+# ---------------------------------------------------------------
+
+# NOTE: optionally, the provider results can also be cached on disk
+# so that fresh processes don't each re-query the provider
+
+# one file per manager type / key (/ subdiv), each an int32 .npy
+# (so can be memory mapped) of:
+
+# [start, end, *excluded]
+
+# as ordinals, where [start, end] is the (inclusive) range checked
+
+# the provider version is part of the file name, so upgrading
+# the provider invalidates (ie. ignores) any existing entries
+
+# opt in with set_cache_dir, or the XTENORS_CACHE env variable
+
+# ---------------------------------------------------------------
+
+CACHE_VERSION = 1
+
+global CACHE_DIR
+
+CACHE_DIR: typing.Optional[pathlib.Path] = (
+    pathlib.Path(os.environ["XTENORS_CACHE"])
+    if os.environ.get("XTENORS_CACHE")
+    else None
+)
+
+def set_cache_dir(path: typing.Optional[typing.Union[str, pathlib.Path]]):
+    global CACHE_DIR
+    CACHE_DIR = None if path is None else pathlib.Path(path)
+    return CACHE_DIR
+
+def cache_path(self: Manager_With_Cache) -> pathlib.Path:
+    assert CACHE_DIR is not None
+    name = "-".join((
+        type(self).__name__,
+        *map(str, self.cache_key()),
+        "v{}".format(CACHE_VERSION),
+    ))
+    return CACHE_DIR / (re.sub(r"[^\w.-]", "_", name) + ".npy")
+
+def cache_read(path: pathlib.Path) -> typing.Optional[numpy.ndarray]:
+    try:
+        res = numpy.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if res.ndim != 1 or len(res) < 2:
+        return None
+    return res
+
+def cache_write(path: pathlib.Path, res: numpy.ndarray):
+    # NOTE: write then rename, so concurrent readers
+    # never see a partial file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, suffix=".tmp", delete=False
+    ) as f:
+        numpy.save(f, res.astype(numpy.int32))
+    os.replace(f.name, path)
+
+def cached_excludes(
+    self: Manager_With_Cache,
+    start: datetime.date,
+    end: datetime.date,
+    f_excludes,
+) -> typing.Iterable[datetime.date]:
+    if CACHE_DIR is None:
+        with stats.timed("calendar.fetch"):
+            return f_excludes(start, end)
+
+    o0 = start.toordinal()
+    o1 = end.toordinal()
+
+    path = cache_path(self)
+    cached = cache_read(path)
+
+    if cached is not None and cached[0] <= o0 and cached[1] >= o1:
+        if stats.ENABLED:
+            stats.count("calendar.disk_cache.hits")
+        ords = cached[2:]
+        return [
+            datetime.date.fromordinal(int(o))
+            for o in ords[(ords >= o0) & (ords <= o1)]
+        ]
+
+    with stats.timed("calendar.fetch"):
+        vals = f_excludes(start, end)
+    ords = numpy.array([d.toordinal() for d in vals], dtype=numpy.int64)
+
+    # merge with the existing entry if the ranges touch
+    # otherwise we just replace it
+
+    if cached is not None and cached[0] <= o1 + 1 and cached[1] >= o0 - 1:
+        ords = numpy.union1d(ords, cached[2:])
+        o0 = min(o0, int(cached[0]))
+        o1 = max(o1, int(cached[1]))
     else:
-        EXCLUDES[t][k] = EXCLUDES[t][k].union(vals)
-    return EXCLUDES[t][k]
+        ords = numpy.unique(ords)
+
+    del cached
+    cache_write(path, numpy.concatenate([[o0, o1], ords]))
+    return vals
 
 # ---------------------------------------------------------------
 
@@ -240,59 +794,81 @@ def extend_excludes(t, k: str, vals: typing.Iterable):
 
 # ---------------------------------------------------------------
 
-def date_exclusion_valid(
+def date_store_valid(
     self: Manager_With_K,
     calendar: Stateful,
-    val: bool
+    included: bool,
+    store,
 ) -> typing.Callable[[DDT], bool]:
+    """
+    whether current is (included) or isn't (not included)
+    in the given store, extending the store as required
+    """
     t = type(self)
-    state = None
-    excl = EXCLUDES[t][self.k]
+    k = store_key(self)
+    state: typing.Optional[Store] = store.get(t, {}).get(k)
     def f(current: DDT) -> bool:
         nonlocal state
-        nonlocal excl
         if not self.in_scope(calendar, state, current):
             state = self.update(calendar, state, current)
-            excl = EXCLUDES[t][self.k]
+        assert state is not None
         if isinstance(current, datetime.datetime):
-            res = current.date() not in excl
-        else:
-            res = current not in excl
-        return res if val else not res
+            current = current.date()
+        return state.contains(current.toordinal()) == included
     return f
 
+def date_exclusion_valid(
+    self: Manager_With_K,
+    calendar: Stateful,
+    val: bool
+) -> typing.Callable[[DDT], bool]:
+    return date_store_valid(self, calendar, not val, EXCLUDES)
+
 def date_inclusion_valid(
     self: Manager_With_K,
     calendar: Stateful,
     val: bool
 ) -> typing.Callable[[DDT], bool]:
-    t = type(self)
-    state = None
-    incl = INCLUDES[t][self.k]
-    def f(current: DDT) -> bool:
-        nonlocal state
-        nonlocal incl
-        if not self.in_scope(calendar, state, current):
-            state = self.update(calendar, state, current)
-            incl = INCLUDES[t][self.k]
-        if isinstance(current, datetime.datetime):
-            res = current.date() in incl
-        else:
-            res = current in incl
-        return res if val else not res
-    return f
+    return date_store_valid(self, calendar, val, INCLUDES)
+
+def date_exclusion_mask(
+    self: Manager_With_K,
+    calendar: Stateful,
+    val: bool,
+    start: int,
+    end: int,
+    store = EXCLUDES,
+) -> numpy.ndarray:
+    # NOTE: calling valid at either end ensures the store
+    # covers the full range (as the coverage is contiguous)
+    f = self.valid(calendar)
+    f(datetime.date.fromordinal(start))
+    f(datetime.date.fromordinal(end - 1))
+    res = ~store[type(self)][store_key(self)].mask(start, end)
+    return res if val else ~res
+
+def date_inclusion_mask(
+    self: Manager_With_K,
+    calendar: Stateful,
+    val: bool,
+    start: int,
+    end: int,
+) -> numpy.ndarray:
+    return ~date_exclusion_mask(
+        self, calendar, val, start, end, store=INCLUDES
+    )
 
 # ---------------------------------------------------------------
 
 def date_exclusion_in_scope(
     self: Manager, 
     calendar: Stateful,
-    state: typing.Optional[tuple[DDT, DDT]],
+    state: typing.Optional[Store],
     current: DDT,
 ) -> bool:
     if state is None:
         return False
-    return current >= state[0] and current <= state[1]
+    return state.covers(current.toordinal())
 
 date_inclusion_in_scope = date_exclusion_in_scope
 
@@ -301,45 +877,182 @@ date_inclusion_in_scope = date_exclusion_in_scope
 def date_exclusion_update(
     self: Manager_With_Window, 
     calendar: Stateful,
-    state: typing.Optional[tuple[DDT, DDT]],
+    state: typing.Optional[Store],
     current: DDT,
     f_excludes,
-    f_extend=extend_excludes,
-) -> tuple[DDT, DDT]:
+    store=EXCLUDES,
+) -> Store:
 
     if isinstance(current, datetime.datetime):
         current = current.date()
 
-    if state is None:
-        start = current - self.window
-        end = current + self.window
-        state = (start, end,)
+    t = type(self)
+    k = store_key(self)
+
+    # NOTE: the given (closure) state is superseded by the global
+    # store, which always covers at least as much
+
+    state = store.get(t, {}).get(k)
+    if date_exclusion_in_scope(self, calendar, state, current):
+        return state
+
+    with key_lock(t, k):
+        state = store.get(t, {}).get(k)
+        return date_exclusion_extend(
+            self,
+            calendar,
+            state,
+            current,
+            f_excludes,
+            store,
+        )
 
-    elif current < state[0]:
-        start = current - self.window
-        end = state[0]
-        state = (start, state[1],)
+# NOTE: extensions are in whole years, and (when extending
+# an existing range) by at least the width already covered
+# (up to EXTENSION_MAX), in the direction of the current date
 
-    elif current > state[1]:
-        start = state[1]
-        end = current + self.window
-        state = (state[0], end,)
+# so a long walk in one direction only queries the provider
+# a handful of times, rather than once per window
+
+EXTENSION_MAX = datetime.timedelta(days=366 * 16)
+
+def year_start(d: datetime.date) -> datetime.date:
+    return datetime.date(d.year, 1, 1)
+
+def year_end(d: datetime.date) -> datetime.date:
+    return datetime.date(d.year, 12, 31)
+
+def date_exclusion_extend(
+    self: Manager_With_Window, 
+    calendar: Stateful,
+    state: typing.Optional[Store],
+    current: datetime.date,
+    f_excludes,
+    store,
+) -> Store:
+
+    if state is None:
+        return date_exclusion_cover(self, state, (
+            year_start(current - self.window),
+            year_end(current + self.window),
+        ), f_excludes, store)
+
+    start, end = state.coverage()
+    width = min(max(self.window, end - start), EXTENSION_MAX)
+
+    if current < start:
+        target = (
+            year_start(min(current - self.window, start - width)),
+            end,
+        )
+
+    elif current > end:
+        target = (
+            start,
+            year_end(max(current + self.window, end + width)),
+        )
 
     else:
         return state
 
-    f_extend(
-        type(self), self.k, f_excludes(start, end)
+    return date_exclusion_cover(
+        self, state, target, f_excludes, store
     )
+
+def date_exclusion_cover(
+    self: Manager_With_Window,
+    state: typing.Optional[Store],
+    target: tuple[datetime.date, datetime.date],
+    f_excludes,
+    store,
+) -> Store:
+    # NOTE: expects the key lock to be held
+    # and keeps the coverage contiguous, so fetches any gap too
+
+    if state is None:
+        fetch = [target]
+    else:
+        start, end = state.coverage()
+        fetch = []
+        if target[0] < start:
+            fetch.append((target[0], start))
+        if target[1] > end:
+            fetch.append((end, target[1]))
+
+    t = type(self)
+    k = store_key(self)
+
+    for start, end in fetch:
+        with stats.timed("calendar.extension"):
+            state = extend_store(
+                store, t, k, start, end, cached_excludes(
+                    self, start, end, f_excludes
+                )
+            )
+
+    assert state is not None
     return state
 
+def date_exclusion_prefetch(
+    self: Manager_With_Window,
+    calendar: Stateful,
+    start: DDT,
+    end: DDT,
+    f_excludes,
+    store=EXCLUDES,
+) -> Store:
+    """
+    extend the coverage to (at least) [start, end], year aligned
+    in at most two provider calls (one either side)
+    """
+    if isinstance(start, datetime.datetime):
+        start = start.date()
+    if isinstance(end, datetime.datetime):
+        end = end.date()
+
+    t = type(self)
+    k = store_key(self)
+
+    with key_lock(t, k):
+        return date_exclusion_cover(
+            self,
+            store.get(t, {}).get(k),
+            (year_start(start), year_end(end)),
+            f_excludes,
+            store,
+        )
+
 date_inclusion_update = functools.partial(
-    date_exclusion_update, f_extend=extend_includes
+    date_exclusion_update, 
+    store=INCLUDES,
+)
+
+date_inclusion_prefetch = functools.partial(
+    date_exclusion_prefetch, 
+    store=INCLUDES,
 )
 
 # ---------------------------------------------------------------
 
-import pandas_market_calendars # type: ignore
+# NOTE: the providers (and so pandas) are only imported on first
+# query, as they dominate the import time of the package otherwise
+
+# and their versions are read from the package metadata
+# so that a warm disk cache never needs to import them at all
+
+@functools.lru_cache(maxsize=None)
+def provider_version(name: str) -> str:
+    return importlib.metadata.version(name)
+
+def import_pandas_market_calendars():
+    import pandas_market_calendars # type: ignore
+    return pandas_market_calendars
+
+def import_holidays():
+    import holidays # type: ignore
+    return holidays
+
+# ---------------------------------------------------------------
 
 @xt.nTuple.decorate()
 class Manager_Pandas_Market_Calendar(typing.NamedTuple):
@@ -349,7 +1062,11 @@ class Manager_Pandas_Market_Calendar(typing.NamedTuple):
 
     closed: bool = False
 
+    def cache_key(self) -> tuple:
+        return (self.k, provider_version("pandas_market_calendars"))
+
     def f_excludes(self, start, end):
+        pandas_market_calendars = import_pandas_market_calendars()
         cal = pandas_market_calendars.get_calendar(self.k)
         valid = frozenset([
             d.to_pydatetime().date() for d in cal.valid_days(
@@ -363,7 +1080,9 @@ class Manager_Pandas_Market_Calendar(typing.NamedTuple):
             end=end,
             accept=lambda d: d not in valid,
         ).gen()
-        return xt.iTuple(gen)
+        return xt.iTuple.from_where(
+            gen, lambda y, v: y, star=True
+        ).mapstar(lambda y, v: v)
 
     def valid(
         self: Manager_Pandas_Market_Calendar,
@@ -373,10 +1092,20 @@ class Manager_Pandas_Market_Calendar(typing.NamedTuple):
             self, calendar, not self.closed
         )
 
+    def mask(
+        self: Manager_Pandas_Market_Calendar,
+        calendar: Stateful,
+        start: int,
+        end: int,
+    ) -> numpy.ndarray:
+        return date_exclusion_mask(
+            self, calendar, not self.closed, start, end
+        )
+
     def in_scope(
         self: Manager_Pandas_Market_Calendar, 
         calendar: Stateful,
-        state: typing.Optional[tuple[DDT, DDT]],
+        state: typing.Optional[Store],
         current: DDT,
     ) -> bool:
         return date_exclusion_in_scope(
@@ -389,9 +1118,9 @@ class Manager_Pandas_Market_Calendar(typing.NamedTuple):
     def update(
         self: Manager_Pandas_Market_Calendar, 
         calendar: Stateful,
-        state: typing.Optional[tuple[DDT, DDT]],
+        state: typing.Optional[Store],
         current: DDT,
-    ) -> tuple[DDT, DDT]:
+    ) -> Store:
         return date_exclusion_update(
             self,
             calendar,
@@ -400,9 +1129,21 @@ class Manager_Pandas_Market_Calendar(typing.NamedTuple):
             self.f_excludes,
         )
 
-# ---------------------------------------------------------------
+    def prefetch(
+        self: Manager_Pandas_Market_Calendar,
+        calendar: Stateful,
+        start: DDT,
+        end: DDT,
+    ) -> Store:
+        return date_exclusion_prefetch(
+            self,
+            calendar,
+            start,
+            end,
+            self.f_excludes,
+        )
 
-import holidays
+# ---------------------------------------------------------------
 
 @xt.nTuple.decorate()
 class Manager_Holidays_Country(typing.NamedTuple):
@@ -413,7 +1154,11 @@ class Manager_Holidays_Country(typing.NamedTuple):
 
     exclude: bool = True
 
+    def cache_key(self) -> tuple:
+        return (self.k, self.subdiv, provider_version("holidays"))
+
     def f_excludes(self, start, end):
+        holidays = import_holidays()
         hols = holidays.country_holidays(
             self.k, subdiv=self.subdiv
         )
@@ -423,7 +1168,9 @@ class Manager_Holidays_Country(typing.NamedTuple):
             end=end,
             accept=lambda d: d in hols,
         ).gen()
-        return xt.iTuple(gen)
+        return xt.iTuple.from_where(
+            gen, lambda y, v: y, star=True
+        ).mapstar(lambda y, v: v)
 
     def valid(
         self: Manager_Holidays_Country,
@@ -433,10 +1180,20 @@ class Manager_Holidays_Country(typing.NamedTuple):
             self, calendar, self.exclude
         )
 
+    def mask(
+        self: Manager_Holidays_Country,
+        calendar: Stateful,
+        start: int,
+        end: int,
+    ) -> numpy.ndarray:
+        return date_exclusion_mask(
+            self, calendar, self.exclude, start, end
+        )
+
     def in_scope(
         self: Manager_Holidays_Country, 
         calendar: Stateful,
-        state: typing.Optional[tuple[DDT, DDT]],
+        state: typing.Optional[Store],
         current: DDT,
     ) -> bool:
         return date_exclusion_in_scope(
@@ -449,9 +1206,9 @@ class Manager_Holidays_Country(typing.NamedTuple):
     def update(
         self: Manager_Holidays_Country, 
         calendar: Stateful,
-        state: typing.Optional[tuple[DDT, DDT]],
+        state: typing.Optional[Store],
         current: DDT,
-    ) -> tuple[DDT, DDT]:
+    ) -> Store:
         return date_exclusion_update(
             self,
             calendar,
@@ -460,6 +1217,20 @@ class Manager_Holidays_Country(typing.NamedTuple):
             self.f_excludes,
         )
 
+    def prefetch(
+        self: Manager_Holidays_Country,
+        calendar: Stateful,
+        start: DDT,
+        end: DDT,
+    ) -> Store:
+        return date_exclusion_prefetch(
+            self,
+            calendar,
+            start,
+            end,
+            self.f_excludes,
+        )
+
 # ---------------------------------------------------------------
 
 @xt.nTuple.decorate()
@@ -470,7 +1241,11 @@ class Manager_Holidays_Financial(typing.NamedTuple):
 
     exclude: bool = True
 
+    def cache_key(self) -> tuple:
+        return (self.k, provider_version("holidays"))
+
     def f_excludes(self, start, end):
+        holidays = import_holidays()
         hols = holidays.financial_holidays(self.k)
         _, gen = iterators. Iterator(
             start,
@@ -478,7 +1253,9 @@ class Manager_Holidays_Financial(typing.NamedTuple):
             end=end,
             accept=lambda d: d in hols,
         ).gen()
-        return xt.iTuple(gen)
+        return xt.iTuple.from_where(
+            gen, lambda y, v: y, star=True
+        ).mapstar(lambda y, v: v)
 
     def valid(
         self: Manager_Holidays_Financial,
@@ -488,10 +1265,20 @@ class Manager_Holidays_Financial(typing.NamedTuple):
             self, calendar, self.exclude
         )
 
+    def mask(
+        self: Manager_Holidays_Financial,
+        calendar: Stateful,
+        start: int,
+        end: int,
+    ) -> numpy.ndarray:
+        return date_exclusion_mask(
+            self, calendar, self.exclude, start, end
+        )
+
     def in_scope(
         self: Manager_Holidays_Financial, 
         calendar: Stateful,
-        state: typing.Optional[tuple[DDT, DDT]],
+        state: typing.Optional[Store],
         current: DDT,
     ) -> bool:
         return date_exclusion_in_scope(
@@ -504,9 +1291,9 @@ class Manager_Holidays_Financial(typing.NamedTuple):
     def update(
         self: Manager_Holidays_Financial, 
         calendar: Stateful,
-        state: typing.Optional[tuple[DDT, DDT]],
+        state: typing.Optional[Store],
         current: DDT,
-    ) -> tuple[DDT, DDT]:
+    ) -> Store:
         return date_exclusion_update(
             self,
             calendar,
@@ -515,4 +1302,436 @@ class Manager_Holidays_Financial(typing.NamedTuple):
             self.f_excludes,
         )
 
-# ---------------------------------------------------------------
\ No newline at end of file
+    def prefetch(
+        self: Manager_Holidays_Financial,
+        calendar: Stateful,
+        start: DDT,
+        end: DDT,
+    ) -> Store:
+        return date_exclusion_prefetch(
+            self,
+            calendar,
+            start,
+            end,
+            self.f_excludes,
+        )
+
+# ---------------------------------------------------------------
+
+# NOTE: a compiled calendar is a packed bitmap of validity
+# over a range of day ordinals (bit i <-> ordinal start + i)
+
+# out of range values defer to the underlying calendar
+
+# ---------------------------------------------------------------
+
+@xt.nTuple.decorate()
+class Compiled(typing.NamedTuple):
+
+    calendar: Calendar
+    start: int
+    end: int
+    # or a read only view, eg. of shared memory (see batch.attach)
+    bits: typing.Union[bytes, memoryview]
+
+    @classmethod
+    def from_mask(
+        cls,
+        calendar: Calendar,
+        start: int,
+        mask: numpy.ndarray,
+    ) -> Compiled:
+        return cls(
+            calendar,
+            start,
+            start + len(mask),
+            numpy.packbits(mask, bitorder="little").tobytes(),
+        )
+
+    def packed(self: Compiled) -> numpy.ndarray:
+        """
+        zero-copy uint8 view of the bitmap (little bit order)
+
+        >>> compile_calendar(Weekday(True), year(2020, d=3), year(2020, d=13)).packed()
+        array([249,   0], dtype=uint8)
+        """
+        return numpy.frombuffer(self.bits, dtype=numpy.uint8)
+
+    def bools(self: Compiled) -> numpy.ndarray:
+        """
+        >>> compile_calendar(Weekday(True), year(2020, d=3), year(2020, d=7)).bools()
+        array([ True, False, False,  True])
+        """
+        return numpy.unpackbits(
+            self.packed(),
+            count=self.end - self.start,
+            bitorder="little",
+        ).view(bool)
+
+    def mask(self: Compiled, start: int, end: int) -> numpy.ndarray:
+        """
+        >>> cal = compile_calendar(Weekday(True), year(2020, d=3), year(2020, d=5))
+        >>> cal.mask(year(2020, d=1).toordinal(), year(2020, d=7).toordinal())
+        array([ True,  True,  True, False, False,  True])
+        """
+        if start >= self.start and end <= self.end:
+            return self.bools()[start - self.start:end - self.start]
+        lo = min(max(start, self.start), end)
+        hi = max(min(end, self.end), lo)
+        return numpy.concatenate([
+            indices.mask(self.calendar, start, lo),
+            self.bools()[lo - self.start:hi - self.start]
+            if lo < hi
+            else numpy.zeros(0, dtype=bool),
+            indices.mask(self.calendar, hi, end),
+        ])
+
+    def extend(self: Compiled, start: int, end: int) -> Compiled:
+        """
+        compiled over the union of [start, end) and the current range
+        (only the new days are queried from the calendar)
+
+        >>> cal = compile_calendar(Weekday(True), year(2020, d=3), year(2020, d=5))
+        >>> cal = cal.extend(year(2020, d=1).toordinal(), year(2020, d=7).toordinal())
+        >>> cal.end - cal.start, cal.bools()
+        (6, array([ True,  True,  True, False, False,  True]))
+        """
+        start = min(start, self.start)
+        end = max(end, self.end)
+        return Compiled.from_mask(
+            self.calendar, start, self.mask(start, end)
+        )
+
+    def valid(self: Compiled) -> typing.Callable[[DDT], bool]:
+        """
+        >>> f = compile_calendar(Weekday(True), year(2020), year(2021)).valid()
+        >>> f(year(2020, d=3)), f(year(2020, d=4)), f(year(2021, d=4))
+        (True, False, True)
+        """
+        bits = self.bits
+        start = self.start
+        n = self.end - self.start
+        f_calendar: typing.Optional[typing.Callable[[DDT], bool]] = None
+        def f(current: DDT) -> bool:
+            nonlocal f_calendar
+            i = current.toordinal() - start
+            if i >= 0 and i < n:
+                return bool((bits[i >> 3] >> (i & 7)) & 1)
+            if f_calendar is None:
+                f_calendar = self.calendar.valid()
+            return f_calendar(current)
+        return f
+
+    def jump(self: Compiled) -> typing.Callable[[DDT, int], DDT]:
+        """
+        >>> f = compile_calendar(Weekday(True), year(2020), year(2021)).jump()
+        >>> f(year(2020, d=4), 1), f(year(2020, d=4), -1), f(year(2021, d=2), 1)
+        (datetime.date(2020, 1, 6), datetime.date(2020, 1, 3), datetime.date(2021, 1, 4))
+        """
+        valid = indices.Index.from_mask(self.start, self.bools()).valid
+        start = self.start
+        end = self.end
+        f_calendar: typing.Optional[
+            typing.Callable[[DDT, int], DDT]
+        ] = None
+        def f(current: DDT, direction: int) -> DDT:
+            nonlocal f_calendar
+            o = current.toordinal()
+            if o >= start and o < end:
+                if direction > 0:
+                    i = int(numpy.searchsorted(valid, o, side="left"))
+                    found = i < len(valid)
+                else:
+                    i = int(numpy.searchsorted(valid, o, side="right")) - 1
+                    found = i >= 0
+                if found:
+                    return current + days(int(valid[i]) - o)
+                # nothing valid in range in that direction
+                current += days((end if direction > 0 else start - 1) - o)
+            if f_calendar is None:
+                f_jump = getattr(self.calendar, "jump", None)
+                f_calendar = (
+                    f_jump()
+                    if f_jump is not None
+                    else stepped_jump(self.calendar.valid())
+                )
+            return f_calendar(current, direction)
+        return f
+
+    def iterator(
+        self, 
+        start: DDT,
+        step: datetime.timedelta,
+        **kwargs
+    ):
+        f = kwargs.pop("accept", None)
+        valid = self.valid()
+        accept = (
+            valid
+            if f is None
+            else lambda ddt: valid(ddt) and f(ddt)
+        )
+        return iterators.Iterator(
+            start,
+            step,
+            **kwargs, 
+            accept=accept,
+            calendar=self if f is None else None,
+            jump=self.jump() if f is None else None,
+        )
+
+def compile_calendar(
+    calendar: Calendar,
+    start: DDT,
+    end: DDT,
+) -> Compiled:
+    """
+    compile calendar into a bitmap over [start, end)
+    """
+    if isinstance(calendar, Compiled):
+        calendar = calendar.calendar
+    o0 = start.toordinal()
+    o1 = end.toordinal()
+    return Compiled.from_mask(
+        calendar, o0, indices.mask(calendar, o0, o1)
+    )
+
+# ---------------------------------------------------------------
+
+# NOTE: union / intersection of calendars operate on their
+# validity masks (so bitwise or / and over a range)
+
+# valid() compiles the result lazily, over whole years
+# extending as required
+
+# see iterators.union / intersection for the generator form
+# (eg. for arbitrary accept predicates)
+
+# ---------------------------------------------------------------
+
+def compiled_valid(calendar: Calendar) -> typing.Callable[[DDT], bool]:
+    compiled: typing.Optional[Compiled] = None
+    f_compiled: typing.Callable[[DDT], bool] = lambda current: False
+    def f(current: DDT) -> bool:
+        nonlocal compiled
+        nonlocal f_compiled
+        o = current.toordinal()
+        if compiled is None or not (
+            o >= compiled.start and o < compiled.end
+        ):
+            start, end = indices.year_aligned(o, o + 1)
+            compiled = (
+                Compiled.from_mask(
+                    calendar, start, indices.mask(calendar, start, end)
+                )
+                if compiled is None
+                else compiled.extend(start, end)
+            )
+            f_compiled = compiled.valid()
+        return f_compiled(current)
+    return f
+
+@xt.nTuple.decorate()
+class Union(typing.NamedTuple):
+
+    calendars: tuple
+
+    def mask(self: Union, start: int, end: int) -> numpy.ndarray:
+        """
+        >>> cal = union_calendars(Weekday(0), Weekday(1))
+        >>> cal.mask(year(2020, d=6).toordinal(), year(2020, d=13).toordinal())
+        array([ True,  True, False, False, False, False, False])
+        """
+        return numpy.logical_or.reduce([
+            indices.mask(calendar, start, end)
+            for calendar in self.calendars
+        ])
+
+    def valid(self: Union) -> typing.Callable[[DDT], bool]:
+        """
+        >>> f = union_calendars(Weekday(0), Weekday(1)).valid()
+        >>> f(year(2020, d=6)), f(year(2020, d=8)), f(year(1990, d=2))
+        (True, False, True)
+        """
+        return compiled_valid(self)
+
+    def iterator(
+        self, 
+        start: DDT,
+        step: datetime.timedelta,
+        **kwargs
+    ):
+        f = kwargs.pop("accept", None)
+        valid = self.valid()
+        accept = (
+            valid
+            if f is None
+            else lambda ddt: valid(ddt) and f(ddt)
+        )
+        return iterators.Iterator(
+            start,
+            step,
+            **kwargs, 
+            accept=accept,
+            calendar=self if f is None else None,
+        )
+
+@xt.nTuple.decorate()
+class Intersection(typing.NamedTuple):
+
+    calendars: tuple
+
+    def mask(self: Intersection, start: int, end: int) -> numpy.ndarray:
+        """
+        >>> cal = intersection_calendars(Weekday([0, 1]), Weekday([1, 2]))
+        >>> cal.mask(year(2020, d=6).toordinal(), year(2020, d=13).toordinal())
+        array([False,  True, False, False, False, False, False])
+        """
+        return numpy.logical_and.reduce([
+            indices.mask(calendar, start, end)
+            for calendar in self.calendars
+        ])
+
+    def valid(self: Intersection) -> typing.Callable[[DDT], bool]:
+        """
+        >>> f = intersection_calendars(Weekday([0, 1]), Weekday([1, 2])).valid()
+        >>> f(year(2020, d=6)), f(year(2020, d=7)), f(year(2020, d=8))
+        (False, True, False)
+        """
+        return compiled_valid(self)
+
+    def iterator(
+        self, 
+        start: DDT,
+        step: datetime.timedelta,
+        **kwargs
+    ):
+        f = kwargs.pop("accept", None)
+        valid = self.valid()
+        accept = (
+            valid
+            if f is None
+            else lambda ddt: valid(ddt) and f(ddt)
+        )
+        return iterators.Iterator(
+            start,
+            step,
+            **kwargs, 
+            accept=accept,
+            calendar=self if f is None else None,
+        )
+
+def union_calendars(*calendars: Calendar) -> Union:
+    """
+    >>> from .indices import add
+    >>> add(union_calendars(Weekday(0), Weekday(2)), year(2020, d=6), 3)
+    datetime.date(2020, 1, 15)
+    """
+    assert len(calendars) > 1, calendars
+    return Union(tuple(calendars))
+
+def intersection_calendars(*calendars: Calendar) -> Intersection:
+    """
+    >>> from .indices import add
+    >>> add(intersection_calendars(Weekday(True), Weekday([0, 4, 5])), year(2020, d=6), 3)
+    datetime.date(2020, 1, 17)
+    """
+    assert len(calendars) > 1, calendars
+    return Intersection(tuple(calendars))
+
+# ---------------------------------------------------------------
+
+# NOTE: loading many stateful calendars up front (eg. at startup)
+# is dominated by the provider calls, which are mostly io / c
+# so are fetched concurrently on a thread pool
+
+# (distinct manager keys don't contend, see key_lock)
+
+# ---------------------------------------------------------------
+
+def load_one(
+    calendar: typing.Union[Stateful, Manager],
+    start: DDT,
+    end: DDT,
+    index: bool = True,
+    compiled: bool = False,
+):
+    cal: Calendar
+    if isinstance(calendar, Stateful) or not hasattr(calendar, "in_scope"):
+        cal = typing.cast(Calendar, calendar)
+    else:
+        # a manager, rather than a calendar
+        cal = Stateful(calendar)
+    if isinstance(cal, Stateful):
+        cal.prefetch(start, end)
+    if index:
+        indices.index(
+            cal, start.toordinal(), end.toordinal() + 1
+        )
+    return compile_calendar(
+        cal, start, end + days(1)
+    ) if compiled else cal
+
+def load(
+    calendars: typing.Iterable[typing.Union[Stateful, Manager]],
+    start: DDT,
+    end: DDT,
+    index: bool = True,
+    compiled: bool = False,
+    max_workers: typing.Optional[int] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+) -> list:
+    """
+    load the given calendars (or managers) over [start, end]
+    concurrently, returning them (in the given order) ready to use
+
+    index: also build each business day index over the range
+    compiled: return each as a bitmap compiled over the range
+
+    >>> load([Weekday(True)], year(2020), year(2021), compiled=True)[0].valid()(year(2020, d=4))
+    False
+    """
+    calendars = list(calendars)
+    f = functools.partial(
+        load_one,
+        start=start,
+        end=end,
+        index=index,
+        compiled=compiled,
+    )
+    if not len(calendars):
+        return []
+    if executor is not None:
+        return list(executor.map(f, calendars))
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers or len(calendars)
+    ) as pool:
+        return list(pool.map(f, calendars))
+
+async def load_async(
+    calendars: typing.Iterable[typing.Union[Stateful, Manager]],
+    start: DDT,
+    end: DDT,
+    index: bool = True,
+    compiled: bool = False,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
+) -> list:
+    """
+    as load, but awaitable (running on the loop's default
+    executor, unless given one)
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    return list(await asyncio.gather(*(
+        loop.run_in_executor(executor, functools.partial(
+            load_one,
+            calendar,
+            start,
+            end,
+            index=index,
+            compiled=compiled,
+        ))
+        for calendar in calendars
+    )))
+
+# ---------------------------------------------------------------
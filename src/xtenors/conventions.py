@@ -25,6 +25,24 @@ class Modified(enum.Enum):
 
 # ---------------------------------------------------------------
 
+class Stub(enum.Enum):
+    SHORT = 0
+    LONG = 1
+
+# ---------------------------------------------------------------
+
+class DayCount(enum.Enum):
+    ACT_360 = 0
+    ACT_365F = 1
+    ACT_ACT_ISDA = 2
+    ACT_ACT_ICMA = 3
+    THIRTY_360 = 4
+    THIRTY_E_360 = 5
+    THIRTY_E_360_ISDA = 6
+    BUS_252 = 7
+
+# ---------------------------------------------------------------
+
 class Format(enum.Enum):
     ISO = 0
 
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import typing
+
+import datetime
+import calendar
+
+import numpy
+
+from .dates import *
+from .units import *
+
+from . import conventions
+from . import indices
+
+# ---------------------------------------------------------------
+
+# NOTE: year fractions between start and end dates
+# per conventions.DayCount, with a scalar kernel (on dates)
+# and an array kernel (on datetime64[D] arrays) per convention
+
+# ACT_ACT_ICMA needs the reference (coupon) period and frequency
+# BUS_252 needs a calendar (whose valid days are business days)
+
+# THIRTY_E_360_ISDA optionally takes the maturity date
+# (as february month end isn't adjusted for that)
+
+# ---------------------------------------------------------------
+
+def days_in_year(y: int) -> int:
+    return 366 if calendar.isleap(y) else 365
+
+def is_month_end(d: datetime.date) -> bool:
+    return d.day == calendar.monthrange(d.year, d.month)[1]
+
+def thirty_360(y1, m1, d1, y2, m2, d2):
+    return (
+        360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)
+    ) / 360
+
+# ---------------------------------------------------------------
+
+def act_360(start, end, **kwargs) -> float:
+    return (end.toordinal() - start.toordinal()) / 360
+
+def act_365f(start, end, **kwargs) -> float:
+    return (end.toordinal() - start.toordinal()) / 365
+
+def act_act_isda(start, end, **kwargs) -> float:
+    if end < start:
+        return -act_act_isda(end, start)
+    y1 = start.year
+    y2 = end.year
+    if y1 == y2:
+        return (end.toordinal() - start.toordinal()) / days_in_year(y1)
+    return (
+        (year(y1 + 1).toordinal() - start.toordinal()) / days_in_year(y1)
+        + (y2 - y1 - 1)
+        + (end.toordinal() - year(y2).toordinal()) / days_in_year(y2)
+    )
+
+def act_act_icma(
+    start,
+    end,
+    frequency: typing.Optional[int] = None,
+    ref_start = None,
+    ref_end = None,
+    **kwargs,
+) -> float:
+    assert frequency is not None, "ACT_ACT_ICMA requires frequency"
+    ref_start = start if ref_start is None else ref_start
+    ref_end = end if ref_end is None else ref_end
+    return (end.toordinal() - start.toordinal()) / (
+        frequency * (ref_end.toordinal() - ref_start.toordinal())
+    )
+
+def thirty_360_bond(start, end, **kwargs) -> float:
+    d1 = min(start.day, 30)
+    d2 = end.day
+    if d2 == 31 and d1 == 30:
+        d2 = 30
+    return thirty_360(
+        start.year, start.month, d1, end.year, end.month, d2
+    )
+
+def thirty_e_360(start, end, **kwargs) -> float:
+    return thirty_360(
+        start.year, start.month, min(start.day, 30),
+        end.year, end.month, min(end.day, 30),
+    )
+
+def thirty_e_360_isda(start, end, maturity = None, **kwargs) -> float:
+    d1 = 30 if is_month_end(start) else start.day
+    d2 = (
+        30 if is_month_end(end) and not (
+            end.month == 2 and end == maturity
+        )
+        else end.day
+    )
+    return thirty_360(
+        start.year, start.month, d1, end.year, end.month, d2
+    )
+
+def bus_252(start, end, calendar = None, **kwargs) -> float:
+    assert calendar is not None, "BUS_252 requires calendar"
+    return indices.count(calendar, start, end) / 252
+
+# ---------------------------------------------------------------
+
+YEAR_FRACTIONS: dict[conventions.DayCount, typing.Callable] = {
+    conventions.DayCount.ACT_360: act_360,
+    conventions.DayCount.ACT_365F: act_365f,
+    conventions.DayCount.ACT_ACT_ISDA: act_act_isda,
+    conventions.DayCount.ACT_ACT_ICMA: act_act_icma,
+    conventions.DayCount.THIRTY_360: thirty_360_bond,
+    conventions.DayCount.THIRTY_E_360: thirty_e_360,
+    conventions.DayCount.THIRTY_E_360_ISDA: thirty_e_360_isda,
+    conventions.DayCount.BUS_252: bus_252,
+}
+
+def year_fraction(
+    start: DDT,
+    end: DDT,
+    convention: conventions.DayCount,
+    **kwargs,
+) -> float:
+    """
+    kwargs: frequency / ref_start / ref_end (ACT_ACT_ICMA)
+    maturity (THIRTY_E_360_ISDA), calendar (BUS_252)
+
+    >>> start, end = year(2019, 12, 31), year(2021, 3, 31)
+    >>> year_fraction(start, end, conventions.DayCount.ACT_360)
+    1.2666666666666666
+    >>> year_fraction(start, end, conventions.DayCount.ACT_ACT_ISDA)
+    1.2465753424657535
+    >>> year_fraction(start, end, conventions.DayCount.THIRTY_360)
+    1.25
+    >>> year_fraction(year(2020, 2, 29), year(2020, 8, 31), conventions.DayCount.THIRTY_E_360_ISDA)
+    0.5
+    >>> year_fraction(year(2020, 2, 29), year(2020, 8, 31), conventions.DayCount.THIRTY_E_360)
+    0.5027777777777778
+    >>> year_fraction(year(2020, 1, 15), year(2020, 4, 15), conventions.DayCount.ACT_ACT_ICMA, frequency=4)
+    0.25
+    >>> from .calendars import Weekday
+    >>> year_fraction(year(2020, 1, 1), year(2020, 1, 8), conventions.DayCount.BUS_252, calendar=Weekday(True))
+    0.01984126984126984
+    """
+    return YEAR_FRACTIONS[convention](start, end, **kwargs)
+
+# ---------------------------------------------------------------
+
+def unpack_array(ds: numpy.ndarray) -> tuple[
+    numpy.ndarray, numpy.ndarray, numpy.ndarray
+]:
+    """
+    >>> unpack_array(numpy.array(["2020-02-29"], dtype="datetime64[D]"))
+    (array([2020]), array([2]), array([29]))
+    """
+    ys = ds.astype("datetime64[Y]")
+    ms = ds.astype("datetime64[M]")
+    return (
+        ys.astype(numpy.int64) + 1970,
+        (ms - ys.astype("datetime64[M]")).astype(numpy.int64) + 1,
+        (ds - ms.astype("datetime64[D]")).astype(numpy.int64) + 1,
+    )
+
+def is_month_end_array(ds: numpy.ndarray) -> numpy.ndarray:
+    return (ds + 1).astype("datetime64[M]") != ds.astype("datetime64[M]")
+
+def days_in_year_array(ys: numpy.ndarray) -> numpy.ndarray:
+    return (
+        (ys + 1).astype("datetime64[D]") - ys.astype("datetime64[D]")
+    ).astype(numpy.int64)
+
+def days_between_array(starts, ends) -> numpy.ndarray:
+    return (ends - starts).astype(numpy.int64)
+
+def thirty_360_array(y1, m1, d1, y2, m2, d2):
+    return (
+        360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)
+    ) / 360
+
+# ---------------------------------------------------------------
+
+def act_360_array(starts, ends, **kwargs):
+    return days_between_array(starts, ends) / 360
+
+def act_365f_array(starts, ends, **kwargs):
+    return days_between_array(starts, ends) / 365
+
+def act_act_isda_array(starts, ends, **kwargs):
+    sign = numpy.where(ends < starts, -1, 1)
+    starts, ends = (
+        numpy.minimum(starts, ends), numpy.maximum(starts, ends)
+    )
+    ys1 = starts.astype("datetime64[Y]")
+    ys2 = ends.astype("datetime64[Y]")
+    basis1 = days_in_year_array(ys1)
+    basis2 = days_in_year_array(ys2)
+    same = ys1 == ys2
+    res = numpy.where(
+        same,
+        days_between_array(starts, ends) / basis1,
+        days_between_array(starts, (ys1 + 1).astype("datetime64[D]")) / basis1
+        + (ys2 - ys1).astype(numpy.int64) - 1
+        + days_between_array(ys2.astype("datetime64[D]"), ends) / basis2
+    )
+    return sign * res
+
+def act_act_icma_array(
+    starts,
+    ends,
+    frequency = None,
+    ref_starts = None,
+    ref_ends = None,
+    **kwargs,
+):
+    assert frequency is not None, "ACT_ACT_ICMA requires frequency"
+    ref_starts = starts if ref_starts is None else ref_starts
+    ref_ends = ends if ref_ends is None else ref_ends
+    return days_between_array(starts, ends) / (
+        frequency * days_between_array(ref_starts, ref_ends)
+    )
+
+def thirty_360_bond_array(starts, ends, **kwargs):
+    y1, m1, d1 = unpack_array(starts)
+    y2, m2, d2 = unpack_array(ends)
+    d1 = numpy.minimum(d1, 30)
+    d2 = numpy.where((d2 == 31) & (d1 == 30), 30, d2)
+    return thirty_360_array(y1, m1, d1, y2, m2, d2)
+
+def thirty_e_360_array(starts, ends, **kwargs):
+    y1, m1, d1 = unpack_array(starts)
+    y2, m2, d2 = unpack_array(ends)
+    return thirty_360_array(
+        y1, m1, numpy.minimum(d1, 30), y2, m2, numpy.minimum(d2, 30)
+    )
+
+def thirty_e_360_isda_array(starts, ends, maturity = None, **kwargs):
+    y1, m1, d1 = unpack_array(starts)
+    y2, m2, d2 = unpack_array(ends)
+    d1 = numpy.where(is_month_end_array(starts), 30, d1)
+    maturity_feb = (
+        numpy.zeros(ends.shape, dtype=bool) if maturity is None
+        else (ends == numpy.asarray(maturity, dtype="datetime64[D]")) & (m2 == 2)
+    )
+    d2 = numpy.where(
+        is_month_end_array(ends) & ~maturity_feb, 30, d2
+    )
+    return thirty_360_array(y1, m1, d1, y2, m2, d2)
+
+def bus_252_array(starts, ends, calendar = None, **kwargs):
+    assert calendar is not None, "BUS_252 requires calendar"
+    return indices.count_array(calendar, starts, ends) / 252
+
+# ---------------------------------------------------------------
+
+YEAR_FRACTIONS_ARRAY: dict[conventions.DayCount, typing.Callable] = {
+    conventions.DayCount.ACT_360: act_360_array,
+    conventions.DayCount.ACT_365F: act_365f_array,
+    conventions.DayCount.ACT_ACT_ISDA: act_act_isda_array,
+    conventions.DayCount.ACT_ACT_ICMA: act_act_icma_array,
+    conventions.DayCount.THIRTY_360: thirty_360_bond_array,
+    conventions.DayCount.THIRTY_E_360: thirty_e_360_array,
+    conventions.DayCount.THIRTY_E_360_ISDA: thirty_e_360_isda_array,
+    conventions.DayCount.BUS_252: bus_252_array,
+}
+
+def year_fraction_array(
+    starts: numpy.ndarray,
+    ends: numpy.ndarray,
+    convention: conventions.DayCount,
+    **kwargs,
+) -> numpy.ndarray:
+    """
+    as year_fraction, over (broadcastable) datetime64[D] arrays
+    (with ref_starts / ref_ends for ACT_ACT_ICMA)
+
+    >>> starts = numpy.array(["2019-12-31", "2020-02-29"], dtype="datetime64[D]")
+    >>> ends = numpy.array(["2021-03-31", "2020-08-31"], dtype="datetime64[D]")
+    >>> year_fraction_array(starts, ends, conventions.DayCount.ACT_ACT_ISDA)
+    array([1.24657534, 0.50273224])
+    >>> year_fraction_array(starts, ends, conventions.DayCount.THIRTY_E_360_ISDA)
+    array([1.25, 0.5 ])
+    """
+    starts, ends = numpy.broadcast_arrays(
+        numpy.asarray(starts, dtype="datetime64[D]"),
+        numpy.asarray(ends, dtype="datetime64[D]"),
+    )
+    return YEAR_FRACTIONS_ARRAY[convention](starts, ends, **kwargs)
+
+# ---------------------------------------------------------------
@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import typing
+
+import datetime
+
+import numpy
+
+import xtuples as xt
+
+from .dates import *
+from .units import *
+
+from . import stats
+
+# ---------------------------------------------------------------
+
+# NOTE: an index is a precomputed view of a calendar over a
+# contiguous range of day ordinals (datetime.date.toordinal)
+
+# counts[i] is the number of valid days in [start, start + i)
+# so counts has one more element than the range has days
+
+# valid is the (sorted) ordinals of the valid days themselves
+# ie. the inverse of counts
+
+# such that business day offsets and counts between dates
+# reduce to a couple of array lookups
+
+# ---------------------------------------------------------------
+
+EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+def to_ordinals(ds: numpy.ndarray) -> numpy.ndarray:
+    """
+    >>> to_ordinals(numpy.array(["2020-01-01"], dtype="datetime64[D]"))
+    array([737425])
+    """
+    return (
+        numpy.asarray(ds, dtype="datetime64[D]").astype(numpy.int64)
+        + EPOCH
+    )
+
+def from_ordinals(os: numpy.ndarray) -> numpy.ndarray:
+    """
+    >>> from_ordinals(numpy.array([737425]))
+    array(['2020-01-01'], dtype='datetime64[D]')
+    """
+    return (
+        numpy.asarray(os, dtype=numpy.int64) - EPOCH
+    ).astype("datetime64[D]")
+
+def fill_nat(ds: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    NaT can't be indexed, so is (temporarily) replaced with
+    the first non NaT value (to avoid widening the index).
+
+    >>> fill_nat(numpy.array(["NaT", "2020-01-01"], dtype="datetime64[D]"))
+    (array(['2020-01-01', '2020-01-01'], dtype='datetime64[D]'), array([ True, False]))
+    """
+    nat = numpy.isnat(ds)
+    if not nat.any() or nat.all():
+        return ds, nat
+    return numpy.where(nat, ds[~nat][0], ds), nat
+
+# ---------------------------------------------------------------
+
+@xt.nTuple.decorate()
+class Index(typing.NamedTuple):
+
+    start: int
+    mask: numpy.ndarray
+    counts: numpy.ndarray
+    valid: numpy.ndarray
+
+    @classmethod
+    def from_mask(cls, start: int, mask: numpy.ndarray) -> Index:
+        """
+        >>> index = Index.from_mask(0, numpy.array([1, 0, 0, 1, 1], dtype=bool))
+        >>> index.counts
+        array([0, 1, 1, 1, 2, 3], dtype=int32)
+        >>> index.valid
+        array([0, 3, 4], dtype=int32)
+        """
+        mask = numpy.asarray(mask, dtype=bool)
+        counts = numpy.zeros(len(mask) + 1, dtype=numpy.int32)
+        numpy.cumsum(mask, dtype=numpy.int32, out=counts[1:])
+        valid = (
+            numpy.flatnonzero(mask) + start
+        ).astype(numpy.int32)
+        return cls(start, mask, counts, valid)
+
+    @property
+    def end(self) -> int:
+        # exclusive
+        return self.start + len(self.mask)
+
+    def covers(self, start: int, end: int) -> bool:
+        return start >= self.start and end <= self.end
+
+    def n_before(self, o):
+        """
+        number of valid days strictly before o
+        """
+        return self.counts[o - self.start]
+
+    def n_through(self, o):
+        """
+        number of valid days up to and including o
+        """
+        return self.counts[o - self.start + 1]
+
+    def offset_indices(self, o, n):
+        """
+        position in valid of the n-th valid day after
+        (n > 0) or before (n < 0) o, or o itself for n == 0
+        (if o is valid, else the next valid day).
+        """
+        return numpy.where(
+            n > 0,
+            self.n_through(o) + n - 1,
+            self.n_before(o) + n,
+        )
+
+    def add(self, o, n):
+        """
+        >>> index = Index.from_mask(0, numpy.array([1, 0, 0, 1, 1, 0, 1], dtype=bool))
+        >>> int(index.add(0, 2)), int(index.add(1, 1)), int(index.add(6, -3))
+        (4, 3, 0)
+        >>> index.add(numpy.array([0, 1, 2]), numpy.array([1, 0, -1]))
+        array([3, 1, 0])
+        """
+        n = numpy.asarray(n)
+        i = self.offset_indices(o, n)
+        res = self.valid[numpy.clip(i, 0, len(self.valid) - 1)]
+        return numpy.where(n == 0, o, res)
+
+    def in_range(self, o, n) -> bool:
+        o = numpy.asarray(o)
+        n = numpy.asarray(n)
+        if (o < self.start).any() or (o >= self.end).any():
+            return False
+        i = self.offset_indices(o, n)
+        return bool((
+            (n == 0) | ((i >= 0) & (i < len(self.valid)))
+        ).all())
+
+    def count(self, start, end):
+        """
+        number of valid days in [start, end), as int64
+
+        if end < start, minus the number in (end, start]
+        as per numpy.busday_count (so the index must cover start)
+
+        >>> index = Index.from_mask(0, numpy.array([1, 0, 0, 1, 1, 0, 1], dtype=bool))
+        >>> int(index.count(0, 4)), int(index.count(1, 7)), int(index.count(6, 0))
+        (2, 3, -3)
+        >>> index.count(numpy.array([4, 4]), numpy.array([6, 2]))
+        array([ 1, -2])
+        """
+        start = numpy.asarray(start)
+        end = numpy.asarray(end)
+        back = end < start
+        res = (
+            self.n_before(numpy.where(back, start + 1, end))
+            - self.n_before(numpy.where(back, end + 1, start))
+        )
+        return numpy.where(back, -res, res).astype(numpy.int64)
+
+# ---------------------------------------------------------------
+
+def mask(calendar, start: int, end: int) -> numpy.ndarray:
+    """
+    validity mask of calendar over [start, end)
+
+    deferring to calendar.mask if defined
+    else stepping calendar.valid() day by day
+    """
+    if start >= end:
+        return numpy.zeros(0, dtype=bool)
+    f_mask = getattr(calendar, "mask", None)
+    if f_mask is not None:
+        return f_mask(start, end)
+    return mask_stepped(calendar, start, end)
+
+def mask_stepped(calendar, start: int, end: int) -> numpy.ndarray:
+    """
+    validity mask of calendar over [start, end)
+    from calendar.valid(), day by day
+    """
+    if start >= end:
+        return numpy.zeros(0, dtype=bool)
+    f = calendar.valid()
+    return numpy.fromiter(
+        (
+            f(datetime.date.fromordinal(o))
+            for o in range(start, end)
+        ),
+        dtype=bool,
+        count=end - start,
+    )
+
+def build(calendar, start: int, end: int) -> Index:
+    return Index.from_mask(start, mask(calendar, start, end))
+
+def extend(calendar, index: Index, start: int, end: int) -> Index:
+    start = min(start, index.start)
+    end = max(end, index.end)
+    return Index.from_mask(start, numpy.concatenate([
+        mask(calendar, start, index.start),
+        index.mask,
+        mask(calendar, index.end, end),
+    ]))
+
+# ---------------------------------------------------------------
+
+def year_aligned(start: int, end: int) -> tuple[int, int]:
+    """
+    >>> start, end = year_aligned(year(2020, 3, 1).toordinal(), year(2021, 2, 1).toordinal())
+    >>> datetime.date.fromordinal(start), datetime.date.fromordinal(end)
+    (datetime.date(2020, 1, 1), datetime.date(2022, 1, 1))
+    """
+    return (
+        year(datetime.date.fromordinal(start).year).toordinal(),
+        year(datetime.date.fromordinal(end - 1).year + 1).toordinal(),
+    )
+
+# ---------------------------------------------------------------
+
+global INDICES
+
+INDICES: dict[typing.Hashable, Index] = {}
+
+def cache_key(calendar) -> typing.Hashable:
+    """
+    >>> from .calendars import Weekday, union_calendars
+    >>> cache_key(Weekday(True)) == cache_key(Weekday(1))
+    False
+    >>> cache_key(union_calendars(Weekday(True), Weekday(2))) == cache_key(union_calendars(Weekday(1), Weekday(2)))
+    False
+    >>> k = cache_key(Weekday([0, 2]))
+    >>> hash(k) == hash(cache_key(Weekday([0, 2]))), k == cache_key(Weekday((0, 2)))
+    (True, False)
+    """
+    # NOTE: include the (nested) field types, as otherwise
+    # Weekday(True) == Weekday(1) (as True == 1)
+
+    # iterable fields (eg. Weekday([0, 2])) are normalised
+    # to tuples, so the key is hashable
+    if isinstance(calendar, (tuple, list)):
+        return (
+            type(calendar),
+            tuple(cache_key(v) for v in calendar),
+        )
+    if isinstance(calendar, (set, frozenset)):
+        return (
+            type(calendar),
+            frozenset(cache_key(v) for v in calendar),
+        )
+    return (type(calendar), calendar)
+
+def contains(key, sub) -> bool:
+    """
+    whether the calendar key sub is (or is nested within) key
+
+    >>> from .calendars import Weekday, union_calendars
+    >>> k = cache_key(union_calendars(Weekday(1), Weekday(2)))
+    >>> contains(k, cache_key(Weekday(2)))
+    True
+    >>> contains(k, cache_key(Weekday(3)))
+    False
+    """
+    if key == sub:
+        return True
+    return isinstance(key, tuple) and any(
+        contains(v, sub) for v in key
+    )
+
+def index(calendar, start: int, end: int) -> Index:
+    """
+    index of calendar covering at least [start, end)
+    cached (and extended in whole years) per calendar
+    """
+    k = cache_key(calendar)
+    try:
+        res = INDICES.get(k)
+    except TypeError:
+        # unhashable calendar, so can't be cached
+        return build(calendar, *year_aligned(start, end))
+    if res is not None and res.covers(start, end):
+        if stats.ENABLED:
+            stats.count("index.hits")
+        return res
+    start, end = year_aligned(start, end)
+    if res is None:
+        with stats.timed("index.build"):
+            res = build(calendar, start, end)
+    else:
+        with stats.timed("index.extend"):
+            res = extend(calendar, res, start, end)
+    INDICES[k] = res
+    return res
+
+def clear(calendar = None, nested: bool = False):
+    """
+    nested: also clear the indices of any composite calendar
+    that includes the given calendar (see contains)
+    """
+    if calendar is None:
+        INDICES.clear()
+    elif not nested:
+        INDICES.pop(cache_key(calendar), None)
+    else:
+        sub = cache_key(calendar)
+        for k in [k for k in list(INDICES.keys()) if contains(k, sub)]:
+            INDICES.pop(k, None)
+
+# ---------------------------------------------------------------
+
+# NOTE: calendars defined purely by a weekmask (eg. Weekday)
+# don't need an index: offsets and counts are closed form
+# in the ordinal and weekday (see numpy.busday_offset / count)
+
+def weekmask(calendar) -> typing.Optional[tuple[bool, ...]]:
+    """
+    >>> from .calendars import Weekday
+    >>> weekmask(Weekday([5, 4]))
+    (False, False, False, False, True, True, False)
+    """
+    f = getattr(calendar, "weekmask", None)
+    return None if f is None else f()
+
+def weekmask_add(weekmask, o, n):
+    """
+    >>> weekmask_add((True,) * 5 + (False,) * 2, numpy.array([737428, 737429]), numpy.array([1, -1]))
+    array([737430, 737427])
+    """
+    n = numpy.asarray(n)
+    ds = from_ordinals(o)
+    # roll invalid days towards the origin of the offset
+    # so that eg. n = 1 from a saturday is the monday
+    res = numpy.where(
+        n > 0,
+        numpy.busday_offset(ds, n, roll="backward", weekmask=weekmask),
+        numpy.busday_offset(ds, n, roll="forward", weekmask=weekmask),
+    )
+    return numpy.where(n == 0, o, to_ordinals(res))
+
+def weekmask_count(weekmask, o0, o1):
+    return numpy.busday_count(
+        from_ordinals(o0), from_ordinals(o1), weekmask=weekmask
+    )
+
+# ---------------------------------------------------------------
+
+def window(o, n) -> tuple[int, int]:
+    margin = 2 * int(numpy.abs(n).max()) + 7
+    return int(o.min()) - margin, int(o.max()) + margin + 1
+
+def add_ordinals(calendar, o, n, max_years: int = 200):
+    o = numpy.asarray(o)
+    n = numpy.asarray(n)
+    if o.size == 0:
+        return o
+    week = weekmask(calendar)
+    if week is not None:
+        return weekmask_add(week, o, n)
+    start, end = window(o, n)
+    while True:
+        res = index(calendar, start, end)
+        if res.in_range(o, n):
+            return res.add(o, n)
+        width = end - start
+        start, end = start - width, end + width
+        assert width < max_years * 366, dict(
+            calendar=calendar, n=n,
+        )
+
+def add(calendar, d: datetime.date, n: int) -> datetime.date:
+    """
+    n valid days after (n > 0) or before (n < 0) d
+
+    >>> from .calendars import Weekday
+    >>> add(Weekday(True), year(2020, 1, 3), 1)
+    datetime.date(2020, 1, 6)
+    >>> add(Weekday(True), year(2020, 1, 4), -1)
+    datetime.date(2020, 1, 3)
+    >>> add(Weekday(True), year(2020, 1, 1), 252)
+    datetime.date(2020, 12, 18)
+    """
+    return datetime.date.fromordinal(int(add_ordinals(
+        calendar, d.toordinal(), n
+    )))
+
+def add_array(calendar, ds: numpy.ndarray, n) -> numpy.ndarray:
+    """
+    >>> from .calendars import Weekday
+    >>> ds = numpy.array(["2020-01-03", "2020-01-04"], dtype="datetime64[D]")
+    >>> add_array(Weekday(True), ds, numpy.array([1, -1]))
+    array(['2020-01-06', '2020-01-03'], dtype='datetime64[D]')
+    """
+    return from_ordinals(add_ordinals(
+        calendar, to_ordinals(ds), n
+    ))
+
+def count(calendar, start: datetime.date, end: datetime.date) -> int:
+    """
+    number of valid days in [start, end)
+    (or minus those in (end, start], if end < start, see Index.count)
+
+    >>> from .calendars import Weekday
+    >>> count(Weekday(True), year(2020, 1, 1), year(2020, 1, 8))
+    5
+    """
+    o0 = start.toordinal()
+    o1 = end.toordinal()
+    week = weekmask(calendar)
+    if week is not None:
+        return int(weekmask_count(week, o0, o1))
+    res = index(calendar, min(o0, o1), max(o0, o1) + 1)
+    return int(res.count(o0, o1))
+
+# ---------------------------------------------------------------
+
+def count_array(
+    calendar,
+    starts: numpy.ndarray,
+    ends: numpy.ndarray,
+) -> numpy.ndarray:
+    """
+    number of valid days in [start, end), per pair
+    (or minus those in (end, start], if end < start, see Index.count)
+
+    >>> from .calendars import Weekday
+    >>> starts = numpy.array(["2020-01-01", "2020-01-08"], dtype="datetime64[D]")
+    >>> ends = numpy.array(["2020-01-08", "2020-01-01"], dtype="datetime64[D]")
+    >>> count_array(Weekday(True), starts, ends)
+    array([ 5, -5])
+    """
+    o0 = to_ordinals(starts)
+    o1 = to_ordinals(ends)
+    if o0.size == 0:
+        return numpy.zeros(o0.shape, dtype=numpy.int64)
+    week = weekmask(calendar)
+    if week is not None:
+        return weekmask_count(week, o0, o1).astype(numpy.int64)
+    res = index(
+        calendar,
+        int(min(o0.min(), o1.min())),
+        int(max(o0.max(), o1.max())) + 1,
+    )
+    return res.count(o0, o1)
+
+# ---------------------------------------------------------------
@@ -1,6 +1,5 @@
 
 from __future__ import annotations
-from tkinter.font import nametofont
 
 import typing
 
@@ -14,6 +13,9 @@ import xtuples as xt
 from .dates import *
 from .units import *
 
+from . import stats
+from . import indices
+
 # ---------------------------------------------------------------
 
 T = typing.TypeVar("T", bound = DDT)
@@ -31,6 +33,14 @@ class Iterator(typing.NamedTuple):
 
     f: typing.Optional[typing.Callable] = None
 
+    # the calendar accept was taken from (if any, and unmodified)
+    # so callers can use precomputed indices instead of stepping
+    calendar: typing.Optional[typing.Any] = None
+
+    # first accepted date on or after (1) / before (-1) a given date
+    # if the calendar can jump there directly (see Weekday.jump)
+    jump: typing.Optional[typing.Callable[[DDT, int], DDT]] = None
+
     @staticmethod
     def unpack_accept(bv: tuple[bool, DDT]) -> bool:
         return bv[0]
@@ -50,7 +60,7 @@ class Iterator(typing.NamedTuple):
         """
         return 1 if self.start + self.step > self.start else -1
 
-    def update(self, **kwargs):
+    def update(self, skip: bool = False, **kwargs):
         # """
         # >>> itr.send(lambda d: d.year != 2020)
         # (False, datetime.date(2020, 1, 2))
@@ -61,12 +71,16 @@ class Iterator(typing.NamedTuple):
         # >>> list(itr)
         # []
         # """
+        if "accept" in kwargs and "calendar" not in kwargs:
+            kwargs["calendar"] = None
+        if "accept" in kwargs and "jump" not in kwargs:
+            kwargs["jump"] = None
         self = self._replace(**kwargs)
-        return self.gen()
+        return self.gen(skip=skip)
 
     def gen(
-        self: Iterator
-        #
+        self: Iterator,
+        skip: bool = False,
     ) -> tuple[Iterator, typing.Iterator[tuple[bool, DDT]]]:
         """
         >>> itr, gen = Iterator(year(2020), days(1)).gen()
@@ -85,6 +99,24 @@ class Iterator(typing.NamedTuple):
         (True, datetime.date(2019, 12, 27))
         >>> gen.send(-5)
         (False, datetime.date(2020, 1, 1))
+
+        by default, every step is yielded (accepted or not).
+
+        with skip, if the iterator has a jump function (and no done
+        predicate) and steps a day at a time, rejected dates are
+        skipped over rather than yielded (other than the start,
+        or a given end), for callers only after the accepted dates:
+
+        >>> from .calendars import Weekday
+        >>> _, gen = Weekday(True).iterator(year(2020, 1, 3), days(1)).gen()
+        >>> xt.iTuple.n_from(gen, 3).mapstar(lambda y, v: v.day)
+        iTuple(3, 4, 5)
+        >>> _, gen = Weekday(True).iterator(year(2020, 1, 3), days(1)).gen(skip=True)
+        >>> xt.iTuple.n_from(gen, 3).mapstar(lambda y, v: v.day)
+        iTuple(3, 6, 7)
+        >>> _, gen = Weekday(True).iterator(year(2020, 1, 3), days(1), end=year(2020, 1, 5)).gen(skip=True)
+        >>> xt.iTuple(gen)
+        iTuple((True, datetime.date(2020, 1, 3)), (False, datetime.date(2020, 1, 5)))
         """
         def f():
             current = self.start
@@ -107,6 +139,18 @@ class Iterator(typing.NamedTuple):
             end = self.end
             step = self.step
 
+            f_jump = self.jump if (
+                skip and self.done is None and abs(step) == days(1)
+            ) else None
+            direction = 1 if step > days(0) else -1
+
+            if stats.ENABLED:
+                stats.count("iterator.gens")
+                f_accept = stats.counted("iterator.accept", f_accept)
+                f_done = stats.counted("iterator.steps", f_done)
+                if f_jump is not None:
+                    f_jump = stats.counted("iterator.jumps", f_jump)
+
             while not done:
                 done = f_done(current)
                 if done:
@@ -118,6 +162,14 @@ class Iterator(typing.NamedTuple):
                     done = end == current
                 if given is None:
                     current += step
+                    # NOTE: not straight after a send, so that
+                    # sends still move by whole steps
+                    if f_jump is not None and not mask and not done:
+                        current = f_jump(current, direction)
+                        if end is not None and (
+                            (current - end) * direction > days(0)
+                        ):
+                            current = end
                     mask = False
                     continue
                 if given == 0:
@@ -191,6 +243,20 @@ class Iterator(typing.NamedTuple):
         current = self.current(gen)
         return self.update(end=current, **kwargs)
 
+    def indexable(self) -> bool:
+        """
+        >>> from .calendars import Weekday
+        >>> Weekday(True).iterator(year(2020), days(1)).indexable()
+        True
+        >>> Weekday(True).iterator(year(2020), days(1), accept=lambda d: True).indexable()
+        False
+        """
+        return (
+            self.calendar is not None
+            and self.done is None
+            and self.end is None
+        )
+
     def update_accept(self, and_f = None, or_f = None, f = None):
         return
 
@@ -207,7 +273,8 @@ class Iterator(typing.NamedTuple):
         return res if pipe is None else pipe(res)
 
     def n_steps_where(self: Iterator) -> int:
-        return self.steps_where(pipe=lambda it: it.len() - 1)
+        _, gen = self.gen()
+        return count_from(gen) - 1
 
     def steps_until(
         self: Iterator,
@@ -224,7 +291,8 @@ class Iterator(typing.NamedTuple):
         return res if pipe is None else pipe(res)
 
     def n_steps_until(self: Iterator) -> int:
-        return self.steps_until(pipe=lambda it: it.len())
+        _, gen = self.gen()
+        return count_while(gen, False)
         
     def steps_while(
         self: Iterator,
@@ -241,7 +309,37 @@ class Iterator(typing.NamedTuple):
         return res if pipe is None else pipe(res)
 
     def n_steps_while(self: Iterator) -> int:
-        return self.steps_while(pipe=lambda it: it.len() - 1)
+        _, gen = self.gen()
+        return count_while(gen, True) - 1
+
+    def n_accepted(self: Iterator) -> int:
+        """
+        number of accepted steps from start through end (inclusive)
+
+        counted from the calendar index if stepping a calendar
+        a day at a time, else by (lazily) stepping the generator
+
+        >>> from .calendars import Weekday
+        >>> itr = Weekday(True).iterator(year(2020), days(1), end=year(2020, 1, 31))
+        >>> itr.n_accepted()
+        23
+        >>> itr._replace(calendar=None).n_accepted()
+        23
+        >>> Weekday(True).iterator(year(2020, 1, 31), days(-1), end=year(2020)).n_accepted()
+        23
+        """
+        assert self.end is not None or self.done is not None, self
+        if (
+            self.calendar is not None
+            and self.done is None
+            and self.end is not None
+            and is_date_strict(self.start)
+            and abs(self.step) == days(1)
+        ):
+            l, r = sorted((self.start, self.end))
+            return indices.count(self.calendar, l, r + days(1))
+        _, gen = self.gen(skip=True)
+        return sum(accept for accept, _ in gen)
 
 # ---------------------------------------------------------------
 
@@ -254,6 +352,34 @@ def try_next(gen):
 
 def zip_next(gens):
     return gens.map(try_next).zip().map(xt.iTuple)
+
+def count_from(gen, n: typing.Optional[int] = None) -> int:
+    """
+    number of steps yielded by gen (up to n)
+    without materialising them
+
+    >>> count_from(Iterator(year(2020), days(1), end=year(2020, 1, 10))())
+    10
+    """
+    return sum(1 for _ in itertools.islice(gen, n))
+
+def count_while(gen, value: bool) -> int:
+    """
+    number of steps before the first with accept != value
+    (as per xt.iTuple.from_while(...).len())
+
+    >>> from .calendars import Weekday
+    >>> count_while(Weekday(True).iterator(year(2020, 1, 4), days(1))(), False)
+    2
+    >>> count_while(Weekday(True).iterator(year(2020, 1, 1), days(1))(), True)
+    3
+    """
+    res = 0
+    for accept, _ in gen:
+        if accept != value:
+            break
+        res += 1
+    return res
     
 # ---------------------------------------------------------------
 
@@ -274,7 +400,7 @@ def joint(
     _, gens = itrs.map(lambda itr: itr.gen()).zip().map(xt.iTuple)
     
     v_done, v_accept, vs = zip_next(gens)
-    order = i_range.sortby(lambda i: (not v_done[i], vs[i]))
+    order = i_range.sort(lambda i: (not v_done[i], vs[i]))
 
     acc_i: xt.iTuple[int] = xt.iTuple()
     acc_done: xt.iTuple[int] = xt.iTuple()
@@ -295,7 +421,7 @@ def joint(
             ), acc_vs[-1]
             
             v_done, v_accept, vs = zip_next(gens)
-            order = i_range.sortby(lambda i: (not v_done[i], vs[i]))
+            order = i_range.sort(lambda i: (not v_done[i], vs[i]))
             
             acc_accept = acc_accept.clear()
             acc_vs = acc_vs.clear()
@@ -367,7 +493,7 @@ def joint(
             v_accept = inds_order.map(lambda i: order_v_accept[i])
             vs = inds_order.map(lambda i: order_vs[i])
 
-            order = i_range.sortby(lambda i: (not v_done[i], vs[i]))
+            order = i_range.sort(lambda i: (not v_done[i], vs[i]))
             
             acc_accept = acc_accept.clear()
             acc_vs = acc_vs.clear()
@@ -417,6 +543,9 @@ def joint(
 
 def union(itrs):
     """
+    generator form, for iterators with arbitrary accept predicates
+    (see calendars.union_calendars for the faster calendar level form)
+
     >>> from .calendars import *
     >>> cal0 = Weekday(0)
     >>> cal1 = Weekday(1)
@@ -446,6 +575,9 @@ def union(itrs):
 
 def intersection(itrs):
     """
+    generator form, for iterators with arbitrary accept predicates
+    (see calendars.intersection_calendars for the faster calendar level form)
+
     >>> from .calendars import *
     >>> cal0 = Weekday(xt.iTuple([0, 1]))
     >>> cal1 = Weekday(xt.iTuple([1, 2]))
@@ -481,11 +613,9 @@ def intersection(itrs):
 
 # ---------------------------------------------------------------
 
-# various units between
-# with either a kwarg for if only whole units 
-
-# or to acc as fraction
+# NOTE: for business days between two dates, see
+# arithmetic.business_days_between (counted from the calendar index)
 
-# or separate methods?
+# and for (fractional) years between, see daycounts.year_fraction
 
 # ---------------------------------------------------------------
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import typing
+
+import datetime
+import threading
+import collections
+
+from .dates import *
+from .units import *
+
+from . import indices
+
+# ---------------------------------------------------------------
+
+# NOTE: opt in memoization of xtenors.add (and so Tenor.add)
+# for repeatedly resolving the same (date, tenor, calendar,
+# adjustment) combinations, eg. when repricing intraday
+
+# keys are built from the date, the tenor (as its packed
+# months / days, see xtenors.Span), the overflow / roll / modified
+# conventions, and the calendar of each iterator (see
+# indices.cache_key), so equal calendars share entries
+
+# only indexable iterators (see Iterator.indexable) are keyed,
+# as otherwise the result depends on more than the calendar
+# (eg. an accept predicate), so such adds bypass the cache
+
+# the cache is a size bounded LRU, shared across threads
+
+# entries for a calendar are dropped with clear(calendar),
+# as called by Stateful.invalidate (when the underlying
+# holiday data changes), and all are dropped by calendars.clear
+
+# ---------------------------------------------------------------
+
+global ENABLED
+global MAXSIZE
+
+ENABLED: bool = False
+MAXSIZE: int = 2 ** 16
+
+LOCK = threading.Lock()
+
+CACHE: collections.OrderedDict[tuple, typing.Any] = collections.OrderedDict()
+COUNTS: dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+
+def enable(
+    enabled: bool = True,
+    maxsize: typing.Optional[int] = None,
+) -> bool:
+    """
+    returns the previous state
+    """
+    global ENABLED
+    global MAXSIZE
+    res = ENABLED
+    ENABLED = enabled
+    if maxsize is not None:
+        assert maxsize > 0, maxsize
+        with LOCK:
+            MAXSIZE = maxsize
+            evict()
+    return res
+
+def disable() -> bool:
+    return enable(False)
+
+def info() -> dict[str, int]:
+    with LOCK:
+        return {**COUNTS, "size": len(CACHE), "maxsize": MAXSIZE}
+
+def reset():
+    with LOCK:
+        CACHE.clear()
+        for k in COUNTS:
+            COUNTS[k] = 0
+
+# ---------------------------------------------------------------
+
+def clear(calendar = None):
+    """
+    drop the entries involving calendar (directly, or as part of
+    a composite calendar), or all entries if None
+    """
+    if calendar is None:
+        with LOCK:
+            CACHE.clear()
+        return
+    sub = indices.cache_key(calendar)
+    with LOCK:
+        for k in [
+            k for k in CACHE.keys()
+            if indices.contains(k[-2], sub) or indices.contains(k[-1], sub)
+        ]:
+            del CACHE[k]
+
+def evict():
+    # NOTE: expects the lock to be held
+    while len(CACHE) > MAXSIZE:
+        CACHE.popitem(last=False)
+        COUNTS["evictions"] += 1
+
+# ---------------------------------------------------------------
+
+class Uncacheable(Exception):
+    pass
+
+def calendar_key(iterator) -> typing.Hashable:
+    if iterator is None:
+        return None
+    if not iterator.indexable():
+        raise Uncacheable()
+    k = indices.cache_key(iterator.calendar)
+    try:
+        hash(k)
+    except TypeError as e:
+        raise Uncacheable() from e
+    return k
+
+def key(
+    ddt: DDT,
+    tenor,
+    iterator,
+    adjust: bool,
+    adjustment,
+) -> typing.Optional[tuple]:
+    """
+    None if the add can't be cached (see calendar_key)
+
+    >>> from .xtenors import Tenor
+    >>> from .calendars import Weekday
+    >>> itr = Weekday(True).iterator(year(2020), days(1))
+    >>> key(year(2020), Tenor("1Y"), itr, False, None) == key(year(2020), Tenor("12M"), Weekday(True).iterator(year(2021), days(1)), False, None)
+    True
+    >>> key(year(2020), Tenor("1M"), itr._replace(end=year(2021)), False, None) is None
+    True
+    """
+    overflow = (
+        adjustment.overflow
+        if adjustment is not None
+        else None if tenor.adjustment is None
+        else tenor.adjustment.overflow
+    )
+    try:
+        return (
+            ddt,
+            type(ddt),
+            tenor.compact().code,
+            overflow,
+            None if not adjust else (
+                adjustment.roll, adjustment.modified
+            ),
+            calendar_key(iterator),
+            None if not adjust else calendar_key(adjustment.iterator),
+        )
+    except Uncacheable:
+        return None
+
+def cached(
+    f: typing.Callable,
+    ddt: DDT,
+    tenor,
+    iterator,
+    adjust: bool,
+    adjustment,
+):
+    """
+    f(ddt, tenor, iterator, adjust, adjustment), memoized
+    """
+    k = key(ddt, tenor, iterator, adjust, adjustment)
+    if k is None:
+        return f(ddt, tenor, iterator, adjust, adjustment)
+    with LOCK:
+        try:
+            res = CACHE[k]
+        except KeyError:
+            COUNTS["misses"] += 1
+        else:
+            CACHE.move_to_end(k)
+            COUNTS["hits"] += 1
+            return res
+    res = f(ddt, tenor, iterator, adjust, adjustment)
+    with LOCK:
+        CACHE[k] = res
+        CACHE.move_to_end(k)
+        evict()
+    return res
+
+# ---------------------------------------------------------------
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import typing
+
+import datetime
+
+import numpy
+
+import xtuples as xt
+
+from .dates import *
+from .units import *
+
+from . import conventions
+from . import arithmetic
+from . import adjustments
+
+from .xtenors import Tenor, TENORS_MARKET, tenor_units
+
+# ---------------------------------------------------------------
+
+# NOTE: pillar dates of a curve, for many anchor (trade) dates
+# and a shared list of tenors, eg. ["ON", "TN", "1W", ..., "50Y"]
+
+# all tenors are added to the spot date (spot business days
+# after the anchor), other than the market tenors, which are
+# business day offsets (see MARKET) from either the anchor (ON)
+# or the spot date (TN, SPOT, SN), so follow spot, rather than
+# the T+2 assumed by TENORS_MARKET
+
+# ie. ON: anchor -> anchor + 1, TN: anchor + 1 -> spot,
+# SN: spot -> spot + 1, each given by its end date
+
+# tenors in days only are counted in business days
+# of the adjustment's calendar, anything with years / months / weeks
+# is a calendar period, then adjusted (per the adjustment)
+
+# all of the (anchor, tenor) pairs are evaluated in one call
+# of each of the array kernels, so share a single index
+# of the calendar (see indices.index)
+
+# ---------------------------------------------------------------
+
+@xt.nTuple.decorate()
+class Pillars(typing.NamedTuple):
+
+    # (n anchors, n tenors)
+    unadjusted: numpy.ndarray
+    adjusted: numpy.ndarray
+
+    def n(self) -> int:
+        return len(self.unadjusted)
+
+    def get(self, i: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+        return self.unadjusted[i], self.adjusted[i]
+
+# ---------------------------------------------------------------
+
+# (from spot, business days)
+
+MARKET: dict[str, tuple[bool, int]] = {
+    "ON": (False, 1),
+    "TN": (True, 0),
+    "SPOT": (True, 0),
+    "SN": (True, 1),
+}
+
+def is_market(tenor: typing.Union[str, Tenor]) -> bool:
+    """
+    >>> is_market("on"), is_market(Tenor("TN")), is_market("1D")
+    (True, True, False)
+    """
+    s = tenor if isinstance(tenor, str) else tenor.s
+    return s is not None and s.strip().upper() in TENORS_MARKET
+
+def market_offset(
+    tenor: typing.Union[str, Tenor]
+) -> typing.Optional[tuple[bool, int]]:
+    """
+    (from spot, business days) of a market tenor, else None
+
+    >>> market_offset("on"), market_offset(Tenor("SN")), market_offset("1D")
+    ((False, 1), (True, 1), None)
+    """
+    s = tenor if isinstance(tenor, str) else tenor.s
+    return None if s is None else MARKET.get(s.strip().upper())
+
+def pillars(
+    anchors: numpy.ndarray,
+    tenors: typing.Sequence[typing.Union[str, Tenor]],
+    adjustment: typing.Optional[adjustments.Adjustment] = None,
+    spot: int = 0,
+) -> Pillars:
+    """
+    anchors: datetime64[D] array (trade dates)
+    tenors: the pillars of the curve
+
+    spot: business days from anchor to spot
+    (requires an adjustment with an iterator, if non zero).
+
+    month overflow follows adjustment.overflow if given, else PREV.
+    the adjusted dates are rolled per the adjustment (if it has
+    an iterator), else are the same as unadjusted.
+
+    >>> from .calendars import Weekday
+    >>> adj = adjustments.Adjustment(
+    ...     Weekday(True).iterator(year(2020), days(1)),
+    ...     roll=conventions.Roll.FOLLOWING,
+    ...     modified=conventions.Modified.MODIFIED,
+    ... )
+    >>> anchors = numpy.array(["2020-01-29", "2020-01-30"], dtype="datetime64[D]")
+    >>> res = pillars(anchors, ["ON", "TN", "1W", "1M", "1Y"], adj, spot=2)
+    >>> res.get(0)[0].astype(str).tolist()
+    ['2020-01-30', '2020-01-31', '2020-02-07', '2020-02-29', '2021-01-31']
+    >>> res.get(0)[1].astype(str).tolist()
+    ['2020-01-30', '2020-01-31', '2020-02-07', '2020-02-28', '2021-01-29']
+    >>> res.get(1)[1].astype(str).tolist()
+    ['2020-01-31', '2020-02-03', '2020-02-10', '2020-03-03', '2021-02-03']
+    >>> res = pillars(anchors, ["ON", "TN", "SPOT", "SN"], adj, spot=1)
+    >>> res.get(1)[0].astype(str).tolist()
+    ['2020-01-31', '2020-01-31', '2020-01-31', '2020-02-03']
+    """
+    anchors = numpy.asarray(anchors, dtype="datetime64[D]")
+    assert anchors.ndim == 1, anchors.shape
+
+    n = len(anchors)
+    k = len(tenors)
+
+    units = tenor_units(list(tenors), k)
+    offsets = [market_offset(t) for t in tenors]
+    market = numpy.array([o is not None for o in offsets], dtype=bool)
+    from_anchor = numpy.array([
+        o is not None and not o[0] for o in offsets
+    ], dtype=bool)
+
+    iterator = None if adjustment is None else adjustment.iterator
+    overflow = (
+        adjustment.overflow
+        if adjustment is not None and adjustment.overflow is not None
+        else conventions.Overflow.PREV
+    )
+
+    assert spot == 0 or iterator is not None, spot
+
+    spots = anchors if spot == 0 else arithmetic.add_array(
+        anchors, days=spot, iterator=iterator
+    )
+
+    months = units[:, 0] * 12 + units[:, 1]
+    ds = numpy.where(
+        market,
+        [0 if o is None else o[1] for o in offsets],
+        units[:, 2] * 7 + units[:, 3],
+    )
+
+    business = (units[:, :3] == 0).all(axis=1) & (iterator is not None)
+
+    bases = numpy.where(
+        from_anchor[None, :], anchors[:, None], spots[:, None]
+    )
+    unadjusted = numpy.empty((n, k), dtype="datetime64[D]")
+
+    for cols, itr in [
+        (~business, None),
+        (business, iterator),
+    ]:
+        if not cols.any():
+            continue
+        shape = (n, int(cols.sum()))
+        unadjusted[:, cols] = arithmetic.add_array(
+            bases[:, cols].ravel(),
+            months=numpy.broadcast_to(months[cols], shape).ravel(),
+            days=numpy.broadcast_to(ds[cols], shape).ravel(),
+            iterator=itr,
+            overflow=overflow,
+        ).reshape(shape)
+
+    if adjustment is None or iterator is None:
+        adjusted = unadjusted.copy()
+    else:
+        adjusted = adjustments.adjust_array(
+            unadjusted.ravel(),
+            iterator,
+            roll=adjustment.roll,
+            modified=adjustment.modified,
+        ).reshape((n, k))
+
+    return Pillars(unadjusted, adjusted)
+
+def pillar(
+    anchor: datetime.date,
+    tenors: typing.Sequence[typing.Union[str, Tenor]],
+    adjustment: typing.Optional[adjustments.Adjustment] = None,
+    spot: int = 0,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    unadjusted and adjusted pillar dates from a single anchor
+    (see pillars).
+
+    >>> pillar(year(2020, 1, 31), ["1M", "3M", "1Y"])[0].astype(str).tolist()
+    ['2020-02-29', '2020-04-30', '2021-01-31']
+    """
+    res = pillars(
+        numpy.array([anchor], dtype="datetime64[D]"),
+        tenors,
+        adjustment=adjustment,
+        spot=spot,
+    )
+    return res.get(0)
+
+# ---------------------------------------------------------------
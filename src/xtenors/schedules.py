@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import typing
+
+import datetime
+
+import numpy
+
+import xtuples as xt
+
+from .dates import *
+from .units import *
+
+from . import conventions
+from . import arithmetic
+from . import adjustments
+
+from .xtenors import Tenor
+
+# ---------------------------------------------------------------
+
+# NOTE: schedules are generated from an anchor date
+# (start, or end if backward) by adding i * frequency
+# to the anchor for i = 0, 1, ... (rather than repeatedly adding
+# the frequency, which would drift on month end overflow)
+
+# any remainder between the last regular date and the other end
+# is a stub: short (as is) or long (merged with the
+# neighbouring regular period)
+
+# many schedules are generated at once into flat arrays
+# with offsets, such that schedule i is [offsets[i], offsets[i + 1])
+
+# ---------------------------------------------------------------
+
+@xt.nTuple.decorate()
+class Schedules(typing.NamedTuple):
+
+    unadjusted: numpy.ndarray
+    adjusted: numpy.ndarray
+    offsets: numpy.ndarray
+
+    def n(self) -> int:
+        return len(self.offsets) - 1
+
+    def get(self, i: int) -> tuple[numpy.ndarray, numpy.ndarray]:
+        l, r = self.offsets[i], self.offsets[i + 1]
+        return self.unadjusted[l:r], self.adjusted[l:r]
+
+# ---------------------------------------------------------------
+
+def month_end(ds: numpy.ndarray) -> numpy.ndarray:
+    """
+    >>> month_end(numpy.array(["2020-02-03", "2021-02-28"], dtype="datetime64[D]"))
+    array(['2020-02-29', '2021-02-28'], dtype='datetime64[D]')
+    """
+    return (
+        ds.astype("datetime64[M]") + 1
+    ).astype("datetime64[D]") - 1
+
+def frequency_units(frequency: Tenor) -> tuple[int, int]:
+    """
+    >>> frequency_units(Tenor("1Y6M"))
+    (18, 0)
+    >>> frequency_units(Tenor("2W1D"))
+    (0, 15)
+    """
+    frequency = frequency.init()
+    months = 12 * (frequency.Y or 0) + (frequency.M or 0)
+    days = 7 * (frequency.W or 0) + (frequency.D or 0)
+    assert months >= 0 and days >= 0 and months + days > 0, frequency
+    return months, days
+
+# ---------------------------------------------------------------
+
+def schedules(
+    starts: numpy.ndarray,
+    ends: numpy.ndarray,
+    frequency: Tenor,
+    adjustment: typing.Optional[adjustments.Adjustment] = None,
+    stub: conventions.Stub = conventions.Stub.SHORT,
+    backward: bool = False,
+    eom: bool = False,
+) -> Schedules:
+    """
+    starts / ends: datetime64[D] arrays, one per schedule
+
+    backward: roll from the end date (so any stub is at the front)
+    else from the start date (so any stub is at the back).
+
+    eom: if the anchor date is a month end, so are all regular dates
+    (for frequencies in whole months).
+
+    month overflow follows adjustment.overflow if given, else PREV.
+    the adjusted dates are rolled per the adjustment (if it has
+    an iterator), else are the same as unadjusted.
+
+    >>> starts = numpy.array(["2020-01-15", "2020-01-15"], dtype="datetime64[D]")
+    >>> ends = numpy.array(["2021-01-15", "2020-12-01"], dtype="datetime64[D]")
+    >>> res = schedules(starts, ends, Tenor("3M"))
+    >>> res.offsets
+    array([ 0,  5, 10])
+    >>> res.get(1)[0].astype(str).tolist()
+    ['2020-01-15', '2020-04-15', '2020-07-15', '2020-10-15', '2020-12-01']
+    """
+    starts = numpy.asarray(starts, dtype="datetime64[D]")
+    ends = numpy.asarray(ends, dtype="datetime64[D]")
+    assert starts.shape == ends.shape and starts.ndim == 1, dict(
+        starts=starts.shape,
+        ends=ends.shape,
+    )
+    assert (starts <= ends).all(), dict(
+        invalid=numpy.flatnonzero(starts > ends)
+    )
+
+    fm, fd = frequency_units(frequency)
+    sign = -1 if backward else 1
+
+    anchors = ends if backward else starts
+    targets = starts if backward else ends
+
+    overflow = (
+        adjustment.overflow
+        if adjustment is not None and adjustment.overflow is not None
+        else conventions.Overflow.PREV
+    )
+
+    # candidate regular dates, with enough per schedule
+    # to reach past the target
+
+    span = (ends - starts).astype(numpy.int64)
+    ns = span // (28 * fm + fd) + 2
+
+    n_schedules = len(anchors)
+    schedule = numpy.repeat(numpy.arange(n_schedules), ns)
+    i = numpy.arange(len(schedule)) - numpy.repeat(
+        numpy.cumsum(ns) - ns, ns
+    )
+
+    ds = arithmetic.add_array(
+        anchors[schedule],
+        months=sign * i * fm,
+        days=sign * i * fd,
+        overflow=overflow,
+    )
+
+    if eom and fm > 0:
+        anchor_eom = (month_end(anchors) == anchors)[schedule]
+        ds = numpy.where(anchor_eom, month_end(ds), ds)
+
+    ds_targets = targets[schedule]
+
+    inside = (ds > ds_targets) if backward else (ds < ds_targets)
+    exact = numpy.bincount(
+        schedule,
+        weights=(ds == ds_targets),
+        minlength=n_schedules,
+    ) > 0
+
+    # number of regular dates (including the anchor)
+    # strictly inside each schedule
+
+    ks = numpy.bincount(
+        schedule, weights=inside, minlength=n_schedules
+    ).astype(numpy.int64)
+
+    if stub is conventions.Stub.LONG:
+        drop = (~exact) & (ks > 1)
+        inside &= ~(drop[schedule] & (i == ks[schedule] - 1))
+    else:
+        assert stub is conventions.Stub.SHORT, stub
+
+    # flatten the regular dates and targets together
+    # sorted by schedule and then date
+
+    ds = numpy.concatenate([ds[inside], targets])
+    schedule = numpy.concatenate([
+        schedule[inside], numpy.arange(n_schedules)
+    ])
+    position = numpy.concatenate([
+        sign * i[inside],
+        numpy.full(n_schedules, sign * (ns.max() + 1)),
+    ])
+    order = numpy.lexsort((position, schedule))
+
+    unadjusted = ds[order]
+    offsets = numpy.concatenate([
+        [0], numpy.cumsum(numpy.bincount(
+            schedule, minlength=n_schedules
+        ))
+    ])
+
+    if adjustment is None or adjustment.iterator is None:
+        adjusted = unadjusted.copy()
+    else:
+        adjusted = adjustments.adjust_array(
+            unadjusted,
+            adjustment.iterator,
+            roll=adjustment.roll,
+            modified=adjustment.modified,
+        )
+
+    return Schedules(unadjusted, adjusted, offsets)
+
+def schedule(
+    start: datetime.date,
+    end: datetime.date,
+    frequency: Tenor,
+    adjustment: typing.Optional[adjustments.Adjustment] = None,
+    stub: conventions.Stub = conventions.Stub.SHORT,
+    backward: bool = False,
+    eom: bool = False,
+) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    unadjusted and adjusted dates of a single schedule
+    (see schedules).
+
+    >>> start, end = year(2020, 1, 15), year(2020, 12, 1)
+    >>> schedule(start, end, Tenor("3M"))[0].astype(str).tolist()
+    ['2020-01-15', '2020-04-15', '2020-07-15', '2020-10-15', '2020-12-01']
+    >>> schedule(start, end, Tenor("3M"), stub=conventions.Stub.LONG)[0].astype(str).tolist()
+    ['2020-01-15', '2020-04-15', '2020-07-15', '2020-12-01']
+    >>> schedule(start, end, Tenor("3M"), backward=True)[0].astype(str).tolist()
+    ['2020-01-15', '2020-03-01', '2020-06-01', '2020-09-01', '2020-12-01']
+    >>> schedule(start, end, Tenor("3M"), backward=True, stub=conventions.Stub.LONG)[0].astype(str).tolist()
+    ['2020-01-15', '2020-06-01', '2020-09-01', '2020-12-01']
+    >>> schedule(year(2020, 2, 29), year(2020, 5, 31), Tenor("1M"), eom=True)[0].astype(str).tolist()
+    ['2020-02-29', '2020-03-31', '2020-04-30', '2020-05-31']
+    >>> from .calendars import Weekday
+    >>> adj = adjustments.Adjustment(
+    ...     Weekday(True).iterator(start, days(1)),
+    ...     roll=conventions.Roll.FOLLOWING,
+    ...     modified=conventions.Modified.MODIFIED,
+    ... )
+    >>> schedule(year(2020, 2, 29), year(2020, 5, 31), Tenor("1M"), adjustment=adj, eom=True)[1].astype(str).tolist()
+    ['2020-02-28', '2020-03-31', '2020-04-30', '2020-05-29']
+    """
+    res = schedules(
+        numpy.array([start], dtype="datetime64[D]"),
+        numpy.array([end], dtype="datetime64[D]"),
+        frequency,
+        adjustment=adjustment,
+        stub=stub,
+        backward=backward,
+        eom=eom,
+    )
+    return res.get(0)
+
+# ---------------------------------------------------------------
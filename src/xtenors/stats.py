@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import typing
+
+import time
+import threading
+import contextlib
+
+# ---------------------------------------------------------------
+
+# NOTE: opt in instrumentation of the hot paths
+
+# counters (and timings, in seconds) are keyed by subsystem:
+
+# parse.*, arithmetic.*, adjust.*, iterator.*,
+# index.* (business day indices), calendar.* (stateful extension)
+
+# instrumented code checks ENABLED before doing anything else
+# (and the iterators only wrap their predicates when enabled)
+# so disabled, the cost is a single global lookup per call
+
+# get() also reports the current size of the caches
+# (parse, memo, indices, and the stateful calendar stores)
+
+# ---------------------------------------------------------------
+
+global ENABLED
+
+ENABLED: bool = False
+
+LOCK = threading.Lock()
+
+COUNTS: dict[str, int] = {}
+TIMES: dict[str, float] = {}
+
+def enable(enabled: bool = True) -> bool:
+    """
+    returns the previous state
+    """
+    global ENABLED
+    res = ENABLED
+    ENABLED = enabled
+    return res
+
+def disable() -> bool:
+    return enable(False)
+
+def reset():
+    with LOCK:
+        COUNTS.clear()
+        TIMES.clear()
+
+# ---------------------------------------------------------------
+
+def count(k: str, n: int = 1):
+    with LOCK:
+        COUNTS[k] = COUNTS.get(k, 0) + n
+
+def add_time(k: str, seconds: float):
+    with LOCK:
+        TIMES[k] = TIMES.get(k, 0.) + seconds
+
+@contextlib.contextmanager
+def timed(k: str):
+    """
+    count and time the enclosed block under k
+    (for rare, expensive operations: eg. calendar extension)
+    """
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(k, time.perf_counter() - t0)
+        count(k)
+
+def counted(k: str, f: typing.Callable) -> typing.Callable:
+    """
+    wrap f to count its calls under k
+    """
+    def res(*args, **kwargs):
+        count(k)
+        return f(*args, **kwargs)
+    return res
+
+# ---------------------------------------------------------------
+
+def sizes() -> dict[str, int]:
+    from . import memo
+    from . import xtenors
+    from . import indices
+    from . import calendars
+
+    parse = xtenors.parse_cached.cache_info()
+    memoized = memo.info()
+
+    stores = [
+        store
+        for stores in (calendars.INCLUDES, calendars.EXCLUDES)
+        for by_key in list(stores.values())
+        for store in list(by_key.values())
+    ]
+    index_values = list(indices.INDICES.values())
+
+    return {
+        "parse.cache.hits": parse.hits,
+        "parse.cache.misses": parse.misses,
+        "parse.cache.size": parse.currsize,
+        "index.cache.size": len(index_values),
+        "index.cache.bytes": sum(
+            index.mask.nbytes + index.counts.nbytes + index.valid.nbytes
+            for index in index_values
+        ),
+        "memo.hits": memoized["hits"],
+        "memo.misses": memoized["misses"],
+        "memo.evictions": memoized["evictions"],
+        "memo.size": memoized["size"],
+        "calendar.stores.size": len(stores),
+        "calendar.stores.days": sum(
+            store.end - store.start + 1 for store in stores
+        ),
+        "calendar.stores.bytes": sum(
+            store.ords.nbytes + len(store.flags) for store in stores
+        ),
+    }
+
+def get() -> dict[str, typing.Union[int, float]]:
+    """
+    >>> from . import xtenors
+    >>> with measure() as res:
+    ...     _ = xtenors.Tenor("1Y6M").init()
+    >>> res["parse.calls"]
+    1
+    """
+    with LOCK:
+        res: dict[str, typing.Union[int, float]] = {
+            **COUNTS,
+            **{k + ".seconds": v for k, v in TIMES.items()},
+        }
+    return {**res, **sizes()}
+
+# ---------------------------------------------------------------
+
+@contextlib.contextmanager
+def measure(
+    #
+) -> typing.Iterator[dict[str, typing.Union[int, float]]]:
+    """
+    enable instrumentation over the enclosed block, yielding a dict
+    that's filled (on exit) with the counters / timings of the block
+    (and the cache sizes as at exit)
+
+    NOTE: counters from other threads over the same period
+    are included
+    """
+    res: dict[str, typing.Union[int, float]] = {}
+    with LOCK:
+        counts0 = dict(COUNTS)
+        times0 = dict(TIMES)
+    previous = enable()
+    try:
+        yield res
+    finally:
+        enable(previous)
+        with LOCK:
+            res.update({
+                k: v - counts0.get(k, 0)
+                for k, v in COUNTS.items()
+                if v != counts0.get(k, 0)
+            })
+            res.update({
+                k + ".seconds": v - times0.get(k, 0.)
+                for k, v in TIMES.items()
+                if v != times0.get(k, 0.)
+            })
+        res.update(sizes())
+
+# ---------------------------------------------------------------
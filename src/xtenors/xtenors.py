@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import re
 import abc
 import typing
 
@@ -11,6 +12,8 @@ import functools
 import datetime
 import calendar
 
+import numpy
+
 import xtuples as xt
 
 from .dates import *
@@ -18,11 +21,13 @@ from .units import *
 
 # TODO: rename iteration as iterators for consistency
 
+from . import stats
 from . import conventions
 from . import iterators
 from . import calendars
 from . import arithmetic
 from . import adjustments
+from . import memo
 
 # ---------------------------------------------------------------
 
@@ -85,19 +90,20 @@ class Tenor(typing.NamedTuple):
         Tenor(s=None, Y=0, M=1, W=0, D=0, adjustment=None)
         >>> Tenor.parse("1Y")
         Tenor(s=None, Y=1, M=0, W=0, D=0, adjustment=None)
+        >>> Tenor.parse("1Y6M")
+        Tenor(s=None, Y=1, M=6, W=0, D=0, adjustment=None)
+        >>> Tenor.parse("TN")
+        Tenor(s=None, Y=0, M=0, W=0, D=2, adjustment=None)
+        >>> Tenor.parse("1Y6M") is Tenor.parse("1Y6M")
+        True
         """
-        unit = s[-1]
-        v = int(s[:-1])
-        if unit == 'Y':
-            return Tenor(None, v, 0, 0, 0, adjustment)
-        elif unit == 'M':
-            return Tenor(None, 0, v, 0, 0, adjustment)
-        elif unit == 'D':
-            return Tenor(None, 0, 0, 0, v, adjustment)
-        elif unit == 'W':
-            return Tenor(None, 0, 0, v, 0, adjustment)
-        else:
-            assert False, (unit, v)
+        if stats.ENABLED:
+            stats.count("parse.calls")
+        try:
+            return parse_cached(s, adjustment)
+        except TypeError:
+            # unhashable adjustment
+            return Tenor(None, *parse_units(s), adjustment)
 
     # @classmethod
     # def parse_C(cls, s: str, adjustment = None) -> Tenor:
@@ -136,6 +142,21 @@ class Tenor(typing.NamedTuple):
             return self, self.Y, self.M, self.W, self.D
         return self
 
+    def compact(self: Tenor) -> Span:
+        """
+        >>> Tenor("1Y2W").compact()
+        Span(months=12, days=14)
+        >>> Tenor("3M").compact() is Tenor(M=3).compact()
+        True
+        """
+        if self.s is not None and self.adjustment is None:
+            return parse_span(self.s)
+        tenor = self.init()
+        return span(
+            12 * (tenor.Y or 0) + (tenor.M or 0),
+            7 * (tenor.W or 0) + (tenor.D or 0),
+        )
+
     def add(
         self: Tenor,
         ddt: typing.Union[DDT, Tenor],
@@ -159,6 +180,216 @@ class Tenor(typing.NamedTuple):
             )
         )
 
+    def add_array(
+        self: Tenor,
+        ds: numpy.ndarray,
+        iterator: typing.Optional[iterators. Iterator] = None,
+        adjust: bool = False,
+        adjustment=None,
+    ) -> numpy.ndarray:
+        """
+        >>> ds = numpy.array(["2021-01-15", "2021-01-31"], dtype="datetime64[D]")
+        >>> Tenor("1M").add_array(ds)
+        Traceback (most recent call last):
+         ...
+        ValueError: day is out of range for month
+        >>> adj = adjustments.Adjustment(None, overflow=conventions.Overflow.PREV)
+        >>> Tenor("1M").add_array(ds, adjustment=adj)
+        array(['2021-02-15', '2021-02-28'], dtype='datetime64[D]')
+        >>> itr = calendars.Weekday(True).iterator(year(2021), days(1))
+        >>> adj = adjustments.Adjustment(itr, overflow=conventions.Overflow.PREV, roll=conventions.Roll.FOLLOWING)
+        >>> Tenor("1M").add_array(ds, adjust=True, adjustment=adj)
+        array(['2021-02-15', '2021-03-01'], dtype='datetime64[D]')
+        """
+        return add_array(
+            ds,
+            self,
+            iterator=iterator,
+            adjust=adjust,
+            adjustment=adjustment,
+        )
+
+# ---------------------------------------------------------------
+
+# NOTE: market tenors are given as their (business) day offset
+# from the trade date, assuming a T+2 spot:
+
+# ON: today -> T+1
+# TN: T+1 -> T+2
+# SN: T+2 -> T+3
+# SPOT: T+2
+
+# (pillars instead takes these from its spot argument,
+# see pillars.MARKET)
+
+TENORS_MARKET: dict[str, tuple[int, int, int, int]] = {
+    "ON": (0, 0, 0, 1),
+    "TN": (0, 0, 0, 2),
+    "SN": (0, 0, 0, 3),
+    "SPOT": (0, 0, 0, 2),
+}
+
+TENOR_UNITS = re.compile(r"^(\d+Y)?(\d+M)?(\d+W)?(\d+D)?$")
+
+def parse_units(s: str) -> tuple[int, int, int, int]:
+    """
+    units in order (Y, M, W, D), each at most once,
+    and a leading sign applies to all of them
+
+    >>> parse_units("3M")
+    (0, 3, 0, 0)
+    >>> parse_units("-2W3D")
+    (0, 0, -2, -3)
+    >>> parse_units("1y6m")
+    (1, 6, 0, 0)
+    >>> parse_units("on")
+    (0, 0, 0, 1)
+    >>> parse_units("6M1Y") # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+     ...
+    AssertionError: 6M1Y...
+    >>> parse_units("1Y1Y") # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+     ...
+    AssertionError: 1Y1Y...
+    """
+    s = s.strip().upper()
+    if s in TENORS_MARKET:
+        return TENORS_MARKET[s]
+    sign = 1
+    if s.startswith(("-", "+")):
+        sign = -1 if s[0] == "-" else 1
+        s = s[1:]
+    match = TENOR_UNITS.match(s)
+    assert s and match is not None, s
+    y, m, w, d = (
+        0 if v is None else sign * int(v[:-1])
+        for v in match.groups()
+    )
+    return y, m, w, d
+
+@functools.lru_cache(maxsize=4096)
+def parse_cached(s: str, adjustment = None) -> Tenor:
+    return Tenor(None, *parse_units(s), adjustment)
+
+# ---------------------------------------------------------------
+
+# NOTE: Span is a compact (slotted) tenor, for hot loops and
+# large collections, with Tenor as the (fuller) facade
+
+# as arithmetic only ever uses years * 12 + months
+# and weeks * 7 + days, a tenor reduces to a (signed) months / days
+# pair, packed into a single int: months << SPAN_BITS + days
+
+# which also packs into int64 arrays (see add_span_array)
+
+# spans of common sizes are interned, so the same tenor
+# is (almost always) the same object
+
+SPAN_BITS = 20
+SPAN_HALF = 1 << (SPAN_BITS - 1)
+
+def pack_span(months, days):
+    """
+    >>> pack_span(1, -1), unpack_span(pack_span(1, -1))
+    (1048575, (1, -1))
+    >>> unpack_span(pack_span(-3, 2)), unpack_span(pack_span(-3, -2))
+    ((-3, 2), (-3, -2))
+    """
+    return (months << SPAN_BITS) + days
+
+def unpack_span(code):
+    months = (code + SPAN_HALF) >> SPAN_BITS
+    return months, code - (months << SPAN_BITS)
+
+class Span:
+
+    __slots__ = ("code",)
+
+    code: int
+
+    def __init__(self, code: int):
+        self.code = code
+
+    @property
+    def months(self) -> int:
+        return unpack_span(self.code)[0]
+
+    @property
+    def days(self) -> int:
+        return unpack_span(self.code)[1]
+
+    def sign(self) -> int:
+        """
+        >>> span(-1, 0).sign(), span(0, 0).sign(), span(0, 2).sign()
+        (-1, 0, 1)
+        """
+        months, days = unpack_span(self.code)
+        v = months if months != 0 else days
+        return (v > 0) - (v < 0)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Span) and self.code == other.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __neg__(self) -> Span:
+        months, days = unpack_span(self.code)
+        return span(-months, -days)
+
+    def __repr__(self) -> str:
+        months, days = unpack_span(self.code)
+        return "Span(months={}, days={})".format(months, days)
+
+    def tenor(self, adjustment = None) -> Tenor:
+        """
+        >>> span(18, 3).tenor()
+        Tenor(s=None, Y=0, M=18, W=0, D=3, adjustment=None)
+        """
+        months, days = unpack_span(self.code)
+        return Tenor(None, 0, months, 0, days, adjustment)
+
+    def add(
+        self: Span,
+        ddt: DDT,
+        spec: typing.Optional[adjustments.Spec] = None,
+        adjust: bool = False,
+    ) -> DDT:
+        return add_span(ddt, self, spec=spec, adjust=adjust)
+
+SPAN_INTERN_MONTHS = 1200
+SPAN_INTERN_DAYS = 3660
+
+SPANS: dict[int, Span] = {}
+
+def span(months: int = 0, days: int = 0) -> Span:
+    """
+    >>> span(3) is span(3, 0)
+    True
+    """
+    assert -SPAN_HALF <= days < SPAN_HALF, days
+    code = (months << SPAN_BITS) + days
+    res = SPANS.get(code)
+    if res is not None:
+        return res
+    res = Span(code)
+    if (
+        -SPAN_INTERN_MONTHS <= months <= SPAN_INTERN_MONTHS
+        and -SPAN_INTERN_DAYS <= days <= SPAN_INTERN_DAYS
+    ):
+        res = SPANS.setdefault(code, res)
+    return res
+
+@functools.lru_cache(maxsize=4096)
+def parse_span(s: str) -> Span:
+    """
+    >>> parse_span("1Y6M"), parse_span("-2W")
+    (Span(months=18, days=0), Span(months=0, days=-14))
+    """
+    y, m, w, d = parse_units(s)
+    return span(12 * y + m, 7 * w + d)
+
 # ---------------------------------------------------------------
 
 def add(
@@ -168,6 +399,20 @@ def add(
     adjust: bool = False,
     adjustment=None,
 ):
+    """
+    memoized if enabled (see memo.enable)
+
+    >>> _ = memo.enable(maxsize=16)
+    >>> memo.reset()
+    >>> add(year(2020, 1, 31), Tenor("3M"), adjustment=adjustments.Adjustment(None, overflow=conventions.Overflow.PREV))
+    datetime.date(2020, 4, 30)
+    >>> add(year(2020, 1, 31), Tenor("3M"), adjustment=adjustments.Adjustment(None, overflow=conventions.Overflow.PREV))
+    datetime.date(2020, 4, 30)
+    >>> {k: v for k, v in memo.info().items() if k in ["hits", "misses"]}
+    {'hits': 1, 'misses': 1}
+    >>> _ = memo.disable()
+    >>> memo.reset()
+    """
     if isinstance(left, Tenor) and isinstance(right, Tenor):
 
         assert isinstance(left, Tenor)
@@ -203,6 +448,19 @@ def add(
     else:
         assert False, dict(left=left, right=right)
 
+    if memo.ENABLED:
+        return memo.cached(
+            add_date, ddt, tenor, iterator, adjust, adjustment
+        )
+    return add_date(ddt, tenor, iterator, adjust, adjustment)
+
+def add_date(
+    ddt: DDT,
+    tenor: Tenor,
+    iterator: typing.Optional[iterators. Iterator],
+    adjust: bool,
+    adjustment,
+) -> DDT:
     res = arithmetic.add(
         ddt,
         years=tenor.Y,
@@ -226,3 +484,141 @@ def add(
     )
 
 # ---------------------------------------------------------------
+
+def add_array(
+    ds: numpy.ndarray,
+    tenor: Tenor,
+    iterator: typing.Optional[iterators. Iterator] = None,
+    adjust: bool = False,
+    adjustment=None,
+) -> numpy.ndarray:
+    tenor = tenor.init()
+    if adjustment is None:
+        adjustment = tenor.adjustment
+    res = arithmetic.add_array(
+        ds,
+        years=tenor.Y,
+        months=tenor.M,
+        weeks=tenor.W,
+        days=tenor.D,
+        iterator=iterator,
+        overflow=(
+            None if adjustment is None
+            else adjustment.overflow
+        ),
+    )
+    return res if not adjust else adjustments.adjust_array(
+        res,
+        iterator=adjustment.iterator,
+        roll=adjustment.roll,
+        modified=adjustment.modified,
+    )
+
+def tenor_units(
+    tenors: typing.Union[str, Tenor, typing.Sequence],
+    n: int,
+) -> numpy.ndarray:
+    """
+    (n, 4) int array of years, months, weeks, days per row
+    (parsing each distinct tenor once)
+
+    >>> tenor_units(["1M", "2W", "1M"], 3)
+    array([[0, 1, 0, 0],
+           [0, 0, 2, 0],
+           [0, 1, 0, 0]])
+    """
+    if isinstance(tenors, (str, Tenor)):
+        tenors = [tenors]
+    if isinstance(tenors, numpy.ndarray) and tenors.dtype.kind == "U":
+        unique, inverse = numpy.unique(tenors, return_inverse=True)
+        unique = unique.tolist()
+    else:
+        index: dict[typing.Any, int] = {}
+        inverse = numpy.array([
+            index.setdefault(t, len(index)) for t in tenors
+        ], dtype=numpy.int64)
+        unique = list(index.keys())
+    units = numpy.array([
+        (t.Y or 0, t.M or 0, t.W or 0, t.D or 0)
+        for t in (
+            (Tenor(t) if isinstance(t, str) else t).init()
+            for t in unique
+        )
+    ], dtype=numpy.int64).reshape(-1, 4)
+    res = units[inverse]
+    if len(res) == 1 and n != 1:
+        res = numpy.repeat(res, n, axis=0)
+    assert len(res) == n, dict(tenors=len(res), n=n)
+    return res
+
+# ---------------------------------------------------------------
+
+def add_span(
+    ddt: DDT,
+    span: Span,
+    spec: typing.Optional[adjustments.Spec] = None,
+    adjust: bool = False,
+) -> DDT:
+    """
+    as add, for a compact tenor / adjustment
+
+    >>> add_span(year(2020, 1, 31), parse_span("1M"), adjustments.Spec(overflow=conventions.Overflow.PREV))
+    datetime.date(2020, 2, 29)
+    >>> itr = calendars.Weekday(True).iterator(year(2020), days(1))
+    >>> spec = adjustments.Spec(itr, roll=conventions.Roll.FOLLOWING)
+    >>> add_span(year(2020, 1, 3), parse_span("1D"), spec)
+    datetime.date(2020, 1, 6)
+    >>> add_span(year(2020, 1, 4), parse_span("1M"), spec, adjust=True)
+    datetime.date(2020, 2, 4)
+    """
+    months, days = unpack_span(span.code)
+    res = arithmetic.add(
+        ddt,
+        months=months,
+        days=days,
+        iterator=None if spec is None else spec.iterator,
+        overflow=None if spec is None else spec.overflow,
+    )
+    if not adjust:
+        return res
+    assert spec is not None
+    return adjustments.adjust(
+        res,
+        spec.iterator,
+        roll=spec.roll,
+        modified=spec.modified,
+    )
+
+def add_span_array(
+    ds: numpy.ndarray,
+    codes: numpy.ndarray,
+    spec: typing.Optional[adjustments.Spec] = None,
+    adjust: bool = False,
+) -> numpy.ndarray:
+    """
+    codes: int64 array of packed spans (see pack_span / Span.code)
+
+    >>> ds = numpy.array(["2020-01-31", "2020-01-03"], dtype="datetime64[D]")
+    >>> codes = numpy.array([parse_span("1M").code, parse_span("1D").code])
+    >>> add_span_array(ds, codes, adjustments.Spec(overflow=conventions.Overflow.PREV))
+    array(['2020-02-29', '2020-01-04'], dtype='datetime64[D]')
+    """
+    months, days = unpack_span(numpy.asarray(codes, dtype=numpy.int64))
+    res = arithmetic.add_array(
+        ds,
+        months=months,
+        days=days,
+        iterator=None if spec is None else spec.iterator,
+        overflow=None if spec is None else spec.overflow,
+    )
+    if not adjust:
+        return res
+    assert spec is not None
+    return adjustments.adjust_array(
+        res,
+        spec.iterator,
+        roll=spec.roll,
+        modified=spec.modified,
+    )
+
+# ---------------------------------------------------------------
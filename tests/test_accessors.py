@@ -0,0 +1,127 @@
+import datetime
+
+import numpy
+import pandas
+
+import xtenors
+import xtenors.accessors
+
+from xtenors import conventions
+
+# ---------------------------------------------------------------
+
+def test_accessors():
+    print(":")
+
+    rng = numpy.random.default_rng(0)
+    n = 300
+
+    values = (
+        numpy.datetime64("2019-01-01T09:30", "ns")
+        + rng.integers(0, 1000, n).astype("timedelta64[D]")
+    )
+    values[::7] = numpy.datetime64("NaT")
+
+    index = pandas.Index(rng.permutation(n), name="k")
+    s = pandas.Series(values, index=index, name="d")
+
+    calendar = xtenors.calendars.Weekday(True)
+    itr = calendar.iterator(datetime.date(2019, 1, 1), xtenors.days(1))
+    adj = xtenors.Adjustment(
+        itr,
+        overflow=conventions.Overflow.PREV,
+        roll=conventions.Roll.FOLLOWING,
+        modified=conventions.Modified.MODIFIED,
+    )
+
+    def f_exp(f, v):
+        return pandas.NaT if pandas.isna(v) else pandas.Timestamp(
+            f(v.to_pydatetime())
+        )
+
+    for tenor in ["1D", "1M", "-3M", "1Y"]:
+        res = s.xtenors.add(tenor, iterator=itr, adjust=True, adjustment=adj)
+        assert (res.index == s.index).all() and res.name == s.name
+        exp = s.map(lambda v: f_exp(lambda d: xtenors.add(
+            d,
+            xtenors.Tenor(tenor),
+            iterator=itr,
+            adjust=True,
+            adjustment=adj,
+        ), v))
+        assert res.equals(exp.astype(res.dtype)), tenor
+
+        ix = pandas.DatetimeIndex(s.values, name="d")
+        assert (
+            pandas.Series(ix.xtenors.add(
+                tenor, iterator=itr, adjust=True, adjustment=adj
+            ).values, index=s.index).equals(res)
+        ), tenor
+
+    # tz aware values are worked on in local time
+    tz = s.dt.tz_localize("America/New_York")
+    res = tz.xtenors.adjust(itr, roll=conventions.Roll.PRECEDING)
+    assert str(res.dt.tz) == "America/New_York"
+    assert res.dt.tz_localize(None).equals(
+        s.xtenors.adjust(itr, roll=conventions.Roll.PRECEDING)
+    )
+
+    # other is aligned on the index
+    other = s.sample(frac=1.0, random_state=0) + pandas.Timedelta(days=30)
+    res = s.xtenors.business_days_between(other, calendar)
+    assert res.dtype == "Int64"
+    assert res.isna().sum() == s.isna().sum()
+    valid = s.notna()
+    exp = numpy.busday_count(
+        s[valid].values.astype("datetime64[D]"),
+        (s[valid] + pandas.Timedelta(days=30)).values.astype("datetime64[D]"),
+    )
+    assert (res[valid].to_numpy(dtype=numpy.int64) == exp).all()
+
+    print("--")
+
+# ---------------------------------------------------------------
+
+def test_accessors_dst():
+    print(":")
+
+    # 2020-03-08 02:30 doesn't exist in New York (clocks go
+    # 02:00 -> 03:00), and 2020-11-01 01:30 happens twice
+
+    s = pandas.Series(pandas.to_datetime([
+        "2020-03-07 02:30", "2020-10-31 01:30", "2020-06-01 09:30",
+    ])).dt.tz_localize("America/New_York")
+
+    res = s.xtenors.add("1D", ambiguous="NaT")
+    assert res[0] == pandas.Timestamp(
+        "2020-03-08 03:00", tz="America/New_York"
+    )
+    assert pandas.isna(res[1])
+    assert res[2] == pandas.Timestamp(
+        "2020-06-02 09:30", tz="America/New_York"
+    )
+
+    res = s.xtenors.add(
+        "1D", ambiguous=numpy.array([True, True, True]), nonexistent="NaT"
+    )
+    assert pandas.isna(res[0])
+    assert res[1] == pandas.Timestamp(
+        "2020-11-01 01:30-04:00"
+    ).tz_convert("America/New_York")
+
+    ix = pandas.DatetimeIndex(s)
+    assert pandas.Series(ix.xtenors.add("1D", ambiguous="NaT")).equals(
+        s.xtenors.add("1D", ambiguous="NaT")
+    )
+
+    # by default, as pandas, an ambiguous time raises
+    try:
+        s.xtenors.add("1D")
+    except Exception:
+        pass
+    else:
+        assert False, "expected an ambiguous time error"
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -86,3 +86,30 @@ def test_add():
     print("--")
     
 # ---------------------------------------------------------------
+
+def test_add_datetime():
+    print(":")
+
+    # a datetime (with its time and tzinfo) gives a datetime
+    # overflowing or not, and a date gives a date
+
+    tz = datetime.timezone(datetime.timedelta(hours=-5))
+    ddt = datetime.datetime(2020, 1, 31, 9, 30, tzinfo=tz)
+
+    prev = xtenors.conventions.Overflow.PREV
+    for kws, exp in [
+        (dict(months=1, overflow=prev), datetime.date(2020, 2, 29)),
+        (dict(months=2), datetime.date(2020, 3, 31)),
+        (dict(days=1), datetime.date(2020, 2, 1)),
+    ]:
+        res = xtenors.arithmetic.add_py(ddt, **kws)
+        assert isinstance(res, datetime.datetime), (kws, res)
+        assert res == datetime.datetime.combine(exp, ddt.timetz()), (kws, res)
+
+        res = xtenors.arithmetic.add_py(ddt.date(), **kws)
+        assert type(res) is datetime.date, (kws, res)
+        assert res == exp, (kws, res)
+
+    print("--")
+
+# ---------------------------------------------------------------
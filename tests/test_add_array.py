@@ -0,0 +1,112 @@
+
+import datetime
+import timeit
+
+import numpy
+
+import xtenors
+
+# ---------------------------------------------------------------
+
+def dates_array(n, start = datetime.date(2000, 1, 1)):
+    return (
+        numpy.datetime64(start, "D")
+        + (numpy.arange(n) % (365 * 30)).astype("timedelta64[D]")
+    )
+
+def add_py_loop(ds, **kws):
+    return numpy.array([
+        xtenors.arithmetic.add_py(d, **kws)
+        for d in ds.tolist()
+    ], dtype="datetime64[D]")
+
+# ---------------------------------------------------------------
+
+def test_add_array():
+    print(":")
+
+    ds = dates_array(365 * 4)
+
+    for overflow in [
+        xtenors.conventions.Overflow.PREV,
+        xtenors.conventions.Overflow.NEXT,
+    ]:
+        for kws in [
+            dict(years=3),
+            dict(years=3, months=3),
+            dict(years=-2, months=1),
+            dict(months=-13, weeks=2),
+            dict(days=45),
+        ]:
+            res = xtenors.arithmetic.add_array(
+                ds, overflow=overflow, **kws
+            )
+            exp = add_py_loop(ds, overflow=overflow, **kws)
+            assert (res == exp).all(), dict(
+                overflow=overflow,
+                kws=kws,
+                n_diff=(res != exp).sum(),
+            )
+
+    print("--")
+
+def test_add_py_datetime():
+    print(":")
+
+    ds = dates_array(365 * 4).tolist()
+
+    for overflow in [
+        xtenors.conventions.Overflow.PREV,
+        xtenors.conventions.Overflow.NEXT,
+    ]:
+        for kws in [
+            dict(years=1, months=1),
+            dict(months=-13, days=3),
+            dict(weeks=-2),
+        ]:
+            for d in ds:
+                dt = datetime.datetime.combine(
+                    d, datetime.time(9, 30)
+                )
+                res = xtenors.arithmetic.add_py(
+                    dt, overflow=overflow, **kws
+                )
+                exp = xtenors.arithmetic.add_py(
+                    d, overflow=overflow, **kws
+                )
+                assert res == datetime.datetime.combine(
+                    exp, dt.time()
+                ), dict(d=d, kws=kws)
+
+    print("--")
+
+def test_add_array_speed():
+    print(":")
+
+    n = 10 ** 5
+    ds = dates_array(n)
+    kws = dict(
+        years=1, 
+        months=1, 
+        overflow=xtenors.conventions.Overflow.PREV,
+    )
+
+    # the target is two orders of magnitude over the scalar loop
+    # (measured at ~100x, here and on 1m dates, see add_array_1m in
+    # benchmarks), asserted at half that as a margin for timing
+    # noise on a shared machine
+
+    t_loop = min(timeit.repeat(
+        lambda: add_py_loop(ds, **kws), number=1, repeat=2
+    ))
+    t_array = min(timeit.repeat(
+        lambda: xtenors.arithmetic.add_array(ds, **kws),
+        number=1,
+        repeat=5,
+    ))
+    print(dict(loop=t_loop, array=t_array, ratio=t_loop / t_array))
+    assert t_array * 50 < t_loop, dict(loop=t_loop, array=t_array)
+
+    print("--")
+
+# ---------------------------------------------------------------
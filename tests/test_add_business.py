@@ -0,0 +1,77 @@
+import datetime
+
+import numpy
+
+import xtenors
+
+# ---------------------------------------------------------------
+
+def test_business_days_between():
+    print(":")
+
+    calendar = xtenors.calendars.Weekday(True)
+
+    rng = numpy.random.default_rng(0)
+    starts = (
+        numpy.datetime64("2019-01-01")
+        + rng.integers(0, 1000, 200).astype("timedelta64[D]")
+    )
+    ends = starts + rng.integers(-400, 400, 200).astype("timedelta64[D]")
+
+    res = xtenors.business_days_between_array(starts, ends, calendar)
+    exp = numpy.busday_count(starts, ends)
+    assert (res == exp).all(), starts[res != exp]
+
+    for start, end, n in zip(starts.tolist(), ends.tolist(), exp):
+        assert xtenors.business_days_between(
+            start, end, calendar
+        ) == n, dict(start=start, end=end)
+
+        if start > end:
+            continue
+
+        # lazy (stepped) count, inclusive of end
+        itr = calendar.iterator(
+            start, xtenors.days(1), end=end, accept=lambda d: True
+        )
+        assert itr.n_accepted() == numpy.busday_count(
+            start, end + datetime.timedelta(days=1)
+        ), dict(start=start, end=end)
+
+    print("--")
+
+def test_weekmask_closed_form():
+    print(":")
+
+    # compiled calendars go through the index
+    # whereas weekdays are closed form
+
+    for weekdays in [True, [4, 5], [0, 3, 6]]:
+        calendar = xtenors.calendars.Weekday(weekdays)
+        assert xtenors.indices.weekmask(calendar) is not None
+        compiled = xtenors.calendars.compile_calendar(
+            calendar,
+            datetime.date(2018, 1, 1),
+            datetime.date(2024, 1, 1),
+        )
+        assert xtenors.indices.weekmask(compiled) is None
+
+        ds = (
+            numpy.datetime64("2019-12-01")
+            + numpy.arange(400).astype("timedelta64[D]")
+        )
+        for n in [-30, -1, 0, 1, 2, 7, 30]:
+            res = xtenors.indices.add_array(calendar, ds, n)
+            exp = xtenors.indices.add_array(compiled, ds, n)
+            assert (res == exp).all(), dict(
+                weekdays=weekdays, n=n, diff=ds[res != exp],
+            )
+
+        ends = ds[::-1]
+        res = xtenors.indices.count_array(calendar, ds, ends)
+        exp = xtenors.indices.count_array(compiled, ds, ends)
+        assert (res == exp).all(), weekdays
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -0,0 +1,50 @@
+
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import conventions
+
+# ---------------------------------------------------------------
+
+def test_adjust_array():
+    print(":")
+
+    itr = xtenors.calendars.Weekday(True).iterator(
+        datetime.date(2020, 1, 1), xtenors.days(1)
+    )
+    ds = (
+        numpy.datetime64("2019-12-01")
+        + numpy.arange(400).astype("timedelta64[D]")
+    )
+
+    for roll in [
+        conventions.Roll.FOLLOWING,
+        conventions.Roll.PRECEDING,
+    ]:
+        for modified in [
+            None,
+            conventions.Modified.UNMODIFIED,
+            conventions.Modified.MODIFIED,
+        ]:
+            res = xtenors.adjust_array(
+                ds, itr, roll=roll, modified=modified
+            )
+            exp = numpy.array([
+                xtenors.adjust(d, itr, roll=roll, modified=modified)
+                for d in ds.tolist()
+            ], dtype="datetime64[D]")
+            assert (res == exp).all(), dict(
+                roll=roll,
+                modified=modified,
+                diff=ds[res != exp],
+            )
+            # 1970-01-01 was a thursday
+            weekdays = (res.astype(numpy.int64) + 3) % 7
+            assert (weekdays < 5).all(), roll
+
+    print("--")
+
+# ---------------------------------------------------------------
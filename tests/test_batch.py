@@ -0,0 +1,79 @@
+import multiprocessing
+import concurrent.futures
+
+import numpy
+
+import xtenors
+
+from xtenors import conventions, calendars
+
+# ---------------------------------------------------------------
+
+def test_add_batch():
+    print(":")
+
+    rng = numpy.random.default_rng(0)
+    n = 2000
+
+    ds = (
+        numpy.datetime64("2015-01-01")
+        + rng.integers(0, 3650, n).astype("timedelta64[D]")
+    )
+    # including business day tenors long enough to run past a
+    # range sized at two calendar days per business day (for the
+    # sparse union below)
+    tenors = rng.choice([
+        "1D", "2D", "1W", "1M", "3M", "1Y", "-5D", "80D", "-60D",
+    ], n)
+
+    cals = [
+        calendars.Weekday(True),
+        calendars.union_calendars(calendars.Weekday(0), calendars.Weekday(3)),
+    ]
+    keys = rng.integers(0, len(cals), n)
+
+    kwargs = dict(
+        adjust=True,
+        roll=conventions.Roll.FOLLOWING,
+        modified=conventions.Modified.MODIFIED,
+        overflow=conventions.Overflow.PREV,
+    )
+
+    exp = xtenors.batch.add_batch(
+        ds, tenors, cals, keys=keys, max_workers=0, **kwargs
+    )
+    res = xtenors.batch.add_batch(
+        ds, tenors, cals, keys=keys, max_workers=2, **kwargs
+    )
+    assert (res == exp).all(), ds[res != exp]
+
+    # NOTE: not fork, as the suite has imported numba (via financepy)
+    with concurrent.futures.ProcessPoolExecutor(
+        2, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        res = xtenors.batch.add_batch(
+            ds, tenors, cals, keys=keys, executor=executor, **kwargs
+        )
+    assert (res == exp).all(), ds[res != exp]
+
+    # against the per calendar array kernels
+    for key, cal in enumerate(cals):
+        itr = cal.iterator(ds[0].item(), xtenors.days(1))
+        adj = xtenors.Adjustment(
+            itr,
+            overflow=conventions.Overflow.PREV,
+            roll=conventions.Roll.FOLLOWING,
+            modified=conventions.Modified.MODIFIED,
+        )
+        for tenor in numpy.unique(tenors):
+            rows = (keys == key) & (tenors == tenor)
+            check = xtenors.Tenor(str(tenor)).add_array(
+                ds[rows], iterator=itr, adjust=True, adjustment=adj,
+            )
+            assert (res[rows] == check).all(), dict(
+                calendar=cal, tenor=tenor,
+            )
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -0,0 +1,111 @@
+
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import calendars
+
+from . import utils
+
+# ---------------------------------------------------------------
+
+def fresh_valid(manager):
+    # as if in a new process
+    calendars.clear(utils.Manager_Test)
+    return calendars.Stateful(manager).valid()
+
+# ---------------------------------------------------------------
+
+def test_disk_cache(tmp_path):
+    calendars.set_cache_dir(tmp_path)
+    utils.CALLS.clear()
+    try:
+        manager = utils.Manager_Test("test", xtenors.days(30))
+
+        f = fresh_valid(manager)
+        assert not f(datetime.date(2020, 3, 1))
+        assert f(datetime.date(2020, 3, 2))
+        assert len(utils.CALLS) == 1
+
+        f = fresh_valid(manager)
+        assert not f(datetime.date(2020, 3, 1))
+        assert f(datetime.date(2020, 3, 2))
+        assert len(utils.CALLS) == 1, utils.CALLS
+
+        # provider upgrade invalidates the entry
+        f = fresh_valid(manager._replace(version="1"))
+        assert not f(datetime.date(2020, 3, 1))
+        assert len(utils.CALLS) == 2, utils.CALLS
+
+    finally:
+        calendars.set_cache_dir(None)
+        calendars.clear(utils.Manager_Test)
+
+# ---------------------------------------------------------------
+
+def test_extension_calls():
+    calendars.clear(utils.Manager_Test)
+    utils.CALLS.clear()
+    try:
+        manager = utils.Manager_Test("walk", xtenors.days(30))
+        f = calendars.Stateful(manager).valid()
+
+        # a 40 year walk, only extends a handful of times
+        d = datetime.date(1990, 1, 1)
+        while d < datetime.date(2030, 1, 1):
+            assert f(d) == (d.day != 1), d
+            d += xtenors.days(1)
+        assert len(utils.CALLS) <= 8, utils.CALLS
+
+    finally:
+        calendars.clear(utils.Manager_Test)
+
+def test_prefetch():
+    calendars.clear(utils.Manager_Test)
+    utils.CALLS.clear()
+    try:
+        calendar = calendars.Stateful(
+            utils.Manager_Test("prefetch", xtenors.days(30))
+        ).prefetch(
+            datetime.date(1990, 6, 1),
+            datetime.date(2030, 6, 1),
+            index=True,
+        )
+        assert len(utils.CALLS) == 1, utils.CALLS
+        assert utils.CALLS[0] == (
+            datetime.date(1990, 1, 1), datetime.date(2030, 12, 31),
+        ), utils.CALLS
+        assert calendar.coverage() == utils.CALLS[0]
+
+        store = calendars.EXCLUDES[utils.Manager_Test]["prefetch"]
+        assert len(store.ords) == 41 * 12
+        assert all(d.day == 1 for d in store.dates())
+
+        f = calendar.valid()
+        assert not f(datetime.date(1990, 1, 1))
+        assert f(datetime.date(2030, 12, 31))
+        assert xtenors.business_days_between(
+            datetime.date(2000, 1, 1),
+            datetime.date(2000, 2, 1),
+            calendar,
+        ) == 30
+        assert len(utils.CALLS) == 1, utils.CALLS
+
+        # extends either side, without refetching the middle
+        calendar.prefetch(
+            datetime.date(1980, 1, 1), datetime.date(2040, 1, 1)
+        )
+        assert len(utils.CALLS) == 3, utils.CALLS
+        assert calendar.coverage() == (
+            datetime.date(1980, 1, 1), datetime.date(2040, 12, 31),
+        )
+        store = calendars.EXCLUDES[utils.Manager_Test]["prefetch"]
+        assert len(store.ords) == 61 * 12
+        assert (numpy.diff(store.ords) > 0).all()
+
+    finally:
+        calendars.clear(utils.Manager_Test)
+
+# ---------------------------------------------------------------
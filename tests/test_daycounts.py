@@ -0,0 +1,53 @@
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import conventions
+
+# ---------------------------------------------------------------
+
+def test_year_fraction_array():
+    print(":")
+
+    calendar = xtenors.calendars.Weekday(True)
+
+    rng = numpy.random.default_rng(0)
+    starts = (
+        numpy.datetime64("2019-01-01")
+        + rng.integers(0, 1000, 500).astype("timedelta64[D]")
+    )
+    offsets = rng.integers(-400, 1200, 500)
+    offsets[offsets == 0] = 1
+    ends = starts + offsets.astype("timedelta64[D]")
+
+    # include month ends (incl. february)
+    starts[:4] = numpy.array([
+        "2020-02-29", "2019-12-31", "2021-01-31", "2020-01-30",
+    ], dtype="datetime64[D]")
+    ends[:4] = numpy.array([
+        "2020-08-31", "2021-02-28", "2021-03-31", "2020-03-31",
+    ], dtype="datetime64[D]")
+
+    for convention in conventions.DayCount:
+        kwargs = dict(
+            calendar=calendar,
+            frequency=2,
+            maturity=datetime.date(2021, 2, 28),
+        )
+        res = xtenors.year_fraction_array(
+            starts, ends, convention, **kwargs
+        )
+        exp = numpy.array([
+            xtenors.year_fraction(start, end, convention, **kwargs)
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ])
+        assert numpy.allclose(res, exp), dict(
+            convention=convention,
+            diff=starts[~numpy.isclose(res, exp)],
+        )
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -0,0 +1,64 @@
+
+import os
+import sys
+import pathlib
+import subprocess
+
+# ---------------------------------------------------------------
+
+ROOT = pathlib.Path(__file__).parent.parent
+
+HEAVY = [
+    "pandas",
+    "pandas_market_calendars",
+    "holidays",
+]
+
+SCRIPT = """
+import sys
+import time
+t = time.perf_counter()
+import xtenors
+t = time.perf_counter() - t
+tenor = xtenors.Tenor.parse("3M")
+print(t)
+print(",".join(k for k in {heavy} if k in sys.modules))
+"""
+
+def import_time():
+    # NOTE: import the package from this repo's src
+    # rather than any installed version
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(ROOT / "src")]
+        + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", SCRIPT.format(heavy=HEAVY)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+    )
+    # NOTE: the second line is empty if nothing heavy was loaded
+    t, loaded = res.stdout.splitlines()[:2]
+    return float(t), [k for k in loaded.split(",") if k]
+
+# ---------------------------------------------------------------
+
+def test_import_time():
+    print(":")
+
+    ts = []
+    for _ in range(3):
+        t, loaded = import_time()
+        assert not loaded, loaded
+        ts.append(t)
+
+    print(dict(import_time=min(ts)))
+    assert min(ts) < 0.5, ts
+
+    print("--")
+
+# ---------------------------------------------------------------
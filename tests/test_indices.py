@@ -0,0 +1,143 @@
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import indices
+from xtenors import calendars
+
+from . import utils
+
+# ---------------------------------------------------------------
+
+def stepped_count(f, start, end):
+    # valid days in [start, end), or minus those in (end, start]
+    if end >= start:
+        o0, o1, sign = start, end, 1
+    else:
+        o0, o1, sign = end + 1, start + 1, -1
+    return sign * sum(
+        f(datetime.date.fromordinal(o)) for o in range(o0, o1)
+    )
+
+def stepped_add(f, start, n):
+    if n == 0:
+        return start
+    step = 1 if n > 0 else -1
+    o = start
+    remaining = abs(n)
+    while remaining:
+        o += step
+        remaining -= f(datetime.date.fromordinal(o))
+    return o
+
+def random_ranges(n, seed = 0):
+    rng = numpy.random.default_rng(seed)
+    o = datetime.date(2018, 1, 1).toordinal()
+    starts = o + rng.integers(0, 365 * 4, n)
+    ends = starts + rng.integers(-200, 200, n)
+    return starts, ends
+
+# ---------------------------------------------------------------
+
+def test_index():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+
+    for calendar in [
+        calendars.compile_calendar(
+            calendars.Weekday([0, 2, 4]),
+            datetime.date(2017, 1, 1),
+            datetime.date(2023, 1, 1),
+        ),
+        calendars.Stateful(
+            utils.Manager_Test("indices", xtenors.days(30))
+        ),
+    ]:
+        assert indices.weekmask(calendar) is None
+        f = calendar.valid()
+
+        starts, ends = random_ranges(200)
+        index = indices.index(
+            calendar,
+            int(min(starts.min(), ends.min())),
+            int(max(starts.max(), ends.max())) + 1,
+        )
+
+        exp = numpy.array([
+            stepped_count(f, start, end)
+            for start, end in zip(starts.tolist(), ends.tolist())
+        ])
+        assert (index.count(starts, ends) == exp).all(), calendar
+        assert (indices.count_array(
+            calendar,
+            indices.from_ordinals(starts),
+            indices.from_ordinals(ends),
+        ) == exp).all(), calendar
+
+        ns = (ends - starts) // 3
+        exp = numpy.array([
+            stepped_add(f, start, n)
+            for start, n in zip(starts.tolist(), ns.tolist())
+        ])
+        assert (indices.add_ordinals(calendar, starts, ns) == exp).all(), (
+            calendar
+        )
+
+    calendars.clear(utils.Manager_Test)
+
+    print("--")
+
+def test_manager_minimal():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+    calendars.clear(utils.Manager_Test_Minimal)
+
+    calendar = calendars.Stateful(
+        utils.Manager_Test("indices", xtenors.days(30))
+    )
+    minimal = calendars.Stateful(
+        utils.Manager_Test_Minimal("indices", xtenors.days(30))
+    )
+
+    start, end = datetime.date(2020, 1, 1), datetime.date(2021, 1, 1)
+    assert minimal.prefetch(start, end, index=True) is minimal
+
+    o0, o1 = start.toordinal(), end.toordinal()
+    assert (minimal.mask(o0, o1) == calendar.mask(o0, o1)).all()
+    assert minimal.mask(o0, o1).sum() == (o1 - o0) - 12
+    assert indices.count(minimal, start, end) == (o1 - o0) - 12
+
+    calendars.clear(utils.Manager_Test)
+    calendars.clear(utils.Manager_Test_Minimal)
+
+    print("--")
+
+def test_compiled():
+    print(":")
+
+    calendar = calendars.Weekday([1, 3, 5])
+    compiled = calendars.compile_calendar(
+        calendar,
+        datetime.date(2019, 1, 1),
+        datetime.date(2021, 1, 1),
+    )
+    f = calendar.valid()
+    f_compiled = compiled.valid()
+
+    # including either side of the compiled range
+    d = datetime.date(2018, 6, 1)
+    while d < datetime.date(2021, 6, 1):
+        assert f_compiled(d) == f(d), d
+        d += xtenors.days(1)
+
+    o0 = datetime.date(2018, 10, 1).toordinal()
+    o1 = datetime.date(2021, 3, 1).toordinal()
+    assert (compiled.mask(o0, o1) == indices.mask(calendar, o0, o1)).all()
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -0,0 +1,48 @@
+import datetime
+
+import xtuples as xt
+
+import xtenors
+
+# ---------------------------------------------------------------
+
+def test_jump():
+    print(":")
+
+    start = datetime.date(2019, 12, 1)
+
+    for calendar in [
+        xtenors.calendars.Weekday(True),
+        xtenors.calendars.Weekday([2, 6]),
+        xtenors.calendars.compile_calendar(
+            xtenors.calendars.Weekday([0, 3]),
+            datetime.date(2020, 1, 1),
+            datetime.date(2020, 6, 1),
+        ),
+    ]:
+        for step in [xtenors.days(1), xtenors.days(-1)]:
+            itr = calendar.iterator(start, step)
+            assert itr.jump is not None, calendar
+
+            _, gen = itr.gen(skip=True)
+            res = xt.iTuple.from_where(
+                gen, lambda y, v: y, n=200, star=True
+            ).mapstar(lambda y, v: v)
+
+            _, gen = itr.gen()
+            exp = xt.iTuple.from_where(
+                gen, lambda y, v: y, n=200, star=True
+            ).mapstar(lambda y, v: v)
+
+            assert res == exp, dict(calendar=calendar, step=step)
+
+            # by default, every step is yielded
+            _, gen = itr.gen()
+            steps = xt.iTuple.n_from(gen, 10).mapstar(lambda y, v: v)
+            assert steps == xt.iTuple.range(10).map(
+                lambda i: start + step * i
+            ), dict(calendar=calendar, step=step)
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -0,0 +1,110 @@
+import datetime
+
+import xtenors
+
+from xtenors import memo
+from xtenors import calendars
+from xtenors import conventions
+
+from . import utils
+
+# ---------------------------------------------------------------
+
+def test_memo():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+    utils.CALLS.clear()
+
+    manager = utils.Manager_Test("memo", xtenors.days(30))
+    calendar = calendars.Stateful(manager)
+    weekdays = calendars.Weekday(True)
+
+    adjustment = xtenors.Adjustment(
+        calendar.iterator(datetime.date(2020, 1, 1), xtenors.days(1)),
+        overflow=conventions.Overflow.PREV,
+        roll=conventions.Roll.FOLLOWING,
+    )
+    itr = weekdays.iterator(datetime.date(2020, 1, 1), xtenors.days(1))
+
+    ds = [
+        datetime.date(2020, 1, 1) + xtenors.days(i)
+        for i in range(60)
+    ]
+    tenors = [xtenors.Tenor(s) for s in ["1D", "1W", "1M", "1Y"]]
+
+    def f_all():
+        return [
+            xtenors.add(
+                d, tenor, iterator=itr, adjust=True, adjustment=adjustment
+            )
+            for d in ds
+            for tenor in tenors
+        ]
+
+    exp = f_all()
+
+    maxsize = memo.MAXSIZE
+    previous = memo.enable(maxsize=1000)
+    memo.reset()
+    try:
+        assert f_all() == exp
+        assert f_all() == exp
+
+        info = memo.info()
+        assert info["misses"] == len(exp), info
+        assert info["hits"] == len(exp), info
+        assert info["size"] == len(exp), info
+
+        # non indexable iterators bypass the cache
+        xtenors.add(
+            ds[0],
+            tenors[0],
+            iterator=itr._replace(end=datetime.date(2030, 1, 1)),
+        )
+        assert memo.info()["size"] == len(exp)
+
+        # bounded, evicting the least recently used
+        memo.enable(maxsize=10)
+        assert memo.info()["size"] == 10
+        assert memo.info()["evictions"] == len(exp) - 10
+
+        memo.enable(maxsize=1000)
+        assert f_all() == exp
+
+        # invalidation drops the calendar's entries (only)
+        n_calls = len(utils.CALLS)
+        size = memo.info()["size"]
+        xtenors.add(ds[0], xtenors.Tenor("2D"), iterator=itr)
+        assert memo.info()["size"] == size + 1
+
+        # as are the calendar's indices (only)
+        other = calendars.compile_calendar(
+            calendars.Weekday([0, 2]),
+            datetime.date(2020, 1, 1),
+            datetime.date(2021, 1, 1),
+        )
+        o = datetime.date(2020, 1, 1).toordinal()
+        xtenors.indices.index(other, o, o + 366)
+        assert xtenors.indices.cache_key(calendar) in xtenors.indices.INDICES
+
+        calendar.invalidate()
+        assert calendar.coverage() is None
+        assert memo.info()["size"] == 1
+
+        assert xtenors.indices.cache_key(other) in xtenors.indices.INDICES
+        assert xtenors.indices.cache_key(
+            calendar
+        ) not in xtenors.indices.INDICES
+
+        assert f_all() == exp
+        assert len(utils.CALLS) > n_calls
+
+    finally:
+        memo.enable(previous, maxsize=maxsize)
+        memo.reset()
+        calendars.clear(utils.Manager_Test)
+
+    print("--")
+
+# ---------------------------------------------------------------
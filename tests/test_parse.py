@@ -46,3 +46,27 @@ def test_parse_tenor():
     print("--")
 
 # ---------------------------------------------------------------
+
+def test_parse_compound():
+    print(":")
+
+    for tenor, exp in [
+        ("1Y6M", dict(Y=1, M=6, W=0, D=0)),
+        ("2W3D", dict(Y=0, M=0, W=2, D=3)),
+        ("-1Y6M", dict(Y=-1, M=-6, W=0, D=0)),
+        ("ON", dict(Y=0, M=0, W=0, D=1)),
+        ("TN", dict(Y=0, M=0, W=0, D=2)),
+        ("SN", dict(Y=0, M=0, W=0, D=3)),
+        ("SPOT", dict(Y=0, M=0, W=0, D=2)),
+    ]:
+        res = xtenors.Tenor.parse(tenor)
+        assert res._asdict() == dict(
+            s=None, **exp, adjustment=None
+        ), (tenor, res)
+        assert xtenors.Tenor.parse(tenor) is res, tenor
+
+    assert xtenors.Tenor("1Y6M").init() is xtenors.Tenor.parse("1Y6M")
+
+    print("--")
+
+# ---------------------------------------------------------------
@@ -0,0 +1,87 @@
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import conventions
+from xtenors import pillars
+
+# ---------------------------------------------------------------
+
+TENORS = [
+    "ON", "TN", "SPOT", "SN", "1W", "2W", "1M", "2M", "3M", "6M", "9M",
+    "1Y", "18M", "2Y", "5Y", "10Y", "30Y", "50Y",
+]
+
+# (from spot, business days), per market tenor
+
+MARKET = {
+    "ON": (False, 1),
+    "TN": (True, 0),
+    "SPOT": (True, 0),
+    "SN": (True, 1),
+}
+
+def test_pillars_batch():
+    print(":")
+
+    rng = numpy.random.default_rng(0)
+    n = 200
+
+    anchors = (
+        numpy.datetime64("2010-01-01")
+        + rng.integers(0, 365 * 10, n).astype("timedelta64[D]")
+    )
+
+    itr = xtenors.calendars.Weekday(True).iterator(
+        datetime.date(2010, 1, 1), xtenors.days(1)
+    )
+    adj = xtenors.Adjustment(
+        itr,
+        overflow=conventions.Overflow.PREV,
+        roll=conventions.Roll.FOLLOWING,
+        modified=conventions.Modified.MODIFIED,
+    )
+
+    for spot in [0, 1, 2, 3]:
+        res = pillars.pillars(anchors, TENORS, adj, spot=spot)
+        assert res.n() == n
+
+        for i, anchor in enumerate(anchors.tolist()):
+            base = xtenors.arithmetic.add(anchor, days=spot, iterator=itr)
+            unadjusted, adjusted = res.get(i)
+
+            for j, s in enumerate(TENORS):
+                tenor = xtenors.Tenor(s).init()
+                if s in MARKET:
+                    from_spot, offset = MARKET[s]
+                    exp = xtenors.arithmetic.add(
+                        base if from_spot else anchor,
+                        days=offset,
+                        iterator=itr,
+                    )
+                else:
+                    exp = xtenors.arithmetic.add(
+                        base,
+                        years=tenor.Y,
+                        months=tenor.M,
+                        weeks=tenor.W,
+                        days=tenor.D,
+                        overflow=adj.overflow,
+                    )
+                assert unadjusted[j] == numpy.datetime64(exp), (i, s)
+                assert adjusted[j] == numpy.datetime64(xtenors.adjust(
+                    exp,
+                    itr,
+                    roll=adj.roll,
+                    modified=adj.modified,
+                )), (i, s)
+
+            single = pillars.pillar(anchor, TENORS, adj, spot=spot)
+            assert (single[0] == unadjusted).all(), i
+            assert (single[1] == adjusted).all(), i
+
+    print("--")
+
+# ---------------------------------------------------------------
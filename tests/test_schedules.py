@@ -0,0 +1,131 @@
+import calendar
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import conventions
+from xtenors import schedules
+
+# ---------------------------------------------------------------
+
+def month_end(d):
+    return datetime.date(
+        d.year, d.month, calendar.monthrange(d.year, d.month)[1]
+    )
+
+def schedule_loop(start, end, frequency, adjustment, stub, backward, eom):
+    # reference: a plain loop of scalar adds from the anchor
+    tenor = xtenors.Tenor(frequency).init()
+    months = (tenor.Y or 0) * 12 + (tenor.M or 0)
+    days = (tenor.W or 0) * 7 + (tenor.D or 0)
+    sign = -1 if backward else 1
+
+    anchor, target = (end, start) if backward else (start, end)
+    anchor_eom = eom and months > 0 and month_end(anchor) == anchor
+
+    regular = []
+    exact = False
+    i = 0
+    while True:
+        d = xtenors.arithmetic.add(
+            anchor,
+            months=sign * i * months,
+            days=sign * i * days,
+            overflow=conventions.Overflow.PREV,
+        )
+        if anchor_eom:
+            d = month_end(d)
+        if (d <= target) if backward else (d >= target):
+            exact = d == target
+            break
+        regular.append(d)
+        i += 1
+
+    if stub is conventions.Stub.LONG and not exact and len(regular) > 1:
+        regular = regular[:-1]
+
+    unadjusted = (
+        [start] + regular[::-1] if backward else regular + [end]
+    )
+    adjusted = [
+        xtenors.adjust(
+            d,
+            adjustment.iterator,
+            roll=adjustment.roll,
+            modified=adjustment.modified,
+        )
+        for d in unadjusted
+    ]
+    return (
+        numpy.array(unadjusted, dtype="datetime64[D]"),
+        numpy.array(adjusted, dtype="datetime64[D]"),
+    )
+
+# ---------------------------------------------------------------
+
+def test_schedules_batch():
+    print(":")
+
+    rng = numpy.random.default_rng(0)
+    n = 50
+
+    starts = (
+        numpy.datetime64("2010-01-01")
+        + rng.integers(0, 365 * 10, n).astype("timedelta64[D]")
+    )
+    ends = starts + rng.integers(0, 365 * 30, n).astype("timedelta64[D]")
+
+    # include month ends (for eom)
+    starts[:3] = numpy.array([
+        "2012-02-29", "2015-04-30", "2011-01-31",
+    ], dtype="datetime64[D]")
+    ends[:3] = numpy.array([
+        "2020-02-29", "2021-06-30", "2014-11-30",
+    ], dtype="datetime64[D]")
+
+    adj = xtenors.Adjustment(
+        xtenors.calendars.Weekday(True).iterator(
+            datetime.date(2010, 1, 1), xtenors.days(1)
+        ),
+        roll=conventions.Roll.FOLLOWING,
+        modified=conventions.Modified.MODIFIED,
+    )
+
+    for frequency in ["3M", "6M", "1Y", "2W"]:
+        for stub in [conventions.Stub.SHORT, conventions.Stub.LONG]:
+            for backward in [False, True]:
+                kws = dict(
+                    adjustment=adj,
+                    stub=stub,
+                    backward=backward,
+                    eom=True,
+                )
+                res = schedules.schedules(
+                    starts, ends, xtenors.Tenor(frequency), **kws
+                )
+                assert res.n() == n
+                for i, (start, end) in enumerate(zip(
+                    starts.tolist(), ends.tolist()
+                )):
+                    unadjusted, adjusted = schedule_loop(
+                        start, end, frequency, **kws
+                    )
+                    r_unadjusted, r_adjusted = res.get(i)
+                    key = dict(
+                        i=i,
+                        frequency=frequency,
+                        stub=stub,
+                        backward=backward,
+                    )
+                    assert len(unadjusted) == len(r_unadjusted), key
+                    assert (unadjusted == r_unadjusted).all(), key
+                    assert (adjusted == r_adjusted).all(), key
+                    assert r_unadjusted[0] == start
+                    assert r_unadjusted[-1] == end
+                    assert (numpy.diff(r_unadjusted).astype(int) > 0).all()
+
+    print("--")
+
+# ---------------------------------------------------------------
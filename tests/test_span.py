@@ -0,0 +1,47 @@
+import datetime
+
+import numpy
+
+import xtenors
+
+from xtenors import conventions
+
+# ---------------------------------------------------------------
+
+def test_span():
+    print(":")
+
+    rng = numpy.random.default_rng(0)
+    months = rng.integers(-2400, 2400, 500)
+    days = rng.integers(-20000, 20000, 500)
+
+    codes = xtenors.xtenors.pack_span(months, days)
+    res_months, res_days = xtenors.xtenors.unpack_span(codes)
+    assert (res_months == months).all()
+    assert (res_days == days).all()
+
+    overflow = conventions.Overflow.PREV
+    spec = xtenors.Spec(overflow=overflow)
+
+    d = datetime.date(2010, 1, 31)
+
+    for s in ["1D", "2W", "1M", "-3M", "1Y6M", "-2Y1W"]:
+        tenor = xtenors.Tenor(s).init()
+        span = tenor.compact()
+
+        assert span is xtenors.xtenors.parse_span(s), s
+        assert span.tenor().compact() is span, s
+        assert -(-span) is span, s
+
+        assert span.add(d, spec) == xtenors.arithmetic.add(
+            d,
+            years=tenor.Y,
+            months=tenor.M,
+            weeks=tenor.W,
+            days=tenor.D,
+            overflow=overflow,
+        ), s
+
+    print("--")
+
+# ---------------------------------------------------------------
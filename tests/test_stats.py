@@ -0,0 +1,56 @@
+import datetime
+
+import xtenors
+
+from xtenors import calendars, stats
+
+from . import utils
+
+# ---------------------------------------------------------------
+
+def test_stats():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+    stats.reset()
+
+    try:
+        calendar = calendars.Stateful(
+            utils.Manager_Test("stats", xtenors.days(30))
+        )
+        d = datetime.date(2020, 1, 3)
+
+        # disabled, nothing is recorded
+        xtenors.Tenor("1M").init()
+        calendar.valid()(d)
+        assert not stats.COUNTS, stats.COUNTS
+
+        with stats.measure() as res:
+            itr = calendar.iterator(d, xtenors.days(1), accept=lambda d: True)
+            xtenors.arithmetic.add(d, days=10, iterator=itr)
+            xtenors.Tenor("3M").init()
+
+        assert not stats.ENABLED
+        assert res["parse.calls"] == 1, res
+        assert res["arithmetic.add"] == 1, res
+        assert res["arithmetic.add_days.stepped"] == 1, res
+        assert res["iterator.accept"] >= 10, res
+        assert "calendar.extension" not in res, res
+        assert res["calendar.stores.size"] >= 1, res
+
+        with stats.measure() as res:
+            calendar.valid()(datetime.date(1990, 1, 1))
+
+        assert res["calendar.extension"] == 1, res
+        assert res["calendar.fetch"] == 1, res
+        assert res["calendar.extension.seconds"] > 0, res
+
+        assert stats.get()["calendar.extension"] == 1
+        stats.reset()
+        assert "calendar.extension" not in stats.get()
+
+    finally:
+        stats.reset()
+        calendars.clear(utils.Manager_Test)
+
+# ---------------------------------------------------------------
@@ -0,0 +1,95 @@
+
+import time
+import asyncio
+import datetime
+import concurrent.futures
+
+import xtenors
+
+from xtenors import calendars
+
+from . import utils
+
+# ---------------------------------------------------------------
+
+def test_threads_single_calendar():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+    utils.CALLS.clear()
+
+    try:
+        calendar = calendars.Stateful(utils.Manager_Test(
+            "threads", xtenors.days(60), delay=0.01,
+        ))
+        start = datetime.date(2000, 1, 1)
+
+        def f(i):
+            # each thread walks forward (or back) from the same start
+            # with its own valid() closure
+            valid = calendar.valid()
+            sign = 1 if i % 2 else -1
+            res = []
+            for n in range(0, 365 * 3, 7):
+                d = start + xtenors.days(sign * (n + i))
+                res.append(valid(d) == (d.day != 1))
+            return all(res)
+
+        with concurrent.futures.ThreadPoolExecutor(32) as pool:
+            assert all(pool.map(f, range(256)))
+
+        # no range is ever fetched twice
+        calls = sorted(utils.CALLS)
+        for (_, end), (start_next, _) in zip(calls[:-1], calls[1:]):
+            assert end <= start_next, calls
+
+        print(dict(calls=len(calls)))
+
+    finally:
+        calendars.clear(utils.Manager_Test)
+
+# ---------------------------------------------------------------
+
+def test_load_concurrent():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+    utils.CALLS.clear()
+
+    try:
+        managers = [
+            utils.Manager_Test(
+                "load-{}".format(i), xtenors.days(30), delay=0.2,
+            )
+            for i in range(8)
+        ]
+        start = datetime.date(2000, 1, 1)
+        end = datetime.date(2009, 12, 31)
+
+        t0 = time.perf_counter()
+        res = calendars.load(managers, start, end)
+        elapsed = time.perf_counter() - t0
+
+        # bounded by the slowest, rather than the sum
+        assert elapsed < 0.2 * len(managers) / 2, elapsed
+        assert len(utils.CALLS) == len(managers), utils.CALLS
+
+        for manager, calendar in zip(managers, res):
+            assert calendar.manager == manager
+            assert calendar.coverage() == (start, end)
+
+        res = asyncio.run(calendars.load_async(
+            managers, start, end, compiled=True,
+        ))
+        assert len(utils.CALLS) == len(managers), utils.CALLS
+        assert all(
+            isinstance(calendar, calendars.Compiled)
+            for calendar in res
+        )
+        assert not res[0].valid()(datetime.date(2005, 3, 1))
+        assert res[0].valid()(datetime.date(2005, 3, 2))
+
+    finally:
+        calendars.clear(utils.Manager_Test)
+
+# ---------------------------------------------------------------
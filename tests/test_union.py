@@ -0,0 +1,86 @@
+import datetime
+
+import xtuples as xt
+
+import xtenors
+
+from xtenors import indices
+from xtenors import iterators
+from xtenors import calendars
+
+from . import utils
+
+# ---------------------------------------------------------------
+
+START = datetime.date(2019, 12, 28)
+N = 150
+
+def accepted(gen, n = N):
+    return xt.iTuple.from_where(
+        gen, lambda y, v: y, n=n, star=True
+    ).mapstar(lambda y, v: v)
+
+def check(cals, f_calendars, f_iterators):
+    calendar = f_calendars(*cals)
+
+    itrs = xt.iTuple(cals).map(
+        lambda cal: cal.iterator(START, xtenors.days(1))
+    )
+    exp = accepted(f_iterators(itrs))
+
+    # stepping the calendar level valid()
+    _, gen = calendar.iterator(START, xtenors.days(1)).gen()
+    assert accepted(gen) == exp, cals
+
+    # via the mask / index
+    res = xt.iTuple.range(1, N + 1).map(
+        lambda n: indices.add(calendar, START, n)
+    )
+    skip = 1 if calendar.valid()(START) else 0
+    assert list(res)[:N - skip] == list(exp)[skip:], cals
+
+# ---------------------------------------------------------------
+
+def test_union():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+
+    for cals in [
+        (calendars.Weekday(0), calendars.Weekday(3)),
+        (calendars.Weekday([0, 1]), calendars.Weekday([1, 5]), calendars.Weekday(6)),
+        (
+            calendars.Weekday(5),
+            calendars.Stateful(
+                utils.Manager_Test("union", xtenors.days(30))
+            ),
+        ),
+    ]:
+        check(cals, calendars.union_calendars, iterators.union)
+
+    calendars.clear(utils.Manager_Test)
+
+    print("--")
+
+def test_intersection():
+    print(":")
+
+    calendars.clear(utils.Manager_Test)
+
+    for cals in [
+        (calendars.Weekday([0, 1, 2]), calendars.Weekday([1, 2, 3])),
+        (calendars.Weekday(True), calendars.Weekday([0, 4, 5]), calendars.Weekday([0, 4])),
+        (
+            calendars.Weekday(True),
+            calendars.Stateful(
+                utils.Manager_Test("intersection", xtenors.days(30))
+            ),
+        ),
+    ]:
+        check(cals, calendars.intersection_calendars, iterators.intersection)
+
+    calendars.clear(utils.Manager_Test)
+
+    print("--")
+
+# ---------------------------------------------------------------
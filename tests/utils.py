@@ -1,10 +1,17 @@
 
+import time
+import typing
+import datetime
 import functools
 import numpy
 
 import xtuples as xt
 import xtuples.test_utils as test_utils
 
+import xtenors
+
+from xtenors import calendars
+
 # ---------------------------------------------------------------
 
 tolerances=dict(
@@ -45,3 +52,76 @@ compare = functools.partial(
 )
 
 # ---------------------------------------------------------------
+
+# a stateful calendar manager with a fake provider
+# excluding the first of each month, recording each call
+
+CALLS: list = []
+
+@xt.nTuple.decorate()
+class Manager_Test(typing.NamedTuple):
+
+    k: str
+    window: datetime.timedelta
+
+    version: str = "0"
+    delay: float = 0.
+
+    def cache_key(self) -> tuple:
+        return (self.k, self.version)
+
+    def f_excludes(self, start, end):
+        CALLS.append((start, end))
+        if self.delay:
+            time.sleep(self.delay)
+        _, gen = xtenors.Iterator(
+            start,
+            xtenors.days(1),
+            end=end,
+            accept=lambda d: d.day == 1,
+        ).gen()
+        return xt.iTuple.from_where(
+            gen, lambda y, v: y, star=True
+        ).mapstar(lambda y, v: v)
+
+    def valid(self, calendar):
+        return calendars.date_exclusion_valid(self, calendar, True)
+
+    def mask(self, calendar, start, end):
+        return calendars.date_exclusion_mask(
+            self, calendar, True, start, end
+        )
+
+    def in_scope(self, calendar, state, current):
+        return calendars.date_exclusion_in_scope(
+            self, calendar, state, current
+        )
+
+    def update(self, calendar, state, current):
+        return calendars.date_exclusion_update(
+            self, calendar, state, current, self.f_excludes,
+        )
+
+    def prefetch(self, calendar, start, end):
+        return calendars.date_exclusion_prefetch(
+            self, calendar, start, end, self.f_excludes,
+        )
+
+# as above, without the optional mask / prefetch
+
+@xt.nTuple.decorate()
+class Manager_Test_Minimal(typing.NamedTuple):
+
+    k: str
+    window: datetime.timedelta
+
+    version: str = "0"
+    delay: float = 0.
+
+    cache_key = Manager_Test.cache_key
+    f_excludes = Manager_Test.f_excludes
+    valid = Manager_Test.valid
+    in_scope = Manager_Test.in_scope
+    update = Manager_Test.update
+
+# ---------------------------------------------------------------